@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark cache entry encoding: disk footprint and read latency, plain JSON vs encoded.
+
+Reads the values of an existing cache directory (`--cache-dir`, default the
+configured one; both legacy `.json` and current `.entry` files) or, when it
+holds none, a synthetic set of analysis and fix payloads. For every value it
+compares the plain JSON text stored before encoded entries with
+`cache.codec.encode`, checks the round trip, and prints total bytes plus the
+best-of-N time to decode all of them.
+
+    python scripts/bench_cache.py [--cache-dir DIR] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from iac_scanner.cache import cache_root
+from iac_scanner.cache.codec import decode, encode
+
+_RESOURCE = """resource "aws_s3_bucket" "b{i}" {{
+  bucket = "logs-{hex}"
+  tags = {{
+    Name  = "bucket-{i}"
+    Owner = "team-{owner}"
+  }}
+}}
+
+"""
+
+
+def load_cache(root: Path) -> list[Any]:
+    values: list[Any] = []
+    for path in sorted(root.glob("??/*")):
+        try:
+            if path.suffix == ".json":
+                values.append(json.loads(path.read_text(encoding="utf-8"))["value"])
+            elif path.suffix == ".entry":
+                values.append(decode(path.read_bytes().split(b"\n", 1)[1]))
+        except (OSError, ValueError, KeyError, IndexError):
+            continue
+    return values
+
+
+def synthetic_values(count: int = 200, seed: int = 0) -> list[Any]:
+    """Half analysis results (finding lists), half fix results (regenerated code of 5-200 KB)."""
+    rng = random.Random(seed)
+    values: list[Any] = []
+    for n in range(count):
+        if n % 2:
+            size = rng.randint(5 * 1024, 200 * 1024)
+            parts: list[str] = []
+            i = 0
+            while sum(map(len, parts)) < size:
+                parts.append(_RESOURCE.format(i=i, hex=f"{rng.getrandbits(64):016x}", owner=rng.randint(1, 9)))
+                i += 1
+            values.append("".join(parts))
+        else:
+            values.append(
+                [
+                    {
+                        "severity": rng.choice(["high", "medium", "low"]),
+                        "title": f"Finding {i}",
+                        "description": "Bucket allows public access; enable block public access.",
+                        "location": f"main.tf:{rng.randint(1, 900)}",
+                    }
+                    for i in range(rng.randint(0, 12))
+                ]
+            )
+    return values
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[0])
+    parser.add_argument("--cache-dir", type=Path, default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    root = args.cache_dir or cache_root()
+    values = load_cache(root)
+    source = f"{len(values)} entries from {root}"
+    if not values:
+        values = synthetic_values()
+        source = f"{len(values)} synthetic entries"
+
+    plain = [json.dumps(v).encode("utf-8") for v in values]
+    encoded = [encode(v) for v in values]
+    for value, blob in zip(values, encoded, strict=True):
+        assert decode(blob) == value, "round-trip mismatch"
+
+    old_time = best_of(lambda: [json.loads(b) for b in plain], args.repeat)
+    new_time = best_of(lambda: [decode(b) for b in encoded], args.repeat)
+    old_bytes, new_bytes = sum(map(len, plain)), sum(map(len, encoded))
+    tags = {tag: sum(b[:1] == tag.encode() for b in encoded) for tag in "jzx"}
+
+    print(source + f" (json: {tags['j']}, zlib: {tags['z']}, lzma: {tags['x']})")
+    print(f"{'':<12}{'plain JSON':>14}{'encoded':>14}{'ratio':>9}")
+    print(f"{'disk':<12}{old_bytes / 1024:>11.1f}KiB{new_bytes / 1024:>11.1f}KiB{new_bytes / old_bytes:>9.2f}")
+    print(f"{'read all':<12}{old_time * 1000:>12.1f}ms{new_time * 1000:>12.1f}ms{new_time / old_time:>9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark `redact_secrets` against the legacy one-`sub`-per-pattern loop.
+
+Generates synthetic Terraform at 200 KB and 10 MB (mostly clean resources with
+decoy substrings like `disk-` / `task-`, plus a sprinkle of real-looking
+secrets), checks both implementations produce identical output, and prints
+the best-of-N wall time for each.
+
+    python scripts/bench_redaction.py [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import string
+import time
+
+from iac_scanner.scanners._filters import _SECRET_PATTERNS, redact_secrets
+
+SIZES = {"200KB": 200 * 1024, "10MB": 10 * 1024 * 1024}
+
+_RESOURCE = """resource "aws_instance" "app_{i}" {{
+  ami           = "ami-{hex}"
+  instance_type = "t3.micro"
+  tags = {{
+    Name = "task-runner-{i}"
+    Disk = "disk-{i}-gp3"
+  }}
+}}
+
+"""
+
+_SECRETS = (
+    'access_key = "AKIA{upper}"\n',
+    'aws_secret_access_key = "{alnum40}"\n',
+    "# token ghp_{alnum40}\n",
+    'openai = "sk-{alnum40}"\n',
+    "Authorization: Bearer {alnum40}\n",
+    "jwt = eyJhbGciOiJIUzI1NiJ9.eyJzdWIiOiIxIn0.{alnum40}\n",
+)
+
+
+def legacy_redact(text: str) -> str:
+    for pattern, replacement in _SECRET_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def synthetic_tf(size: int, *, secret_every: int | None = 200, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts: list[str] = []
+    total = 0
+    i = 0
+    while total < size:
+        chunk = _RESOURCE.format(i=i, hex="".join(rng.choices("0123456789abcdef", k=17)))
+        if secret_every and i % secret_every == 0:
+            chunk += rng.choice(_SECRETS).format(
+                upper="".join(rng.choices(string.ascii_uppercase + string.digits, k=16)),
+                alnum40="".join(rng.choices(string.ascii_letters + string.digits, k=40)),
+            )
+        parts.append(chunk)
+        total += len(chunk)
+        i += 1
+    return "".join(parts)[:size]
+
+
+def best_of(fn, arg: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    os.environ.pop("IAC_NO_REDACT", None)
+
+    print(f"{'input':<20}{'legacy':>12}{'single-pass':>14}{'speedup':>10}")
+    for label, size in SIZES.items():
+        for variant, text in (
+            ("with secrets", synthetic_tf(size)),
+            ("clean", synthetic_tf(size, secret_every=None)),
+        ):
+            assert legacy_redact(text) == redact_secrets(text), f"output mismatch on {label} {variant}"
+            old = best_of(legacy_redact, text, args.repeat)
+            new = best_of(redact_secrets, text, args.repeat)
+            print(f"{label + ' ' + variant:<20}{old * 1000:>10.1f}ms{new * 1000:>12.1f}ms{old / new:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
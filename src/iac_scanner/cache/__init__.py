@@ -0,0 +1,367 @@
+"""Content-addressed response cache.
+
+Cache keys are sha256 hashes derived from (raw_content, provider, model,
+prompt_version, schema_version, call_kind). Hits short-circuit the LLM call and
+return the stored result. TTL defaults to 30 days.
+
+Disabled when `IAC_NO_CACHE` is set (CLI flag or env var).
+
+Stored next to the user's XDG cache dir, falling back to `~/.cache/iac-scanner/`.
+`IAC_CACHE_BACKEND` picks the storage:
+
+- `files` (default): one file per entry (`cache/files.py`).
+- `sqlite`: one WAL-mode database with batched lookups and LRU eviction
+  beyond `IAC_CACHE_MAX_BYTES` (`cache/sqlite.py`).
+
+Lookups go through an in-process L1 first (`cache/memory.py`): repeat hits
+in a long-lived process cost no I/O, and `get_model` hits also skip
+validation.
+
+A key with `canonical` set (analysis calls under `IAC_CANONICAL_KEYS`) hashes
+a formatting-insensitive form of the content instead (`cache/canonical.py`).
+
+With `IAC_CACHE_URL` set, a shared HTTP tier sits behind the local one:
+read-through on local misses, write-back after local writes (`cache/remote.py`).
+
+`compute_once` / `compute_model_once` add single-flight: concurrent misses
+on one key, across processes, make one computation (`cache/flight.py`).
+
+`stats`, `gc` and `clear` back the `iac-scan cache` commands; lookups are
+counted and writes trigger a rate-limited collection (`cache/maintenance.py`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+from pydantic import BaseModel, ValidationError
+
+from iac_scanner.cache import maintenance
+from iac_scanner.cache.base import CacheBackend, CacheStats, GcResult
+from iac_scanner.cache.canonical import CANONICAL_SCHEMA_VERSION, canonicalize
+from iac_scanner.cache.files import FileBackend
+from iac_scanner.cache.flight import single_flight
+from iac_scanner.cache.memory import MemoryCache, memory_cache_bytes
+from iac_scanner.cache.remote import remote_cache
+from iac_scanner.cache.sqlite import SqliteBackend
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+T = TypeVar("T")
+
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600  # 30 days
+SCHEMA_VERSION = "2"  # Bump when the on-disk format changes — invalidates all entries. 2: encoded values.
+
+CACHE_BACKENDS = ("files", "sqlite")
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GiB
+
+
+def cache_root() -> Path:
+    """Resolve the cache directory. XDG-compliant on Linux, `~/Library/Caches` on macOS."""
+    if env_dir := os.environ.get("IAC_CACHE_DIR"):
+        return Path(env_dir)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else (Path.home() / ".cache")
+    return base / "iac-scanner"
+
+
+def is_disabled() -> bool:
+    """Cache is skipped when IAC_NO_CACHE is truthy."""
+    return bool(os.environ.get("IAC_NO_CACHE"))
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """Inputs that uniquely identify an LLM call."""
+
+    call_kind: str  # 'analysis' | 'fix'
+    raw_content: str
+    provider: str
+    model: str
+    prompt_version: str
+    extra: str = ""  # e.g. serialized findings for the fix call
+    canonical: str = ""  # language whose canonical form is hashed instead of raw_content; "" = byte-exact
+
+    @cached_property
+    def content_sha(self) -> str:
+        """sha256 of the keyed content, hashed in slices so multi-MB content is never encoded whole."""
+        content = canonicalize(self.raw_content, self.canonical) if self.canonical else self.raw_content
+        h = hashlib.sha256()
+        step = 1 << 20
+        for i in range(0, len(content), step):
+            h.update(content[i : i + step].encode("utf-8"))
+        return h.hexdigest()
+
+    def digest(self) -> str:
+        h = hashlib.sha256()
+        fields = {
+            "schema": SCHEMA_VERSION,
+            "call": self.call_kind,
+            "provider": self.provider,
+            "model": self.model,
+            "prompt_version": self.prompt_version,
+            "extra": self.extra,
+            "content_sha": self.content_sha,
+        }
+        if self.canonical:  # absent for byte-exact keys, so their digests are unchanged
+            fields["canonical"] = f"{self.canonical}:{CANONICAL_SCHEMA_VERSION}"
+        payload = json.dumps(fields, sort_keys=True).encode("utf-8")
+        h.update(payload)
+        return h.hexdigest()
+
+
+def backend_name() -> str:
+    """`IAC_CACHE_BACKEND`: `files` (default) or `sqlite`. Unknown names fall back to `files`."""
+    raw = (os.environ.get("IAC_CACHE_BACKEND") or "files").strip().lower()
+    if raw not in CACHE_BACKENDS:
+        logger.warning("Unknown IAC_CACHE_BACKEND=%r; using 'files'", raw)
+        return "files"
+    return raw
+
+
+def max_cache_bytes() -> int:
+    """Configurable via IAC_CACHE_MAX_BYTES. Default 1 GiB; 0 disables the bound."""
+    raw = os.environ.get("IAC_CACHE_MAX_BYTES")
+    if raw is None:
+        return DEFAULT_MAX_BYTES
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        logger.warning("Invalid IAC_CACHE_MAX_BYTES=%r; using default", raw)
+        return DEFAULT_MAX_BYTES
+
+
+_backends: dict[tuple[str, Path, int], CacheBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def backend() -> CacheBackend:
+    """The backend for the current settings, created once per (kind, directory, size bound)."""
+    name, root = backend_name(), cache_root()
+    max_bytes = max_cache_bytes() if name == "sqlite" else 0
+    with _backends_lock:
+        found = _backends.get((name, root, max_bytes))
+        if found is None:
+            found = (
+                SqliteBackend(root / "cache.sqlite3", max_bytes=max_bytes) if name == "sqlite" else FileBackend(root)
+            )
+            _backends[(name, root, max_bytes)] = found
+        return found
+
+
+_memory = MemoryCache(0)
+
+
+def memory() -> MemoryCache | None:
+    """The process-wide L1, resized to the current `IAC_CACHE_MEMORY_BYTES`; None when that is 0."""
+    max_bytes = memory_cache_bytes()
+    if max_bytes != _memory.max_bytes:
+        _memory.max_bytes = max_bytes
+        if max_bytes == 0:
+            _memory.clear()
+    return _memory if max_bytes else None
+
+
+def _json_size(value: Any) -> int:
+    """Byte estimate of a stored value for the L1 budget: the length of its JSON encoding."""
+    return len(value) if isinstance(value, str) else len(json.dumps(value))
+
+
+def _read_through(digests: list[str], ttl_seconds: int) -> dict[str, tuple[float, Any]]:
+    """Local backend, then the remote tier for what is left.
+
+    Remote hits are stored locally with their remote timestamp, so the local
+    copy expires with the original instead of getting a fresh TTL.
+    """
+    found = backend().get_many(digests, ttl_seconds)
+    remote = remote_cache()
+    if remote is not None and len(found) < len(digests):
+        fetched = remote.get_many([d for d in digests if d not in found], ttl_seconds)
+        if fetched:
+            values = {digest: value for digest, (_, value) in fetched.items()}
+            backend().put_many(values, {digest: stored_at for digest, (stored_at, _) in fetched.items()})
+            found.update(fetched)
+    return found
+
+
+def _lookup(
+    keys: Iterable[CacheKey], ttl_seconds: int, model: type[BaseModel] | None, *, record: bool = True
+) -> dict[CacheKey, Any]:
+    """L1, then one batched backend read (and the remote tier) for the rest. With `model`, values are validated.
+
+    A stored value that fails validation is a miss; the caller recomputes and overwrites it.
+    `record=False` is single-flight polling: no hit/miss counts, and no remote requests,
+    since the value being waited for is written locally.
+    """
+    root, l1 = cache_root(), memory()
+    by_digest = {key.digest(): key for key in keys}
+    found: dict[CacheKey, Any] = {}
+    missing: list[str] = []
+    for digest, key in by_digest.items():
+        value = l1.get((root, digest, model), ttl_seconds) if l1 is not None else None
+        if value is None:
+            missing.append(digest)
+        else:
+            found[key] = value
+    if missing:
+        stored = _read_through(missing, ttl_seconds) if record else backend().get_many(missing, ttl_seconds)
+        for digest, (stored_at, value) in stored.items():
+            size = _json_size(value)
+            if model is not None:
+                try:
+                    value = model.model_validate(value)
+                except ValidationError as e:
+                    logger.debug("Discarding invalid cache entry %s: %s", digest, e)
+                    continue
+            found[by_digest[digest]] = value
+            if l1 is not None:
+                l1.put((root, digest, model), value, size, stored_at)
+    if record:
+        maintenance.record_lookups(root, len(found), len(by_digest) - len(found))
+    return found
+
+
+def _remember(key: CacheKey, value: Any, model: type[BaseModel] | None, size: int, stored_at: float) -> None:
+    if (l1 := memory()) is not None:
+        l1.put((cache_root(), key.digest(), model), value, size, stored_at)
+
+
+def _write_back(items: Mapping[str, Any]) -> None:
+    """Queue uploads of locally stored values to the remote tier, if one is configured."""
+    if (remote := remote_cache()) is not None:
+        for digest, value in items.items():
+            remote.put(digest, value)
+
+
+def get(key: CacheKey, *, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> Any | None:
+    """Return cached value if present and fresh; else None. Never raises."""
+    if is_disabled():
+        return None
+    return _lookup([key], ttl_seconds, None).get(key)
+
+
+def get_many(keys: Iterable[CacheKey], *, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> dict[CacheKey, Any]:
+    """Fresh cached values for the keys that hit, in one batched lookup where the backend allows."""
+    if is_disabled():
+        return {}
+    return _lookup(keys, ttl_seconds, None)
+
+
+def get_model(key: CacheKey, model: type[M], *, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> M | None:
+    """The cached value as a validated `model` instance; L1 hits skip validation. Treat it as read-only."""
+    if is_disabled():
+        return None
+    return cast("M | None", _lookup([key], ttl_seconds, model).get(key))
+
+
+def get_many_models(
+    keys: Iterable[CacheKey], model: type[M], *, ttl_seconds: int = DEFAULT_TTL_SECONDS
+) -> dict[CacheKey, M]:
+    """`get_model` for several keys, with one batched backend read for the L1 misses."""
+    if is_disabled():
+        return {}
+    return cast("dict[CacheKey, M]", _lookup(keys, ttl_seconds, model))
+
+
+def put(key: CacheKey, value: Any) -> None:
+    """Store value under the cache key. Never raises — cache is best-effort."""
+    if is_disabled():
+        return
+    now = time.time()
+    backend().put(key.digest(), value, now)
+    _remember(key, value, None, _json_size(value), now)
+    _write_back({key.digest(): value})
+    _maybe_gc()
+
+
+def put_many(items: Mapping[CacheKey, Any]) -> None:
+    """Store several values, in one transaction where the backend allows."""
+    if is_disabled() or not items:
+        return
+    now = time.time()
+    by_digest = {key.digest(): value for key, value in items.items()}
+    backend().put_many(by_digest, dict.fromkeys(by_digest, now))
+    for key, value in items.items():
+        _remember(key, value, None, _json_size(value), now)
+    _write_back(by_digest)
+    _maybe_gc()
+
+
+def put_model(key: CacheKey, obj: BaseModel) -> None:
+    """Store `obj` as JSON in the backend and keep the instance itself in the L1 for `get_model`."""
+    if is_disabled():
+        return
+    value = obj.model_dump(exclude_none=True, mode="json")
+    now = time.time()
+    backend().put(key.digest(), value, now)
+    _remember(key, obj, type(obj), _json_size(value), now)
+    _write_back({key.digest(): value})
+    _maybe_gc()
+
+
+def compute_once(key: CacheKey, compute: Callable[[], T], *, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> tuple[T, bool]:
+    """Cached value for `key`, else `compute()` and store it, with one computation across processes.
+
+    Concurrent callers that miss the same key wait for the first one's result
+    instead of repeating the work (see `cache/flight.py`). Returns
+    `(value, computed_here)`; with the cache disabled, always computes.
+    """
+    return _compute_once(key, compute, None, ttl_seconds)
+
+
+def compute_model_once(
+    key: CacheKey, model: type[M], compute: Callable[[], M], *, ttl_seconds: int = DEFAULT_TTL_SECONDS
+) -> tuple[M, bool]:
+    """`compute_once` for a Pydantic result: stored with `put_model`, returned validated."""
+    return _compute_once(key, compute, model, ttl_seconds)
+
+
+def _compute_once(
+    key: CacheKey, compute: Callable[[], T], model: type[BaseModel] | None, ttl_seconds: int
+) -> tuple[T, bool]:
+    if is_disabled():
+        return compute(), True
+
+    def lookup() -> T | None:
+        return cast("T | None", _lookup([key], ttl_seconds, model, record=False).get(key))
+
+    def store(value: T) -> None:
+        if isinstance(value, BaseModel):
+            put_model(key, value)
+        else:
+            put(key, value)
+
+    return single_flight(cache_root() / "locks", key.digest(), lookup=lookup, compute=compute, store=store)
+
+
+def _maybe_gc() -> None:
+    maintenance.maybe_gc(cache_root(), backend(), ttl_seconds=DEFAULT_TTL_SECONDS, max_bytes=max_cache_bytes())
+
+
+def stats() -> CacheStats:
+    """Entries, bytes, age histogram and lookup hit rate of the configured cache."""
+    return maintenance.stats(cache_root(), backend())
+
+
+def gc(*, max_bytes: int | None = None, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> GcResult:
+    """Delete expired entries, then the oldest until within `max_bytes` (default `IAC_CACHE_MAX_BYTES`)."""
+    bound = max_cache_bytes() if max_bytes is None else max_bytes
+    _memory.clear()
+    return maintenance.collect(cache_root(), backend(), ttl_seconds=ttl_seconds, max_bytes=bound)
+
+
+def clear() -> int:
+    """Delete every cached entry, manifest and index; return the number of entries removed."""
+    _memory.clear()
+    return maintenance.clear(cache_root(), backend())
@@ -0,0 +1,98 @@
+"""Storage interface shared by the cache backends.
+
+Backends store JSON-compatible values under a `CacheKey` digest. They never
+raise for I/O problems: a failed read is a miss and a failed write is dropped,
+because the cache is best-effort.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+# Upper bounds (seconds) of the age histogram buckets in `CacheStats.ages`.
+AGE_BUCKETS: tuple[tuple[str, float], ...] = (
+    ("<1h", 3600),
+    ("<1d", 24 * 3600),
+    ("<7d", 7 * 24 * 3600),
+    ("<30d", 30 * 24 * 3600),
+    (">=30d", float("inf")),
+)
+
+
+def age_bucket(age_seconds: float) -> str:
+    return next(label for label, bound in AGE_BUCKETS if age_seconds < bound)
+
+
+@dataclass
+class CacheStats:
+    """Snapshot of one backend's entries, plus the lookup counters kept next to them."""
+
+    backend: str
+    entries: int = 0
+    bytes: int = 0
+    ages: dict[str, int] = field(default_factory=lambda: {label: 0 for label, _ in AGE_BUCKETS})
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float | None:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def add(self, size: int, age_seconds: float) -> None:
+        self.entries += 1
+        self.bytes += size
+        self.ages[age_bucket(age_seconds)] += 1
+
+
+@dataclass
+class GcResult:
+    removed: int = 0
+    freed_bytes: int = 0
+
+
+class CacheBackend(ABC):
+    """One place cache entries live (a directory of JSON files, a SQLite database, ...)."""
+
+    name: str = "base"
+
+    def get(self, digest: str, ttl_seconds: int) -> Any | None:
+        """Return the value stored under `digest` if younger than `ttl_seconds`; else None."""
+        found = self.get_many([digest], ttl_seconds).get(digest)
+        return found[1] if found is not None else None
+
+    @abstractmethod
+    def put(self, digest: str, value: Any, stored_at: float | None = None) -> None:
+        """Store `value` under `digest`, replacing any previous entry. `stored_at` defaults to now."""
+        ...
+
+    @abstractmethod
+    def get_many(self, digests: Iterable[str], ttl_seconds: int) -> dict[str, tuple[float, Any]]:
+        """`(stored_at, value)` for the digests with an entry younger than `ttl_seconds`."""
+        ...
+
+    def put_many(self, items: Mapping[str, Any], stored_at: Mapping[str, float] | None = None) -> None:
+        """Store several entries, each stamped `stored_at[digest]` if given (else now).
+
+        Backends override this to write them in one transaction.
+        """
+        for digest, value in items.items():
+            self.put(digest, value, (stored_at or {}).get(digest))
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        """Count entries and bytes, with an age histogram."""
+        ...
+
+    @abstractmethod
+    def gc(self, ttl_seconds: int, max_bytes: int) -> GcResult:
+        """Delete entries older than `ttl_seconds`, then the oldest until within `max_bytes` (0 = no bound)."""
+        ...
+
+    @abstractmethod
+    def clear(self) -> int:
+        """Delete every entry; return how many there were."""
+        ...
@@ -0,0 +1,200 @@
+"""Formatting-insensitive canonical form of scan content, for analysis cache keys.
+
+Opt-in via `IAC_CANONICAL_KEYS=1`. A `terraform fmt` run, re-indentation,
+trailing-whitespace cleanup or a reworded comment then keeps the analysis
+cache key, so the paid analysis is not repeated. The LLM still receives the
+original content; only the key is derived from the canonical form.
+
+The canonical form keeps one output line per input line, so cached findings'
+`file:line` locations stay valid for the content they are served for. Per line:
+
+- comments are dropped (`#`, `//`, `/* ... */`; block comments spanning lines
+  leave their lines empty),
+- whitespace runs outside string literals become one space, and spaces next to
+  `= , : ; ( ) [ ] { }` are removed,
+- string literals, Terraform heredocs and TS/JS template literals are kept
+  verbatim, including any `${...}` / `%{...}` interpolation inside them and
+  the strings nested in it,
+- TS/JS regex literals are kept verbatim, so a `//` or `/*` inside one is
+  not read as a comment. A `/` starts one where an expression can start:
+  at line start, after an operator or opening punctuation, or after a
+  keyword such as `return`,
+- the per-file section headers (`# --- main.tf ---`) are kept verbatim, so a
+  renamed file still changes the key.
+
+Bump `CANONICAL_SCHEMA_VERSION` whenever these rules change; it is part of
+every canonical key and never affects byte-exact keys.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+
+CANONICAL_SCHEMA_VERSION = "3"  # 2: literals end after their interpolations; 3: regex literals
+
+LANGUAGES = ("terraform", "cdk")
+
+_HEADER_RE = re.compile(r"^(?:#|//) --- .+ ---$")
+_HEREDOC_RE = re.compile(r"<<-?\s*([A-Za-z_][A-Za-z0-9_]*)\s*$")
+_PUNCT = "=,:;()[]{}"
+_SPACE_RE = re.compile(r"\s+")
+_PUNCT_SPACE_RE = re.compile(rf"\s*([{re.escape(_PUNCT)}])\s*")
+# Code ending like this is followed by an expression, so a `/` next opens a regex rather than dividing.
+_BEFORE_REGEX_RE = re.compile(
+    r"(?:^|[(,=:\[!&|?{};+\-*%<>~^]|(?<![\w$])(?:return|typeof|case|do|else|in|of|throw|delete|void|yield|await))$"
+)
+
+
+def canonical_keys_enabled() -> bool:
+    return bool(os.environ.get("IAC_CANONICAL_KEYS"))
+
+
+def _squeeze(code: str) -> str:
+    return _PUNCT_SPACE_RE.sub(r"\1", _SPACE_RE.sub(" ", code))
+
+
+class _Canonicalizer:
+    """Line-by-line scanner; state (block comment, heredoc, template literal) carries across lines."""
+
+    def __init__(self, language: str) -> None:
+        self.hash_comments = language == "terraform"
+        self.regexes = language == "cdk"
+        self.quotes = '"' if language == "terraform" else "\"'`"
+        # Literal quote -> characters that open an interpolation (`${` / `%{`) inside it.
+        self.interpolation = {'"': "$%"} if language == "terraform" else {"`": "$"}
+        self.in_block_comment = False
+        self.heredoc: str | None = None  # terminator while inside a Terraform heredoc
+        self.in_template = False  # inside a multi-line `...` literal
+
+    def literal_end(self, line: str, start: int, quote: str) -> tuple[int, bool]:
+        """Index just past the closing `quote` (escapes and interpolations honored) and whether it closed."""
+        openers = self.interpolation.get(quote, "")
+        i = start
+        while i < len(line):
+            ch = line[i]
+            if ch == "\\":
+                i += 2
+                continue
+            if ch == quote:
+                return i + 1, True
+            if ch in openers and line.startswith("{", i + 1):
+                i, closed = self.interpolation_end(line, i + 2)
+                if not closed:
+                    return len(line), False
+                continue
+            i += 1
+        return len(line), False
+
+    def interpolation_end(self, line: str, start: int) -> tuple[int, bool]:
+        """Index just past the `}` closing an interpolation body, skipping nested braces and strings."""
+        depth = 1
+        i = start
+        while i < len(line):
+            ch = line[i]
+            if ch in self.quotes:
+                i, closed = self.literal_end(line, i + 1, ch)
+                if not closed:
+                    return len(line), False
+                continue
+            if ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    return i + 1, True
+            i += 1
+        return len(line), False
+
+    @staticmethod
+    def regex_end(line: str, start: int) -> int:
+        """Index just past the regex literal whose body starts at `start` (flags included).
+
+        A regex cannot span lines, so an unclosed one runs to the end of the line.
+        """
+        i, in_class = start, False
+        while i < len(line):
+            ch = line[i]
+            if ch == "\\":
+                i += 2
+                continue
+            if ch == "[":
+                in_class = True
+            elif ch == "]":
+                in_class = False
+            elif ch == "/" and not in_class:
+                i += 1
+                while i < len(line) and (line[i].isalnum() or line[i] in "_$"):
+                    i += 1
+                return i
+            i += 1
+        return len(line)
+
+    def line(self, line: str) -> str:
+        if self.heredoc is not None:
+            if line.strip() == self.heredoc:
+                self.heredoc = None
+            return line
+        if not self.in_block_comment and not self.in_template and _HEADER_RE.match(line):
+            return line
+        starts_in_template = self.in_template
+        parts: list[str] = []  # alternating code (to squeeze) and literal text
+        code: list[str] = []
+        i, n = 0, len(line)
+
+        def flush_code() -> None:
+            if code:
+                parts.append(_squeeze("".join(code)))
+                code.clear()
+
+        while i < n:
+            if self.in_block_comment:
+                end = line.find("*/", i)
+                if end < 0:
+                    break
+                self.in_block_comment = False
+                code.append(" ")
+                i = end + 2
+                continue
+            if self.in_template:
+                end, closed = self.literal_end(line, i, "`")
+                parts.append(line[i:end])
+                self.in_template = not closed
+                i = end
+                continue
+            ch = line[i]
+            if line.startswith("/*", i):
+                self.in_block_comment = True
+                i += 2
+                continue
+            if line.startswith("//", i) or (self.hash_comments and ch == "#"):
+                break
+            if self.regexes and ch == "/" and _BEFORE_REGEX_RE.search("".join([*parts, *code]).rstrip()):
+                flush_code()
+                end = self.regex_end(line, i + 1)
+                parts.append(line[i:end])
+                i = end
+                continue
+            if ch in self.quotes:
+                flush_code()
+                end, closed = self.literal_end(line, i + 1, ch)
+                parts.append(line[i:end])
+                self.in_template = ch == "`" and not closed
+                i = end
+                continue
+            code.append(ch)
+            i += 1
+        flush_code()
+        out = "".join(parts)
+        # Whitespace at either end is literal text when it belongs to a multi-line template.
+        out = out if starts_in_template else out.lstrip()
+        out = out if self.in_template else out.rstrip()
+        if self.hash_comments and (m := _HEREDOC_RE.search(out)):
+            self.heredoc = m.group(1)
+        return out
+
+
+def canonicalize(text: str, language: str) -> str:
+    """Canonical form of `text` for `language` ('terraform' or 'cdk'); one output line per input line."""
+    scanner = _Canonicalizer(language)
+    return "\n".join(scanner.line(line) for line in text.split("\n"))
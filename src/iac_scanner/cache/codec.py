@@ -0,0 +1,54 @@
+"""On-disk encoding of cache values: JSON, compressed by size.
+
+Fix results hold a whole regenerated file set, so they dominate cache disk
+usage. A value is stored as one tag byte followed by its payload:
+
+- `j`: UTF-8 JSON, for values under `ZLIB_MIN_BYTES` (compression would not pay).
+- `z`: zlib-compressed JSON, up to `LZMA_MIN_BYTES`. Fast both ways.
+- `x`: lzma (xz) compressed JSON for the largest values, where the better
+  ratio is worth the slower compression.
+
+Backends decode only fresh entries they are about to return, and the L1
+keeps decoded values, so each entry is decompressed at most once per process.
+"""
+
+from __future__ import annotations
+
+import json
+import lzma
+import zlib
+from typing import Any
+
+ZLIB_MIN_BYTES = 1024
+LZMA_MIN_BYTES = 256 * 1024
+ZLIB_LEVEL = 6
+LZMA_PRESET = 6
+
+_JSON, _ZLIB, _LZMA = b"j", b"z", b"x"
+
+
+class CodecError(ValueError):
+    """A stored blob has an unknown tag or a corrupt payload."""
+
+
+def encode(value: Any) -> bytes:
+    raw = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    if len(raw) >= LZMA_MIN_BYTES:
+        return _LZMA + lzma.compress(raw, preset=LZMA_PRESET)
+    if len(raw) >= ZLIB_MIN_BYTES:
+        return _ZLIB + zlib.compress(raw, ZLIB_LEVEL)
+    return _JSON + raw
+
+
+def decode(blob: bytes) -> Any:
+    tag, payload = blob[:1], blob[1:]
+    try:
+        if tag == _ZLIB:
+            payload = zlib.decompress(payload)
+        elif tag == _LZMA:
+            payload = lzma.decompress(payload)
+        elif tag != _JSON:
+            raise CodecError(f"Unknown cache entry tag {tag!r}")
+        return json.loads(payload)
+    except (zlib.error, lzma.LZMAError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise CodecError(str(e)) from e
@@ -0,0 +1,163 @@
+"""Default cache backend: one file per entry, sharded by digest prefix."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from iac_scanner.cache.base import CacheBackend, CacheStats, GcResult
+from iac_scanner.cache.codec import CodecError, decode, encode
+
+logger = logging.getLogger(__name__)
+
+_SHARD_RE = re.compile(r"[0-9a-f]{2}")
+# `.json` files are entries from before encoded values; maintenance still counts and removes them.
+_ENTRY_SUFFIXES = (".entry", ".json")
+_TMP_SUFFIX = ".tmp"
+TMP_STALE_SECONDS = 3600  # a temp file this old was left by a crashed writer
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Write `data` to a temp file next to `path`, then rename it into place.
+
+    Readers see either the old file or the complete new one, never a partial
+    write, and concurrent writers of the same path simply replace each other.
+    Raises OSError; callers decide whether that matters.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=_TMP_SUFFIX)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class FileBackend(CacheBackend):
+    """`<root>/<digest[:2]>/<digest>.entry`: a JSON header line, then the encoded value.
+
+    The header (`{"stored_at": ..., "digest": ...}`) is read first, so an
+    expired entry is never decompressed. Maintenance (`stats`, `gc`,
+    `clear`) works from `os.scandir` metadata only: an entry's mtime is its
+    write time, so no entry is opened or parsed.
+    """
+
+    name = "files"
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def entry_path(self, digest: str) -> Path:
+        # Shard by first two chars to keep directory listings small.
+        return self.root / digest[:2] / f"{digest}.entry"
+
+    def get_many(self, digests: Iterable[str], ttl_seconds: int) -> dict[str, tuple[float, Any]]:
+        found: dict[str, tuple[float, Any]] = {}
+        for digest in digests:
+            blob = self.read_blob(digest, ttl_seconds)
+            if blob is None:
+                continue
+            try:
+                found[digest] = blob[0], decode(blob[1])
+            except CodecError as e:
+                logger.debug("Cache entry %s is corrupt: %s", self.entry_path(digest), e)
+        return found
+
+    def put(self, digest: str, value: Any, stored_at: float | None = None) -> None:
+        self.write_blob(digest, encode(value), stored_at)
+
+    def read_blob(self, digest: str, ttl_seconds: float) -> tuple[float, bytes] | None:
+        """`(stored_at, encoded value)` if the entry is younger than `ttl_seconds`; the value is not decoded."""
+        path = self.entry_path(digest)
+        try:
+            with path.open("rb") as f:
+                stored_at = float(json.loads(f.readline()).get("stored_at", 0))
+                if time.time() - stored_at > ttl_seconds:
+                    return None
+                return stored_at, f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, AttributeError) as e:
+            logger.debug("Cache read failed for %s: %s", path, e)
+            return None
+
+    def write_blob(self, digest: str, blob: bytes, stored_at: float | None = None) -> None:
+        """Store an already encoded value (see `cache/codec.py`)."""
+        path = self.entry_path(digest)
+        header = json.dumps({"stored_at": time.time() if stored_at is None else stored_at, "digest": digest})
+        try:
+            atomic_write(path, header.encode("utf-8") + b"\n" + blob)
+        except OSError as e:
+            logger.debug("Cache write failed for %s: %s", path, e)
+
+    def _entries(self, suffixes: tuple[str, ...] = _ENTRY_SUFFIXES) -> Iterator[tuple[Path, int, float]]:
+        """(path, size, mtime) for every entry file, skipping anything that vanishes mid-walk."""
+        try:
+            shards = [d for d in os.scandir(self.root) if d.is_dir() and _SHARD_RE.fullmatch(d.name)]
+        except OSError:
+            return
+        for shard in shards:
+            try:
+                with os.scandir(shard.path) as it:
+                    for entry in it:
+                        if not entry.name.endswith(suffixes):
+                            continue
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        yield Path(entry.path), st.st_size, st.st_mtime
+            except OSError:
+                continue
+
+    def stats(self) -> CacheStats:
+        now = time.time()
+        out = CacheStats(backend=self.name)
+        for _, size, mtime in self._entries():
+            out.add(size, now - mtime)
+        return out
+
+    def gc(self, ttl_seconds: int, max_bytes: int) -> GcResult:
+        now = time.time()
+        result = GcResult()
+        live: list[tuple[float, int, Path]] = []
+        for path, size, mtime in self._entries():
+            if now - mtime > ttl_seconds:
+                self._remove(path, size, result)
+            else:
+                live.append((mtime, size, path))
+        for path, _, mtime in self._entries((_TMP_SUFFIX,)):
+            if now - mtime > TMP_STALE_SECONDS:
+                path.unlink(missing_ok=True)
+        total = sum(size for _, size, _ in live)
+        if max_bytes > 0 and total > max_bytes:
+            for _, size, path in sorted(live, key=lambda e: e[0]):
+                if total <= max_bytes:
+                    break
+                self._remove(path, size, result)
+                total -= size
+        return result
+
+    def clear(self) -> int:
+        result = GcResult()
+        for path, size, _ in self._entries():
+            self._remove(path, size, result)
+        return result.removed
+
+    @staticmethod
+    def _remove(path: Path, size: int, result: GcResult) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            return
+        result.removed += 1
+        result.freed_bytes += size
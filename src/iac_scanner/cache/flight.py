@@ -0,0 +1,109 @@
+"""Single-flight coordination: one computation per cache key across processes.
+
+When several `scan-tree` workers (or separate runs) miss the same key at the
+same time, only one of them should pay for the LLM call. `single_flight`
+claims `<cache dir>/locks/<digest>.lock` with an exclusive create; the owner
+computes and stores the value, the others poll the cache until it appears.
+
+A waiter takes over when the lock disappears without a value (the owner
+failed), when the owner process is gone (same host), or when the lock is
+older than `LOCK_STALE_SECONDS`. Taking over only costs a duplicate call, never
+a wrong result, so every failure path falls back to computing.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+LOCK_STALE_SECONDS = 900.0  # longer than any single LLM call should take
+POLL_INITIAL_SECONDS = 0.05
+POLL_MAX_SECONDS = 1.0
+
+
+def lock_path(lock_dir: Path, digest: str) -> Path:
+    return lock_dir / f"{digest}.lock"
+
+
+def _claim(path: Path) -> bool:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        return False
+    try:
+        os.write(fd, f"{socket.gethostname()} {os.getpid()}\n".encode())
+    finally:
+        os.close(fd)
+    return True
+
+
+def _owner_gone(path: Path) -> bool:
+    """True when the lock is stale: too old, or held by a dead process on this host."""
+    try:
+        if time.time() - path.stat().st_mtime > LOCK_STALE_SECONDS:
+            return True
+        host, pid = path.read_text(encoding="utf-8").split()
+    except FileNotFoundError:
+        return False  # released just now; the next loop sees it
+    except (OSError, ValueError):
+        return False  # being written; give it another poll
+    if host != socket.gethostname():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except (OSError, ValueError):
+        return False
+    return False
+
+
+def single_flight(
+    lock_dir: Path,
+    digest: str,
+    *,
+    lookup: Callable[[], T | None],
+    compute: Callable[[], T],
+    store: Callable[[T], None],
+) -> tuple[T, bool]:
+    """Return `(value, computed_here)`: the cached value, or one computed and stored by exactly one caller."""
+    path = lock_path(lock_dir, digest)
+    delay = POLL_INITIAL_SECONDS
+    while True:
+        try:
+            claimed = _claim(path)
+        except OSError as e:
+            logger.debug("Cache lock unavailable at %s: %s", path, e)
+            value = compute()
+            store(value)
+            return value, True
+        if claimed:
+            try:
+                # Re-check: the previous owner may have stored it between our miss and our claim.
+                found = lookup()
+                if found is not None:
+                    return found, False
+                value = compute()
+                store(value)
+                return value, True
+            finally:
+                path.unlink(missing_ok=True)
+        found = lookup()
+        if found is not None:
+            return found, False
+        if _owner_gone(path):
+            logger.debug("Taking over stale cache lock %s", path)
+            path.unlink(missing_ok=True)
+            continue
+        time.sleep(delay)
+        delay = min(delay * 2, POLL_MAX_SECONDS)
@@ -0,0 +1,229 @@
+"""Cache upkeep: lookup counters, garbage collection and clearing.
+
+Lookups are counted in memory and appended to `<cache dir>/stats.log` as
+`hits misses` lines (every `_FLUSH_EVERY` lookups, at exit, and after each
+`scan-tree` root), so parallel workers never rewrite a shared file.
+`iac-scan cache stats` sums the log; `gc` folds it back into one line.
+
+Garbage collection deletes entries past the TTL, then the oldest entries
+until the cache fits `IAC_CACHE_MAX_BYTES`. It also expires the fingerprint
+manifests (`manifest/`) and HCL indexes (`index/`) kept next to the entries,
+and stale single-flight locks (`locks/`).
+Besides the explicit command, the first cache write in a process runs it when
+the last collection is older than `IAC_CACHE_GC_INTERVAL` seconds and no other
+process holds `.gc.lock`; every other write pays one dictionary lookup.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from iac_scanner.cache.base import CacheBackend, CacheStats, GcResult
+from iac_scanner.cache.flight import LOCK_STALE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GC_INTERVAL_SECONDS = 24 * 3600
+GC_LOCK_STALE_SECONDS = 3600  # a lock this old belongs to a crashed collector
+SIDECAR_DIRS = ("manifest", "index")
+
+_STATS_LOG = "stats.log"
+_GC_STAMP = ".last-gc"
+_GC_LOCK = ".gc.lock"
+_FLUSH_EVERY = 32
+
+_lock = threading.Lock()
+_pending: dict[Path, list[int]] = {}  # root -> [hits, misses] not yet appended
+_gc_checked: set[Path] = set()
+
+
+def gc_interval_seconds() -> int:
+    """Configurable via IAC_CACHE_GC_INTERVAL. Default 24 h; 0 disables opportunistic GC."""
+    raw = os.environ.get("IAC_CACHE_GC_INTERVAL")
+    if raw is None:
+        return DEFAULT_GC_INTERVAL_SECONDS
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        logger.warning("Invalid IAC_CACHE_GC_INTERVAL=%r; using default", raw)
+        return DEFAULT_GC_INTERVAL_SECONDS
+
+
+def record_lookups(root: Path, hits: int, misses: int) -> None:
+    """Count lookups against the cache in `root`; appends to the log in batches."""
+    if not hits and not misses:
+        return
+    with _lock:
+        counts = _pending.setdefault(root, [0, 0])
+        counts[0] += hits
+        counts[1] += misses
+        due = counts[0] + counts[1] >= _FLUSH_EVERY
+    if due:
+        flush_stats()
+
+
+def flush_stats() -> None:
+    """Append this process's pending lookup counts to each cache's stats log."""
+    with _lock:
+        pending = {root: counts for root, counts in _pending.items() if any(counts)}
+        _pending.clear()
+    for root, (hits, misses) in pending.items():
+        try:
+            root.mkdir(parents=True, exist_ok=True)
+            fd = os.open(root / _STATS_LOG, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, f"{hits} {misses}\n".encode("ascii"))
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.debug("Cache stats write failed in %s: %s", root, e)
+
+
+atexit.register(flush_stats)
+
+
+def _read_lookups(root: Path) -> tuple[int, int]:
+    hits = misses = 0
+    try:
+        lines = (root / _STATS_LOG).read_text(encoding="ascii").splitlines()
+    except (OSError, UnicodeDecodeError):
+        lines = []
+    for line in lines:
+        try:
+            h, m = (int(part) for part in line.split())
+        except ValueError:
+            continue  # torn or foreign line
+        hits, misses = hits + h, misses + m
+    return hits, misses
+
+
+def stats(root: Path, backend: CacheBackend) -> CacheStats:
+    """Entry counts from the backend plus every recorded lookup, this process included."""
+    flush_stats()
+    out = backend.stats()
+    out.hits, out.misses = _read_lookups(root)
+    return out
+
+
+def _expire_sidecars(root: Path, ttl_seconds: int, result: GcResult) -> None:
+    cutoff = time.time() - ttl_seconds
+    for name in SIDECAR_DIRS:
+        try:
+            entries = list(os.scandir(root / name))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                st = entry.stat()
+                if not entry.name.endswith(".json") or st.st_mtime >= cutoff:
+                    continue
+                os.unlink(entry.path)
+            except OSError:
+                continue
+            result.removed += 1
+            result.freed_bytes += st.st_size
+
+
+def _expire_locks(root: Path) -> None:
+    """Remove single-flight locks left behind by crashed workers."""
+    cutoff = time.time() - LOCK_STALE_SECONDS
+    for lock in (root / "locks").glob("*.lock"):
+        try:
+            if lock.stat().st_mtime < cutoff:
+                lock.unlink()
+        except OSError:
+            continue
+
+
+def _compact_stats(root: Path) -> None:
+    """Fold the stats log into one line. Lines appended during the rewrite are lost; it is best-effort."""
+    hits, misses = _read_lookups(root)
+    if not hits and not misses:
+        return
+    tmp = root / f"{_STATS_LOG}.{os.getpid()}.tmp"
+    try:
+        tmp.write_text(f"{hits} {misses}\n", encoding="ascii")
+        os.replace(tmp, root / _STATS_LOG)
+    except OSError as e:
+        logger.debug("Cache stats compaction failed in %s: %s", root, e)
+        tmp.unlink(missing_ok=True)
+
+
+def collect(root: Path, backend: CacheBackend, *, ttl_seconds: int, max_bytes: int) -> GcResult:
+    """Expire old entries, trim to `max_bytes` (0 = no bound), and stamp the run."""
+    flush_stats()
+    result = backend.gc(ttl_seconds, max_bytes)
+    _expire_sidecars(root, ttl_seconds, result)
+    _expire_locks(root)
+    _compact_stats(root)
+    try:
+        root.mkdir(parents=True, exist_ok=True)
+        (root / _GC_STAMP).touch()
+    except OSError as e:
+        logger.debug("Cache gc stamp failed in %s: %s", root, e)
+    return result
+
+
+def clear(root: Path, backend: CacheBackend) -> int:
+    """Delete every entry, manifest, index and lookup count; return the number of entries."""
+    with _lock:
+        _pending.pop(root, None)
+    removed = backend.clear()
+    for name in SIDECAR_DIRS:
+        try:
+            entries = list(os.scandir(root / name))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.endswith(".json"):
+                Path(entry.path).unlink(missing_ok=True)
+    (root / _STATS_LOG).unlink(missing_ok=True)
+    return removed
+
+
+def _claim_gc_lock(root: Path) -> bool:
+    lock = root / _GC_LOCK
+    for _ in range(2):
+        try:
+            os.close(os.open(lock, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - lock.stat().st_mtime < GC_LOCK_STALE_SECONDS:
+                    return False
+                lock.unlink()
+            except OSError:
+                return False
+        except OSError:
+            return False
+    return False
+
+
+def maybe_gc(root: Path, backend: CacheBackend, *, ttl_seconds: int, max_bytes: int) -> None:
+    """Collect if the last run is older than the GC interval; checked once per process and cache."""
+    with _lock:
+        if root in _gc_checked:
+            return
+        _gc_checked.add(root)
+    interval = gc_interval_seconds()
+    if interval <= 0:
+        return
+    try:
+        if time.time() - (root / _GC_STAMP).stat().st_mtime < interval:
+            return
+    except FileNotFoundError:
+        pass
+    except OSError:
+        return
+    if not _claim_gc_lock(root):
+        return
+    try:
+        result = collect(root, backend, ttl_seconds=ttl_seconds, max_bytes=max_bytes)
+        logger.debug("Cache gc in %s removed %d entries (%d bytes)", root, result.removed, result.freed_bytes)
+    finally:
+        (root / _GC_LOCK).unlink(missing_ok=True)
@@ -0,0 +1,92 @@
+"""In-process L1 cache in front of the storage backends.
+
+Long-lived processes (the MCP server, `scan-tree` workers, batch runners)
+look up the same keys again and again. The L1 keeps decoded values, and for
+`get_model` the already-validated Pydantic object, so a repeat hit costs a
+dictionary lookup: no I/O, no JSON parsing, no `model_validate`.
+
+Entries are accounted by the size of their JSON encoding and evicted least
+recently used first once the total passes `IAC_CACHE_MEMORY_BYTES`. The TTL
+counts from when a value was stored, as in the backend it came from, so a
+long-lived process never serves an entry past its age there. Values served from here are
+shared between callers and must be treated as read-only (the pipeline only
+ever derives new findings with `model_copy`).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024  # 64 MiB
+
+
+def memory_cache_bytes() -> int:
+    """Configurable via IAC_CACHE_MEMORY_BYTES. Default 64 MiB; 0 disables the L1."""
+    raw = os.environ.get("IAC_CACHE_MEMORY_BYTES")
+    if raw is None:
+        return DEFAULT_MEMORY_BYTES
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        logger.warning("Invalid IAC_CACHE_MEMORY_BYTES=%r; using default", raw)
+        return DEFAULT_MEMORY_BYTES
+
+
+class _Entry(NamedTuple):
+    stored_at: float
+    size: int
+    value: Any
+
+
+class MemoryCache:
+    """Thread-safe LRU map bounded by the summed size of its entries."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, ttl_seconds: int) -> Any | None:
+        """The value stored under `key` if it was stored less than `ttl_seconds` ago."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry.stored_at > ttl_seconds:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def put(self, key: Hashable, value: Any, size: int, stored_at: float | None = None) -> None:
+        """Insert or replace `key`, stored at `stored_at` (default now); values larger than the budget are not kept."""
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = _Entry(time.time() if stored_at is None else stored_at, size, value)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
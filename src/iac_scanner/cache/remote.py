@@ -0,0 +1,233 @@
+"""Shared remote cache tier: content-addressed GET/PUT over HTTP.
+
+Set `IAC_CACHE_URL` (e.g. `http://cache.internal:8765/iac`) and every
+developer laptop and CI runner pointing at it shares paid results. The
+protocol is keyed by `CacheKey.digest()`, and values travel encoded as in
+`cache/codec.py`:
+
+- `GET <url>/<digest>`: `200` with the encoded value and an `X-Stored-At`
+  header (epoch seconds), or `404`.
+- `PUT <url>/<digest>`: the encoded value as the body; any `2xx` is success.
+- With `IAC_CACHE_TOKEN` set, both carry `Authorization: Bearer <token>`.
+
+Lookups are read-through: digests missing locally are fetched, and remote
+hits are stored in the local tier under their remote `X-Stored-At`, so a
+copy expires when the original does. Writes are write-back: stored locally
+first, then uploaded by a background thread. `iac-scan cache serve` is a
+reference server (`cache/server.py`).
+
+The remote never holds a scan up for long. Every request has a timeout
+(`IAC_CACHE_REMOTE_TIMEOUT`, default 2 s). The first failure switches the
+tier off for `RETRY_AFTER_SECONDS`, so an unreachable server costs at most one
+timeout per minute. Uploads still pending at exit get `FLUSH_TIMEOUT_SECONDS`,
+then they are dropped. Each thread keeps one keep-alive connection.
+"""
+
+from __future__ import annotations
+
+import atexit
+import http.client
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterable
+from typing import Any
+from urllib.parse import urlsplit
+
+from iac_scanner.cache.codec import CodecError, decode, encode
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT_SECONDS = 2.0
+RETRY_AFTER_SECONDS = 60.0
+FLUSH_TIMEOUT_SECONDS = 5.0
+MAX_PENDING_WRITES = 256
+
+STORED_AT_HEADER = "X-Stored-At"
+
+
+def remote_url() -> str:
+    """`IAC_CACHE_URL` without a trailing slash; empty when no remote tier is configured."""
+    return (os.environ.get("IAC_CACHE_URL") or "").strip().rstrip("/")
+
+
+def remote_timeout_seconds() -> float:
+    """Configurable via IAC_CACHE_REMOTE_TIMEOUT. Default 2 s, floored to 0.1 s."""
+    raw = os.environ.get("IAC_CACHE_REMOTE_TIMEOUT")
+    if raw is None:
+        return DEFAULT_TIMEOUT_SECONDS
+    try:
+        return max(0.1, float(raw))
+    except ValueError:
+        logger.warning("Invalid IAC_CACHE_REMOTE_TIMEOUT=%r; using default", raw)
+        return DEFAULT_TIMEOUT_SECONDS
+
+
+class RemoteCache:
+    """Client for one cache server. Thread-safe; never raises."""
+
+    def __init__(self, url: str, *, timeout: float = DEFAULT_TIMEOUT_SECONDS, token: str | None = None) -> None:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported cache URL {url!r}; expected http(s)://host[:port][/path]")
+        self.url = url
+        self.timeout = timeout
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = parts.path.rstrip("/")
+        self._headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self._local = threading.local()  # one keep-alive connection per thread
+        self._down_until = 0.0
+        self._pending: queue.Queue[tuple[str, Any]] = queue.Queue(maxsize=MAX_PENDING_WRITES)
+        self._writer: threading.Thread | None = None
+        self._writer_lock = threading.Lock()
+
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _trip(self, reason: object) -> None:
+        if self.available():
+            logger.warning("Remote cache %s unavailable (%s); retrying in %.0fs", self.url, reason, RETRY_AFTER_SECONDS)
+        self._down_until = time.monotonic() + RETRY_AFTER_SECONDS
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn: http.client.HTTPConnection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+            conn = cls(self._host, self._port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _drop_connection(self) -> None:
+        conn: http.client.HTTPConnection | None = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _request(self, method: str, digest: str, body: bytes | None = None) -> tuple[int, str | None, bytes]:
+        """`(status, X-Stored-At, body)`. A keep-alive connection the server closed is retried once."""
+        headers = dict(self._headers)
+        if body is not None:
+            headers["Content-Type"] = "application/octet-stream"
+        for attempt in (1, 2):
+            conn = self._connection()
+            try:
+                conn.request(method, f"{self._path}/{digest}", body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+                return resp.status, resp.getheader(STORED_AT_HEADER), data
+            except (http.client.HTTPException, OSError) as e:
+                self._drop_connection()
+                if attempt == 1 and isinstance(e, (ConnectionResetError, BrokenPipeError)):
+                    continue
+                raise
+        raise AssertionError("unreachable")
+
+    def get_many(self, digests: Iterable[str], ttl_seconds: int) -> dict[str, tuple[float, Any]]:
+        """`(stored_at, value)` for the fresh digests the server has; stops at the first failure."""
+        found: dict[str, tuple[float, Any]] = {}
+        for digest in digests:
+            if not self.available():
+                break
+            try:
+                status, stored_at, body = self._request("GET", digest)
+            except (http.client.HTTPException, OSError) as e:
+                self._trip(e)
+                break
+            if status == 404:
+                continue
+            if status != 200:
+                self._trip(f"HTTP {status}")
+                break
+            try:
+                stamp = float(stored_at or 0)
+                if time.time() - stamp > ttl_seconds:
+                    continue
+                found[digest] = stamp, decode(body)
+            except (ValueError, CodecError) as e:
+                logger.debug("Discarding remote cache entry %s: %s", digest, e)
+        return found
+
+    def put(self, digest: str, value: Any) -> None:
+        """Queue an upload; dropped when the tier is down or the queue is full."""
+        if not self.available():
+            return
+        self._ensure_writer()
+        try:
+            self._pending.put_nowait((digest, value))
+        except queue.Full:
+            logger.debug("Remote cache upload queue full; dropping %s", digest)
+
+    def _ensure_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="iac-cache-upload", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self) -> None:
+        while True:
+            digest, value = self._pending.get()
+            try:
+                if self.available():
+                    self._upload(digest, value)
+            except Exception as e:  # noqa: BLE001 — an upload must never kill the writer thread
+                logger.debug("Remote cache upload of %s failed: %s", digest, e)
+            finally:
+                self._pending.task_done()
+
+    def _upload(self, digest: str, value: Any) -> None:
+        try:
+            status, _, _ = self._request("PUT", digest, encode(value))
+        except (http.client.HTTPException, OSError) as e:
+            self._trip(e)
+            return
+        if not 200 <= status < 300:
+            self._trip(f"HTTP {status}")
+
+    def flush(self, timeout: float = FLUSH_TIMEOUT_SECONDS) -> bool:
+        """Wait up to `timeout` seconds for queued uploads; True when none are left."""
+        with self._pending.all_tasks_done:
+            return self._pending.all_tasks_done.wait_for(lambda: not self._pending.unfinished_tasks, timeout)
+
+
+_clients: dict[tuple[str, str, float], RemoteCache | None] = {}  # None: invalid URL, warned once
+_clients_lock = threading.Lock()
+
+
+def remote_cache() -> RemoteCache | None:
+    """The client for the current `IAC_CACHE_URL` / token / timeout, created once; None when unset."""
+    url = remote_url()
+    if not url:
+        return None
+    token, timeout = os.environ.get("IAC_CACHE_TOKEN") or "", remote_timeout_seconds()
+    with _clients_lock:
+        if (url, token, timeout) not in _clients:
+            try:
+                _clients[(url, token, timeout)] = RemoteCache(url, timeout=timeout, token=token or None)
+            except ValueError as e:
+                logger.warning("%s; remote cache disabled", e)
+                _clients[(url, token, timeout)] = None
+        return _clients[(url, token, timeout)]
+
+
+def flush_uploads(timeout: float = FLUSH_TIMEOUT_SECONDS) -> None:
+    """Give pending uploads of every client up to `timeout` seconds in total."""
+    deadline = time.monotonic() + timeout
+    with _clients_lock:
+        clients = [client for client in _clients.values() if client is not None]
+    for client in clients:
+        client.flush(max(0.0, deadline - time.monotonic()))
+
+
+def _forget_clients() -> None:
+    # A forked worker must not share its parent's sockets or upload thread.
+    global _clients_lock
+    _clients.clear()
+    _clients_lock = threading.Lock()
+
+
+atexit.register(flush_uploads)
+os.register_at_fork(after_in_child=_forget_clients)
@@ -0,0 +1,112 @@
+"""Reference server for the remote cache tier (`iac-scan cache serve`).
+
+Standard library only: a threaded HTTP/1.1 server speaking the protocol in
+`cache/remote.py`. Entries are stored in the files backend's layout
+(`<dir>/<digest[:2]>/<digest>.entry`), so
+`IAC_CACHE_DIR=<dir> iac-scan cache stats|gc` inspects and prunes them.
+
+The server cannot check that a value belongs to its key, so anyone who can
+PUT can poison the cache. Bind it to a trusted network, and set a token
+(`--token` / `IAC_CACHE_TOKEN`) when others can reach it.
+"""
+
+from __future__ import annotations
+
+import hmac
+import logging
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from iac_scanner.cache.files import FileBackend
+from iac_scanner.cache.remote import STORED_AT_HEADER
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+_DIGEST_RE = re.compile(r"[0-9a-f]{64}")
+_CODEC_TAGS = (b"j", b"z", b"x")
+
+
+class CacheServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        root: Path,
+        *,
+        token: str | None = None,
+        max_body_bytes: int = MAX_BODY_BYTES,
+    ) -> None:
+        self.store = FileBackend(root)
+        self.token = token
+        self.max_body_bytes = max_body_bytes
+        super().__init__(address, _CacheHandler)
+
+
+class _CacheHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so clients reuse one connection
+    server: CacheServer
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002 — base-class signature
+        logger.debug("%s " + format, self.address_string(), *args)
+
+    def _reply(self, status: int, body: bytes = b"", headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _digest(self) -> str | None:
+        """The digest in the last path segment (any prefix is accepted), after the token check."""
+        if self.server.token:
+            expected = f"Bearer {self.server.token}"
+            if not hmac.compare_digest(self.headers.get("Authorization", ""), expected):
+                self.close_connection = True  # an unread PUT body would corrupt the next request
+                self._reply(401)
+                return None
+        digest = self.path.split("?", 1)[0].rsplit("/", 1)[-1]
+        if not _DIGEST_RE.fullmatch(digest):
+            self.close_connection = True
+            self._reply(404)
+            return None
+        return digest
+
+    def do_GET(self) -> None:  # noqa: N802 — http.server dispatch name
+        digest = self._digest()
+        if digest is None:
+            return
+        found = self.server.store.read_blob(digest, float("inf"))
+        if found is None:
+            self._reply(404)
+            return
+        stored_at, blob = found
+        self._reply(200, blob, {"Content-Type": "application/octet-stream", STORED_AT_HEADER: f"{stored_at:.3f}"})
+
+    def do_PUT(self) -> None:  # noqa: N802 — http.server dispatch name
+        digest = self._digest()
+        if digest is None:
+            return
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self.close_connection = True
+            self._reply(411)
+            return
+        if not 0 < length <= self.server.max_body_bytes:
+            self.close_connection = True
+            self._reply(413)
+            return
+        blob = self.rfile.read(length)
+        if len(blob) != length or blob[:1] not in _CODEC_TAGS:
+            self.close_connection = True
+            self._reply(400)
+            return
+        self.server.store.write_blob(digest, blob)
+        self._reply(204)
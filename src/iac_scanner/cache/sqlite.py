@@ -0,0 +1,201 @@
+"""SQLite cache backend (`IAC_CACHE_BACKEND=sqlite`).
+
+All entries live in one database, `<cache dir>/cache.sqlite3`, so a lookup is
+one indexed query instead of a stat, open and read per entry. That matters on
+network-backed home directories. The database runs in WAL mode: readers never
+block the single writer, and parallel workers (threads, or processes on the
+`scan-tree` pool) each open their own connection and wait up to
+`BUSY_TIMEOUT_SECONDS` for the write lock.
+
+Values are stored encoded (`cache/codec.py`) in a BLOB column and decoded
+only for fresh rows that are returned. Every entry records its last access.
+When a write takes the total size over `max_bytes`, the least recently used
+entries are deleted until it fits. The database file keeps its freed pages
+for reuse rather than shrinking.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from iac_scanner.cache.base import CacheBackend, CacheStats, GcResult
+from iac_scanner.cache.codec import CodecError, decode, encode
+
+logger = logging.getLogger(__name__)
+
+BUSY_TIMEOUT_SECONDS = 10.0
+# A hit only rewrites `accessed_at` when the stored time is older than this,
+# so hot keys do not turn every read into a write.
+ACCESS_RESOLUTION_SECONDS = 60.0
+_BATCH = 500  # stays under SQLite's bound-parameter limit
+_SELECT_ENTRIES = "SELECT digest, value, stored_at, accessed_at FROM entries"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    digest TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+-- Covers both the size total and the LRU walk without touching the values.
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (accessed_at, size, digest);
+"""
+
+
+class SqliteBackend(CacheBackend):
+    """Entries in one WAL-mode SQLite database with size-bounded LRU eviction."""
+
+    name = "sqlite"
+
+    def __init__(self, path: Path, *, max_bytes: int = 0) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes  # 0 = unbounded
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """This thread's connection (reopened after a fork); None if the database is unusable."""
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            logger.debug("Cache database unavailable at %s: %s", self.path, e)
+            return None
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get_many(self, digests: Iterable[str], ttl_seconds: int) -> dict[str, tuple[float, Any]]:
+        conn = self._connect()
+        wanted = list(dict.fromkeys(digests))
+        if conn is None or not wanted:
+            return {}
+        now = time.time()
+        found: dict[str, tuple[float, Any]] = {}
+        touched: list[tuple[float, str]] = []
+        try:
+            for i in range(0, len(wanted), _BATCH):
+                batch = wanted[i : i + _BATCH]
+                marks = ",".join("?" * len(batch))
+                query = f"{_SELECT_ENTRIES} WHERE digest IN ({marks})"  # noqa: S608  # nosec B608 — only "?" marks
+                rows = conn.execute(query, batch).fetchall()
+                for digest, value, stored_at, accessed_at in rows:
+                    if now - stored_at > ttl_seconds:
+                        continue
+                    try:
+                        found[digest] = stored_at, decode(value)
+                    except CodecError:
+                        continue
+                    if now - accessed_at > ACCESS_RESOLUTION_SECONDS:
+                        touched.append((now, digest))
+            if touched:
+                conn.executemany("UPDATE entries SET accessed_at = ? WHERE digest = ?", touched)
+        except sqlite3.Error as e:
+            logger.debug("Cache read failed in %s: %s", self.path, e)
+        return found
+
+    def put(self, digest: str, value: Any, stored_at: float | None = None) -> None:
+        self.put_many({digest: value}, None if stored_at is None else {digest: stored_at})
+
+    def put_many(self, items: Mapping[str, Any], stored_at: Mapping[str, float] | None = None) -> None:
+        conn = self._connect()
+        if conn is None or not items:
+            return
+        now = time.time()
+        rows = []
+        for digest, value in items.items():
+            blob = encode(value)
+            rows.append((digest, blob, len(blob), (stored_at or {}).get(digest, now), now))
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO entries (digest, value, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._evict(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.debug("Cache write failed in %s: %s", self.path, e)
+
+    def _evict(self, conn: sqlite3.Connection, max_bytes: int | None = None) -> None:
+        """Delete least recently used entries until the total size is within `max_bytes`."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if max_bytes <= 0:
+            return
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= max_bytes:
+            return
+        conn.execute(
+            "DELETE FROM entries WHERE digest IN ("
+            "  SELECT digest FROM ("
+            "    SELECT digest, SUM(size) OVER ("
+            "      ORDER BY accessed_at DESC, digest DESC ROWS UNBOUNDED PRECEDING"
+            "    ) AS kept FROM entries"
+            "  ) WHERE kept > ?"
+            ")",
+            (max_bytes,),
+        )
+
+    def _totals(self, conn: sqlite3.Connection) -> tuple[int, int]:
+        count, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return int(count), int(size)
+
+    def stats(self) -> CacheStats:
+        out = CacheStats(backend=self.name)
+        conn = self._connect()
+        if conn is None:
+            return out
+        now = time.time()
+        try:
+            for size, stored_at in conn.execute("SELECT size, stored_at FROM entries"):
+                out.add(size, now - stored_at)
+        except sqlite3.Error as e:
+            logger.debug("Cache stats failed in %s: %s", self.path, e)
+        return out
+
+    def gc(self, ttl_seconds: int, max_bytes: int) -> GcResult:
+        conn = self._connect()
+        if conn is None:
+            return GcResult()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                count, size = self._totals(conn)
+                conn.execute("DELETE FROM entries WHERE stored_at < ?", (time.time() - ttl_seconds,))
+                self._evict(conn, max_bytes)
+                left_count, left_size = self._totals(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            logger.debug("Cache gc failed in %s: %s", self.path, e)
+            return GcResult()
+        return GcResult(removed=count - left_count, freed_bytes=size - left_size)
+
+    def clear(self) -> int:
+        conn = self._connect()
+        if conn is None:
+            return 0
+        try:
+            return int(conn.execute("DELETE FROM entries").rowcount)
+        except sqlite3.Error as e:
+            logger.debug("Cache clear failed in %s: %s", self.path, e)
+            return 0
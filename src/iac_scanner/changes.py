@@ -0,0 +1,114 @@
+"""Map a git diff to the Terraform / CDK roots it affects.
+
+`scan-tree --since <ref>` scans only the roots a change touches. The changed
+paths come from the local repository: `git diff --name-only <ref>` (committed
+and uncommitted changes against the ref) plus untracked, non-ignored files.
+No remote is contacted.
+
+A root is affected when a changed path is one of its files (for CDK, any file
+reachable from the entry through relative imports), when a deleted or added
+file sits where the scanner would pick it up, or when a changed path belongs
+to a local Terraform module the root uses, directly or through other modules.
+"""
+
+from __future__ import annotations
+
+import logging
+import subprocess
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+from iac_scanner.scanners._filters import should_skip
+from iac_scanner.scanners.base import IacScanner
+from iac_scanner.scanners.cdk import CdkScanner
+from iac_scanner.scanners.tf_modules import LocalModule, resolve_local_modules
+from iac_scanner.scanners.ts_imports import SOURCE_SUFFIXES
+
+logger = logging.getLogger(__name__)
+
+GIT_TIMEOUT_SECONDS = 60
+
+
+class GitDiffError(RuntimeError):
+    """git is missing, the path is not in a work tree, or the ref does not resolve."""
+
+
+def _git(cwd: Path, *args: str) -> str:
+    cmd = ["git", "-C", str(cwd), *args]
+    logger.debug("Running: %s", " ".join(cmd))
+    try:
+        proc = subprocess.run(  # noqa: S603 — fixed git subcommands; option-like refs are rejected
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=GIT_TIMEOUT_SECONDS,
+            check=False,
+        )
+    except FileNotFoundError as e:
+        raise GitDiffError("git not found on PATH.") from e
+    except subprocess.TimeoutExpired as e:
+        raise GitDiffError(f"git {args[0]} timed out after {GIT_TIMEOUT_SECONDS}s") from e
+    if proc.returncode != 0:
+        raise GitDiffError(proc.stderr.strip() or f"git {args[0]} exited {proc.returncode}")
+    return proc.stdout
+
+
+def changed_paths(base: str | Path, since: str) -> list[Path]:
+    """Absolute paths changed since `since` in the repository containing `base`, sorted.
+
+    Includes committed and uncommitted changes (renames are listed as a
+    deletion plus an addition) and untracked files that are not ignored.
+    """
+    if not since or since.startswith("-"):
+        raise GitDiffError(f"Invalid git ref {since!r}.")
+    base = Path(base).resolve()
+    top = Path(_git(base, "rev-parse", "--show-toplevel").strip()).resolve()
+    diffed = _git(top, "diff", "--name-only", "--no-renames", "-z", since, "--")
+    untracked = _git(top, "ls-files", "--others", "--exclude-standard", "-z")
+    names = {n for n in (diffed + untracked).split("\0") if n}
+    return sorted(top / n for n in names)
+
+
+def _picked_up(scanner: IacScanner, path: Path) -> bool:
+    """Would `scanner` read `path` if it existed? Covers deleted and newly added files."""
+    if isinstance(scanner, CdkScanner):
+        return path.suffix in SOURCE_SUFFIXES and path.is_relative_to(scanner.base_path) and not should_skip(path)
+    return path.suffix == ".tf" and path.parent == scanner.base_path
+
+
+def _module_touched(module: LocalModule, changed: set[Path]) -> bool:
+    return any(p.suffix == ".tf" and p.parent == module.path for p in changed)
+
+
+def affected_roots(
+    scanners: Sequence[IacScanner],
+    changed: Iterable[Path],
+    modules: Sequence[Sequence[LocalModule]] | None = None,
+) -> list[IacScanner]:
+    """The subset of `scanners` (order kept) whose files or local modules include a changed path.
+
+    `modules` is each scanner's resolved local modules when the caller already
+    has them; otherwise Terraform roots are resolved here.
+    """
+    changed_set = {Path(p).resolve() for p in changed}
+    if not changed_set:
+        return []
+    selected: list[IacScanner] = []
+    for i, scanner in enumerate(scanners):
+        files = {f.resolve() for f in scanner.list_files()}
+        if not files.isdisjoint(changed_set) or any(_picked_up(scanner, p) for p in changed_set):
+            selected.append(scanner)
+            continue
+        if isinstance(scanner, CdkScanner):
+            continue
+        if modules is not None:
+            root_modules = modules[i]
+        else:
+            try:
+                root_modules = resolve_local_modules(scanner.base_path)
+            except OSError as e:
+                logger.warning("Module resolution failed for %s: %s", scanner.base_path, e)
+                root_modules = []
+        if any(_module_touched(m, changed_set) for m in root_modules):
+            selected.append(scanner)
+    return selected
@@ -7,10 +7,17 @@ v1.0 additions:
   --max-spend    hard dollar cap for projected LLM cost
   --fail-on      exit-code policy: none|low|medium|high|critical
   --rules-engine checkov|cdk-nag|auto|none  (hybrid mode with rule-engine grounding)
+  --granular     analyze, fix and cache file by file
+
+Commands:
+  scan       one Terraform / CDK root
+  scan-tree  every root under a directory, on a worker pool, with a merged report
+  cache      stats | gc | clear for the response cache
 """
 
 from __future__ import annotations
 
+import json
 import os
 import sys
 import warnings
@@ -18,13 +25,19 @@ from pathlib import Path
 
 import click
 
-from iac_scanner import __version__
+from iac_scanner import __version__, cache
+from iac_scanner.cache.server import DEFAULT_PORT as DEFAULT_CACHE_PORT
+from iac_scanner.cache.server import CacheServer
+from iac_scanner.changes import GitDiffError, affected_roots, changed_paths
 from iac_scanner.cost import CostBudgetExceeded
+from iac_scanner.discovery import discover_roots
 from iac_scanner.factory import create_scanner
 from iac_scanner.llm import ProviderError, auto_detect_provider
 from iac_scanner.orchestration.hybrid import run_hybrid_pipeline
+from iac_scanner.orchestration.manifest import run_incremental, run_signature
 from iac_scanner.orchestration.runner import PipelineResult, run_pipeline
-from iac_scanner.output.report import write_report_and_fixes
+from iac_scanner.orchestration.tree import TreeOptions, run_tree_pipeline
+from iac_scanner.output.report import write_report_and_fixes, write_tree_report
 from iac_scanner.rules import RuleEngineError, available_engines
 from iac_scanner.scanners._filters import InputTooLargeError
 
@@ -63,6 +76,25 @@ def _exit_code_for_findings(findings: list[dict[str, object]], fail_on: str) ->
     return 0
 
 
+def _validate_rules_engine(rules_engine: str) -> None:
+    """Validate --rules-engine early with the full set of discovered plugins.
+
+    A typo surfaces a clear "did you mean checkov or cdk-nag?" hint instead of
+    running the entire pipeline and failing mid-way.
+    """
+    if rules_engine in ("none", "auto"):
+        return
+    valid = set(available_engines()) | {"checkov", "cdk-nag"}
+    if rules_engine not in valid:
+        click.echo(
+            f"Unknown --rules-engine {rules_engine!r}. "
+            f"Built-ins: checkov. Installed plugins: {sorted(valid - {'checkov'}) or 'none'}. "
+            f"Use 'none', 'auto', or one of those names.",
+            err=True,
+        )
+        raise SystemExit(1)
+
+
 @click.group()
 @click.version_option(version=__version__, prog_name="iac-scan")
 def main() -> None:
@@ -139,6 +171,30 @@ def main() -> None:
     envvar="IAC_MAX_SPEND_USD",
     help="Hard dollar cap for projected LLM cost (pre-flight token estimate). Aborts if exceeded.",
 )
+@click.option(
+    "--chunked",
+    is_flag=True,
+    envvar="IAC_CHUNKED",
+    help=(
+        "Analyze large inputs in token-budgeted chunks (IAC_CHUNK_TOKENS, default 24000) "
+        "instead of failing at the input cap. Skips the fix step when more than one chunk is needed."
+    ),
+)
+@click.option(
+    "--granular",
+    is_flag=True,
+    envvar="IAC_GRANULAR",
+    help=(
+        "Analyze and fix file by file, each cached on its own, so editing one file "
+        "re-sends only that file to the LLM. Cross-file issues may be missed."
+    ),
+)
+@click.option(
+    "--no-modules",
+    is_flag=True,
+    envvar="IAC_NO_MODULES",
+    help='Do not follow local Terraform module sources (`source = "../modules/x"`).',
+)
 @click.option(
     "--fail-on",
     type=click.Choice(["none", "info", "low", "medium", "high", "critical"]),
@@ -168,6 +224,9 @@ def scan(
     fix_ai: str | None,
     no_cache: bool,
     max_spend: float | None,
+    chunked: bool,
+    granular: bool,
+    no_modules: bool,
     fail_on: str,
     rules_engine: str,
 ) -> None:
@@ -180,24 +239,18 @@ def scan(
         os.environ["IAC_NO_CACHE"] = "1"
     if max_spend is not None:
         os.environ["IAC_MAX_SPEND_USD"] = str(max_spend)
+    if chunked:
+        os.environ["IAC_CHUNKED"] = "1"
+    if granular:
+        os.environ["IAC_GRANULAR"] = "1"
+    if no_modules:
+        os.environ["IAC_NO_MODULES"] = "1"
     if rules_engine != "none":
         os.environ["IAC_RULES_ENGINE"] = rules_engine
     if output_format in ("sarif", "both"):
         os.environ["IAC_OUTPUT_FORMAT"] = output_format
 
-    # Validate --rules-engine early with the full set of discovered plugins,
-    # so a typo surfaces a clear "did you mean checkov or cdk-nag?" hint instead
-    # of running the entire pipeline and failing mid-way.
-    if rules_engine not in ("none", "auto"):
-        valid = set(available_engines()) | {"checkov", "cdk-nag"}
-        if rules_engine not in valid:
-            click.echo(
-                f"Unknown --rules-engine {rules_engine!r}. "
-                f"Built-ins: checkov. Installed plugins: {sorted(valid - {'checkov'}) or 'none'}. "
-                f"Use 'none', 'auto', or one of those names.",
-                err=True,
-            )
-            raise SystemExit(1)
+    _validate_rules_engine(rules_engine)
 
     try:
         scanner = create_scanner(path)
@@ -232,20 +285,23 @@ def scan(
             stages += " -> fix"
         click.echo(f"Running {stages}...")
 
-        try:
+        def run() -> PipelineResult:
             if rules_engine != "none":
-                result = run_hybrid_pipeline(
+                return run_hybrid_pipeline(
                     scanner,
                     engine=rules_engine,
                     provider=picked,  # type: ignore[arg-type]
                     skip_fix=no_fix,
                 )
-            else:
-                result = run_pipeline(
-                    scanner,
-                    provider=picked,  # type: ignore[arg-type]
-                    skip_fix=no_fix,
-                )
+            return run_pipeline(
+                scanner,
+                provider=picked,  # type: ignore[arg-type]
+                skip_fix=no_fix,
+            )
+
+        signature = run_signature(provider=picked, skip_fix=no_fix, rules_engine=rules_engine, follow_modules=None)
+        try:
+            result = run_incremental(scanner, run, signature)
         except CostBudgetExceeded as e:
             click.echo(f"Cost guardrail: {e}", err=True)
             raise SystemExit(2) from e
@@ -272,6 +328,17 @@ def scan(
         click.echo(f"  - {p}")
 
     findings_dicts = result.findings_list
+    if result.scan_result.metadata.get("manifest") == "unchanged":
+        click.echo("No changes since the last run; served from the manifest.")
+    elif changed := result.scan_result.metadata.get("changed_files"):
+        click.echo("Changed since the last run: " + ", ".join(f"{len(v)} {k}" for k, v in changed.items()))
+    if chunks := result.scan_result.metadata.get("analysis_chunks"):
+        skipped = " (fix step skipped)" if not no_fix and not result.fixed_code else ""
+        click.echo(f"Analyzed in {chunks} chunks{skipped}.")
+    if units := result.scan_result.metadata.get("analysis_units"):
+        click.echo(f"Analyzed file by file: {units} unit(s)")
+    if modules := result.scan_result.metadata.get("modules"):
+        click.echo(f"Local modules analyzed: {len(modules)}")
     click.echo(f"Findings: {len(findings_dicts)}")
     if result.cost_estimates and result.projected_cost_usd > 0:
         click.echo(
@@ -286,5 +353,405 @@ def scan(
     sys.exit(code)
 
 
+@main.command("scan-tree")
+@click.argument(
+    "path",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    required=True,
+)
+@click.option(
+    "-o",
+    "--output-dir",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Directory for the merged report and per-root outputs. Default: <path>/scan-output",
+)
+@click.option(
+    "--report-name",
+    default="scan-tree-report.json",
+    help="Merged report filename (default: scan-tree-report.json)",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "sarif", "both"]),
+    default="json",
+    help="Output format for the merged report (default: json).",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes. Each worker imports the pipeline once and scans many roots.",
+)
+@click.option("--no-fix", is_flag=True, help="Only produce reports; do not run the fix step.")
+@click.option("--scan-only", is_flag=True, help="Only discover and scan files (no AI).")
+@click.option(
+    "--provider",
+    type=click.Choice(["openai", "anthropic", "github", "ollama", "auto"]),
+    default="auto",
+    envvar="IAC_PROVIDER",
+    help="LLM provider. 'auto' picks from env: ollama → github → openai → anthropic.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    envvar="IAC_NO_CACHE",
+    help="Skip the response cache; every root calls the LLM fresh.",
+)
+@click.option(
+    "--max-spend",
+    type=float,
+    default=None,
+    envvar="IAC_MAX_SPEND_USD",
+    help="Hard dollar cap for projected LLM cost, applied per root.",
+)
+@click.option(
+    "--chunked",
+    is_flag=True,
+    envvar="IAC_CHUNKED",
+    help="Analyze large roots in token-budgeted chunks, as for `scan`.",
+)
+@click.option(
+    "--granular",
+    is_flag=True,
+    envvar="IAC_GRANULAR",
+    help=(
+        "Analyze and fix file by file, each cached on its own, so editing one file "
+        "re-sends only that file to the LLM. Cross-file issues may be missed."
+    ),
+)
+@click.option(
+    "--no-modules",
+    is_flag=True,
+    envvar="IAC_NO_MODULES",
+    help="Do not follow local Terraform module sources. Otherwise each shared module is analyzed once per tree.",
+)
+@click.option(
+    "--fail-on",
+    type=click.Choice(["none", "info", "low", "medium", "high", "critical"]),
+    default="none",
+    help="Exit non-zero if findings at this severity or above are present in any root.",
+)
+@click.option(
+    "--rules-engine",
+    type=str,
+    default="none",
+    help="Rule-engine hybrid mode, as for `scan`: none | auto | checkov | <plugin>.",
+)
+@click.option(
+    "--since",
+    "since",
+    metavar="GIT_REF",
+    default=None,
+    help="Only scan roots affected by changes since this local git ref (including roots using a changed module).",
+)
+def scan_tree(
+    path: Path,
+    output_dir: Path | None,
+    report_name: str,
+    output_format: str,
+    jobs: int,
+    no_fix: bool,
+    scan_only: bool,
+    provider: str,
+    no_cache: bool,
+    max_spend: float | None,
+    chunked: bool,
+    granular: bool,
+    no_modules: bool,
+    fail_on: str,
+    rules_engine: str,
+    since: str | None,
+) -> None:
+    """Discover every Terraform / CDK root under PATH and scan them all.
+
+    Writes one merged report (with per-root summaries) plus each root's own
+    report and fixed code under OUTPUT_DIR/roots/<relative root>/. With
+    --since, only roots affected by the local git diff against GIT_REF run.
+    """
+    if no_cache:
+        os.environ["IAC_NO_CACHE"] = "1"
+    if max_spend is not None:
+        os.environ["IAC_MAX_SPEND_USD"] = str(max_spend)
+    if chunked:
+        os.environ["IAC_CHUNKED"] = "1"
+    if granular:
+        os.environ["IAC_GRANULAR"] = "1"
+    if no_modules:
+        os.environ["IAC_NO_MODULES"] = "1"
+    _validate_rules_engine(rules_engine)
+
+    out = output_dir or (path / "scan-output")
+    scanners = discover_roots(path, exclude=[out])
+    if not scanners:
+        click.echo(f"No Terraform (main.tf) or CDK (index.ts/index.js) roots found under {path}.", err=True)
+        raise SystemExit(1)
+    click.echo(f"Discovered {len(scanners)} root(s) under {path}")
+    if since is not None:
+        try:
+            changed = changed_paths(path, since)
+        except GitDiffError as e:
+            click.echo(f"git error: {e}", err=True)
+            raise SystemExit(1) from e
+        scanners = affected_roots(scanners, changed)
+        click.echo(f"Affected by changes since {since}: {len(scanners)} root(s) ({len(changed)} changed path(s))")
+        if not scanners:
+            click.echo("Nothing to scan.")
+            return
+
+    picked: str | None = None
+    if not scan_only:
+        try:
+            picked = _resolve_provider(provider, None, None) or auto_detect_provider()
+        except ProviderError as e:
+            click.echo(str(e), err=True)
+            raise SystemExit(1) from e
+        click.echo(f"Provider: {picked}")
+
+    options = TreeOptions(
+        provider=picked,  # type: ignore[arg-type]
+        skip_fix=no_fix,
+        scan_only=scan_only,
+        rules_engine=rules_engine,
+    )
+    tree = run_tree_pipeline(path, scanners, options=options, jobs=jobs)
+
+    written = write_tree_report(
+        tree,
+        out,
+        report_name=report_name,
+        write_fixed=not no_fix,
+        output_format=output_format,
+    )
+    click.echo(f"Output written to: {out}")
+    click.echo(f"  - {written[0]}" if written else "  (nothing written)")
+
+    findings_dicts = tree.findings_list
+    click.echo(f"Roots: {len(tree.roots)} ({len(tree.failed)} failed). Findings: {len(findings_dicts)}")
+    for failed in tree.failed:
+        click.echo(f"  ! {tree.relative_root(failed)}: {failed.error}", err=True)
+    unchanged = sum(1 for r in tree.roots if r.result and r.result.scan_result.metadata.get("manifest") == "unchanged")
+    if unchanged:
+        click.echo(f"Unchanged since the last run (served from the manifest): {unchanged}")
+    if tree.cost_estimates and tree.projected_cost_usd > 0:
+        click.echo(f"Projected LLM cost: ${tree.projected_cost_usd:.4f} (cache hits: {tree.cache_hits})")
+
+    if tree.failed:
+        sys.exit(1)
+    code = _exit_code_for_findings(findings_dicts, fail_on)
+    if code != 0:
+        click.echo(f"Exiting {code}: findings at or above '{fail_on}' severity.", err=True)
+    sys.exit(code)
+
+
+def _format_bytes(n: int) -> str:
+    if n < 1024:
+        return f"{n} B"
+    size = float(n)
+    for unit in ("KiB", "MiB", "GiB"):
+        size /= 1024
+        if size < 1024:
+            break
+    return f"{size:.1f} {unit}"
+
+
+@main.group("cache")
+def cache_group() -> None:
+    """Inspect and prune the response cache (see IAC_CACHE_DIR / IAC_CACHE_BACKEND)."""
+    pass
+
+
+@cache_group.command("stats")
+@click.option("--json", "as_json", is_flag=True, help="Print the stats as JSON.")
+def cache_stats(as_json: bool) -> None:
+    """Entry count, size, lookup hit rate and an age histogram."""
+    stats = cache.stats()
+    if as_json:
+        payload = {
+            "directory": str(cache.cache_root()),
+            "backend": stats.backend,
+            "entries": stats.entries,
+            "bytes": stats.bytes,
+            "hits": stats.hits,
+            "misses": stats.misses,
+            "hit_rate": stats.hit_rate,
+            "ages": stats.ages,
+        }
+        click.echo(json.dumps(payload, indent=2))
+        return
+    click.echo(f"Cache: {cache.cache_root()} ({stats.backend})")
+    click.echo(f"Entries: {stats.entries} ({_format_bytes(stats.bytes)})")
+    rate = "n/a" if stats.hit_rate is None else f"{stats.hit_rate:.1%}"
+    click.echo(f"Lookups: {stats.hits + stats.misses} (hit rate {rate})")
+    click.echo("Age:")
+    for label, count in stats.ages.items():
+        click.echo(f"  {label:>6}  {count}")
+
+
+@cache_group.command("gc")
+@click.option(
+    "--max-bytes",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Trim the cache to this many bytes, oldest first (default: IAC_CACHE_MAX_BYTES; 0 = no bound).",
+)
+def cache_gc(max_bytes: int | None) -> None:
+    """Delete expired entries, then the oldest until the cache fits its size cap."""
+    result = cache.gc(max_bytes=max_bytes)
+    click.echo(f"Removed {result.removed} entries ({_format_bytes(result.freed_bytes)}).")
+
+
+@cache_group.command("clear")
+@click.option("--yes", "-y", is_flag=True, help="Do not ask for confirmation.")
+def cache_clear(yes: bool) -> None:
+    """Delete every cached entry, fingerprint manifest and HCL index."""
+    if not yes:
+        click.confirm(f"Delete everything in {cache.cache_root()}?", abort=True)
+    removed = cache.clear()
+    click.echo(f"Removed {removed} entries.")
+
+
+@cache_group.command("warm")
+@click.argument("path", type=click.Path(exists=True, file_okay=False, path_type=Path), required=True)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes, i.e. roots in flight at once.",
+)
+@click.option(
+    "--fix", "with_fix", is_flag=True, help="Also warm the fix step (one more LLM call per root with findings)."
+)
+@click.option(
+    "--provider",
+    type=click.Choice(["openai", "anthropic", "github", "ollama", "auto"]),
+    default="auto",
+    envvar="IAC_PROVIDER",
+    help="LLM provider. 'auto' picks from env: ollama → github → openai → anthropic.",
+)
+@click.option(
+    "--budget",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Total dollar cap for the run: no new root starts once this much projected LLM cost is spent.",
+)
+@click.option(
+    "--max-spend",
+    type=float,
+    default=None,
+    envvar="IAC_MAX_SPEND_USD",
+    help="Hard dollar cap for projected LLM cost, applied per root.",
+)
+@click.option("--chunked", is_flag=True, envvar="IAC_CHUNKED", help="Warm chunked analysis keys, as for `scan`.")
+@click.option("--granular", is_flag=True, envvar="IAC_GRANULAR", help="Warm per-file keys, as for `scan`.")
+@click.option("--no-modules", is_flag=True, envvar="IAC_NO_MODULES", help="Do not follow local Terraform modules.")
+@click.option(
+    "--rules-engine",
+    type=str,
+    default="none",
+    help="Rule-engine hybrid mode, as for `scan`: none | auto | checkov | <plugin>.",
+)
+def cache_warm(
+    path: Path,
+    jobs: int,
+    with_fix: bool,
+    provider: str,
+    budget: float | None,
+    max_spend: float | None,
+    chunked: bool,
+    granular: bool,
+    no_modules: bool,
+    rules_engine: str,
+) -> None:
+    """Pre-populate the cache for every Terraform / CDK root under PATH.
+
+    Runs the same analysis (and with --fix, fix) calls that `scan-tree` would
+    under the current prompt, provider and model settings, but writes no
+    reports. Run it off-peak after a prompt or model change so daytime scans
+    with the same flags are cache hits.
+    """
+    if cache.is_disabled():
+        click.echo("The cache is disabled (IAC_NO_CACHE); nothing to warm.", err=True)
+        raise SystemExit(1)
+    if max_spend is not None:
+        os.environ["IAC_MAX_SPEND_USD"] = str(max_spend)
+    if chunked:
+        os.environ["IAC_CHUNKED"] = "1"
+    if granular:
+        os.environ["IAC_GRANULAR"] = "1"
+    if no_modules:
+        os.environ["IAC_NO_MODULES"] = "1"
+    _validate_rules_engine(rules_engine)
+
+    scanners = discover_roots(path)
+    if not scanners:
+        click.echo(f"No Terraform (main.tf) or CDK (index.ts/index.js) roots found under {path}.", err=True)
+        raise SystemExit(1)
+    try:
+        picked = _resolve_provider(provider, None, None) or auto_detect_provider()
+    except ProviderError as e:
+        click.echo(str(e), err=True)
+        raise SystemExit(1) from e
+    click.echo(f"Warming {len(scanners)} root(s) under {path} with {picked}")
+
+    options = TreeOptions(
+        provider=picked,  # type: ignore[arg-type]
+        skip_fix=not with_fix,
+        rules_engine=rules_engine,
+    )
+    tree = run_tree_pipeline(path, scanners, options=options, jobs=jobs, budget_usd=budget)
+
+    failed = [r for r in tree.failed if not r.skipped]
+    click.echo(
+        f"Roots: {len(tree.roots)} ({len(failed)} failed, {len(tree.skipped)} skipped). "
+        f"LLM calls: {len(tree.cost_estimates)}, cache hits: {tree.cache_hits}, "
+        f"projected cost: ${tree.projected_cost_usd:.4f}"
+    )
+    for root in failed:
+        click.echo(f"  ! {tree.relative_root(root)}: {root.error}", err=True)
+    if tree.skipped:
+        click.echo(f"Budget ${budget:.2f} reached; {len(tree.skipped)} root(s) not warmed.", err=True)
+    if failed:
+        sys.exit(1)
+
+
+@cache_group.command("serve")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Address to bind.")
+@click.option("--port", type=click.IntRange(0, 65535), default=DEFAULT_CACHE_PORT, show_default=True)
+@click.option(
+    "--dir",
+    "directory",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Where entries are stored (default: <cache dir>/server).",
+)
+@click.option(
+    "--token",
+    envvar="IAC_CACHE_TOKEN",
+    default=None,
+    help="Require 'Authorization: Bearer TOKEN' on every request (env IAC_CACHE_TOKEN).",
+)
+def cache_serve(host: str, port: int, directory: Path | None, token: str | None) -> None:
+    """Serve a shared cache over HTTP; point clients at it with IAC_CACHE_URL."""
+    root = directory or cache.cache_root() / "server"
+    try:
+        server = CacheServer((host, port), root, token=token)
+    except OSError as e:
+        click.echo(f"Cannot listen on {host}:{port}: {e}", err=True)
+        sys.exit(1)
+    click.echo(f"Serving {root} at http://{host}:{server.server_address[1]}/ (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,55 @@
+"""Discover every Terraform / CDK root under a directory tree.
+
+`create_scanner` handles a single root. Monorepos hold hundreds of them, so
+`discover_roots` walks the tree once, classifies each directory with the
+scanners' own `can_handle` checks, and returns one scanner per root.
+
+Walk rules:
+  - Directories matching the skip-list (`.terraform`, `node_modules`, `cdk.out`,
+    `.venv`, ...) are pruned before descending — the walker never enters them.
+  - Terraform roots do not stop the walk: nested roots (e.g. `envs/prod` under
+    `envs/`) are common and each is scanned on its own.
+  - CDK roots do stop the walk: everything below an `index.ts` app belongs to
+    that app (barrel `index.ts` files in `lib/` are not separate apps).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from pathlib import Path
+
+from iac_scanner.scanners._filters import walk_unskipped
+from iac_scanner.scanners.base import IacScanner
+from iac_scanner.scanners.cdk import CdkScanner
+from iac_scanner.scanners.terraform import TerraformScanner
+
+# Cheap filename gate so `can_handle` (which stats the filesystem) only runs on
+# directories that could plausibly be a root.
+_ENTRY_NAMES = frozenset({"main.tf", "index.ts", "index.js"})
+
+
+def discover_roots(base: str | Path, *, exclude: Iterable[str | Path] = ()) -> list[IacScanner]:
+    """Return one scanner per IaC root under `base`, sorted by path.
+
+    `exclude` lists directories to prune in addition to the skip-list — the CLI
+    passes its own output directory so fixed code from a previous run is never
+    rediscovered as a root.
+    """
+    base = Path(base).resolve()
+    excluded = {Path(p).resolve() for p in exclude}
+    roots: list[IacScanner] = []
+
+    for dirpath, dirnames, filenames in walk_unskipped(base):
+        current = Path(dirpath)
+        dirnames.sort()
+        if excluded:
+            dirnames[:] = [d for d in dirnames if (current / d).resolve() not in excluded]
+        if _ENTRY_NAMES.isdisjoint(filenames):
+            continue
+        if TerraformScanner.can_handle(current):
+            roots.append(TerraformScanner(current))
+        elif CdkScanner.can_handle(current):
+            roots.append(CdkScanner(current))
+            dirnames[:] = []
+
+    return sorted(roots, key=lambda s: str(s.base_path))
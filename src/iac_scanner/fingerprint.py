@@ -0,0 +1,67 @@
+"""File fingerprints: (size, mtime_ns, sha256) with stat-only revalidation.
+
+A fingerprint recorded earlier can be revalidated with a single `stat()`: same
+size and mtime means same content, and the body is not read. Like git's index,
+this distrusts "racy" entries — a file whose mtime is within `RACY_WINDOW_NS`
+of the moment the fingerprint was recorded may have been rewritten within the
+same timestamp tick, so its body is re-hashed instead.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+RACY_WINDOW_NS = 2_000_000_000  # 2 s — coarser than any filesystem timestamp granularity we care about
+
+
+def now_ns() -> int:
+    return time.time_ns()
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Any) -> FileFingerprint | None:
+        """Parse a stored fingerprint; None if malformed."""
+        try:
+            return cls(size=int(data["size"]), mtime_ns=int(data["mtime_ns"]), sha256=str(data["sha256"]))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def stat_unchanged(st: os.stat_result, previous: FileFingerprint, recorded_ns: int) -> bool:
+    """True when `st` proves the file still matches `previous` without reading it."""
+    return (
+        st.st_size == previous.size
+        and st.st_mtime_ns == previous.mtime_ns
+        and previous.mtime_ns < recorded_ns - RACY_WINDOW_NS
+    )
+
+
+def fingerprint(path: Path, previous: FileFingerprint | None = None, recorded_ns: int = 0) -> FileFingerprint:
+    """Fingerprint `path`, reusing `previous` when a stat proves it unchanged. Raises OSError."""
+    st = path.stat()
+    if previous is not None and stat_unchanged(st, previous, recorded_ns):
+        return previous
+    sha = sha256_file(path)
+    return FileFingerprint(size=st.st_size, mtime_ns=st.st_mtime_ns, sha256=sha)
@@ -11,6 +11,7 @@ from iac_scanner.llm.providers import (
     ProviderError,
     auto_detect_provider,
     make_llm,
+    resolve_model,
 )
 
 __all__ = [
@@ -19,4 +20,5 @@ __all__ = [
     "ProviderError",
     "auto_detect_provider",
     "make_llm",
+    "resolve_model",
 ]
@@ -108,6 +108,15 @@ def _model_for(provider: Provider, role: Role) -> str:
     return DEFAULT_MODELS[(provider, role)]
 
 
+def resolve_model(provider: Provider | None, role: Role) -> str | None:
+    """The model `make_llm(provider, role)` would use, without building a client; None if no provider works."""
+    try:
+        resolved: Provider = provider if provider is not None else auto_detect_provider()
+    except ProviderError:
+        return None
+    return f"{resolved}:{_model_for(resolved, role)}"
+
+
 def _temperature_for(role: Role) -> float:
     """Temperature=0 for determinism. Fix role still gets 0 — we want reproducible fixes."""
     return 0.0
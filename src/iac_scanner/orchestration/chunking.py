@@ -0,0 +1,228 @@
+"""Chunked analysis: split oversized content into token-budgeted chunks.
+
+Opt-in via `--chunked` / `IAC_CHUNKED=1`. Instead of failing a large module
+with `InputTooLargeError` (or sending one huge prompt), the scan content is cut
+at file and top-level block boundaries into chunks of at most
+`IAC_CHUNK_TOKENS` estimated tokens. Each chunk is analyzed on its own — with
+its own cache key — and the findings are merged back with locations rebased
+onto the original files.
+
+Splitting rules:
+  - A file that fits the budget is one piece; small files are packed together.
+  - A larger file is cut before top-level blocks (`resource`, `module`,
+    `export class`, ...): lines that start at brace depth 0. Comment lines
+    directly above a block travel with it.
+  - A single block larger than the budget is cut on line boundaries.
+
+Each piece is rendered under its file's usual `# --- main.tf ---` header, so
+the LLM reports lines relative to the piece; `rebase_location` adds the
+piece's starting line back.
+
+Granular mode (`--granular` / `IAC_GRANULAR=1`) never packs files together:
+`plan_file_units` makes every file its own unit (cut at block boundaries only
+when it exceeds the budget), so editing one file re-sends only that file.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from iac_scanner.models import Finding
+from iac_scanner.scanners.base import ContentSegment
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_TOKENS = 24_000
+MIN_CHUNK_TOKENS = 1_000
+DEFAULT_CHUNK_WORKERS = 4
+
+# Same rule-of-thumb the cost guard falls back to; good enough for a budget.
+_CHARS_PER_TOKEN = 4
+
+_OPENERS = "{[("
+_CLOSERS = "}])"
+_COMMENT_PREFIXES = ("#", "//", "/*", "*")
+
+# `main.tf:12`, `main.tf:12-20`, `main.tf:L12`, `lib/stack.ts:7:3`
+_LOCATION_LINE_RE = re.compile(r"^(?P<file>[^\s:]+):L?(?P<start>\d+)(?:-L?(?P<end>\d+))?(?P<rest>.*)$", re.DOTALL)
+
+
+def chunking_enabled() -> bool:
+    return bool(os.environ.get("IAC_CHUNKED"))
+
+
+def granular_enabled() -> bool:
+    return bool(os.environ.get("IAC_GRANULAR"))
+
+
+def chunk_token_budget() -> int:
+    """Configurable via IAC_CHUNK_TOKENS. Minimum 1,000 tokens."""
+    raw = os.environ.get("IAC_CHUNK_TOKENS")
+    if raw is None:
+        return DEFAULT_CHUNK_TOKENS
+    try:
+        val = int(raw)
+    except ValueError:
+        logger.warning("Invalid IAC_CHUNK_TOKENS=%r; using default", raw)
+        return DEFAULT_CHUNK_TOKENS
+    return max(MIN_CHUNK_TOKENS, val)
+
+
+def chunk_workers() -> int:
+    """Concurrent chunk analyses. Configurable via IAC_CHUNK_WORKERS."""
+    raw = os.environ.get("IAC_CHUNK_WORKERS")
+    try:
+        return max(1, int(raw)) if raw is not None else DEFAULT_CHUNK_WORKERS
+    except ValueError:
+        logger.warning("Invalid IAC_CHUNK_WORKERS=%r; using default", raw)
+        return DEFAULT_CHUNK_WORKERS
+
+
+def approx_tokens(text: str) -> int:
+    return max(1, len(text) // _CHARS_PER_TOKEN)
+
+
+@dataclass(frozen=True)
+class ContentPiece:
+    """A contiguous run of lines from one file."""
+
+    label: str  # file name as it appears in the segment header ('' for ad-hoc content)
+    header: str
+    text: str
+    start_line: int = 1  # 1-based line of `text` within the original file
+
+    def render(self) -> str:
+        return f"{self.header}\n{self.text}" if self.header else self.text
+
+
+@dataclass
+class Chunk:
+    """One analysis call's worth of pieces."""
+
+    pieces: list[ContentPiece] = field(default_factory=list)
+
+    def render(self) -> str:
+        return "\n".join(p.render() for p in self.pieces)
+
+    def rebase(self, finding: Finding) -> Finding:
+        """Map a finding's piece-relative line numbers back onto the original file."""
+        location = rebase_location(finding.location, self.pieces)
+        if location == finding.location:
+            return finding
+        return finding.model_copy(update={"location": location})
+
+
+def rebase_location(location: str, pieces: list[ContentPiece]) -> str:
+    """Shift `file:N[-M]` by the start line of that file's piece. Other locations pass through."""
+    m = _LOCATION_LINE_RE.match(location.strip())
+    if m is None:
+        return location
+    name = m.group("file")
+    piece = next((p for p in pieces if p.label and (name == p.label or name.endswith("/" + p.label))), None)
+    if piece is None or piece.start_line == 1:
+        return location
+    offset = piece.start_line - 1
+    rebased = f"{name}:{int(m.group('start')) + offset}"
+    if m.group("end"):
+        rebased += f"-{int(m.group('end')) + offset}"
+    return rebased + m.group("rest")
+
+
+def _block_starts(lines: list[str]) -> Iterator[int]:
+    """Yield indexes of lines that begin a top-level block (comments above a block included)."""
+    depth = 0
+    comment_run: int | None = None
+    for i, line in enumerate(lines):
+        stripped = line.lstrip()
+        if depth == 0 and line[:1].strip() and not line.startswith(_CLOSERS):
+            if stripped.startswith(_COMMENT_PREFIXES):
+                if comment_run is None:
+                    comment_run = i
+            else:
+                yield comment_run if comment_run is not None else i
+                comment_run = None
+        elif not stripped:
+            comment_run = None
+        if not stripped.startswith(_COMMENT_PREFIXES):
+            opens = sum(stripped.count(c) for c in _OPENERS)
+            closes = sum(stripped.count(c) for c in _CLOSERS)
+            depth = max(0, depth + opens - closes)
+
+
+def _split_lines(lines: list[str], budget_chars: int) -> Iterator[tuple[int, int]]:
+    """Greedy (start, end) line ranges whose text stays within `budget_chars`."""
+    start = 0
+    size = 0
+    for i, line in enumerate(lines):
+        if i > start and size + len(line) > budget_chars:
+            yield start, i
+            start, size = i, 0
+        size += len(line)
+    if start < len(lines):
+        yield start, len(lines)
+
+
+def split_segment(segment: ContentSegment, budget: int) -> list[ContentPiece]:
+    """Cut one file into pieces of at most `budget` estimated tokens (header included)."""
+    label = segment.label or (segment.path.name if segment.path is not None else "")
+    if approx_tokens(segment.render()) <= budget:
+        return [ContentPiece(label=label, header=segment.header, text=segment.text)]
+
+    budget_chars = max(1, (budget - approx_tokens(segment.header)) * _CHARS_PER_TOKEN)
+    lines = segment.text.splitlines(keepends=True)
+    starts = sorted({0, *_block_starts(lines)})
+    blocks = [(s, e) for s, e in zip(starts, [*starts[1:], len(lines)], strict=True) if s < e]
+
+    ranges: list[tuple[int, int]] = []
+    last_chars = 0  # size of ranges[-1], or past the budget when it must not grow
+    for s, e in blocks:
+        block_chars = sum(len(line) for line in lines[s:e])
+        if block_chars > budget_chars:
+            ranges.extend((s + a, s + b) for a, b in _split_lines(lines[s:e], budget_chars))
+            last_chars = budget_chars + 1
+        elif ranges and last_chars + block_chars <= budget_chars:
+            ranges[-1] = (ranges[-1][0], e)
+            last_chars += block_chars
+        else:
+            ranges.append((s, e))
+            last_chars = block_chars
+
+    return [
+        ContentPiece(
+            label=label,
+            header=segment.header,
+            text="".join(lines[s:e]).rstrip("\n"),
+            start_line=s + 1,
+        )
+        for s, e in ranges
+    ]
+
+
+def plan_chunks(segments: list[ContentSegment], budget: int | None = None) -> list[Chunk]:
+    """Split and pack segments into chunks of at most `budget` estimated tokens, in file order."""
+    budget = budget or chunk_token_budget()
+    chunks: list[Chunk] = []
+    current = Chunk()
+    used = 0
+    for segment in segments:
+        for piece in split_segment(segment, budget):
+            cost = approx_tokens(piece.render())
+            same_file = any(p.label == piece.label for p in current.pieces)
+            if current.pieces and (used + cost > budget or same_file):
+                chunks.append(current)
+                current, used = Chunk(), 0
+            current.pieces.append(piece)
+            used += cost
+    if current.pieces:
+        chunks.append(current)
+    return chunks
+
+
+def plan_file_units(segments: list[ContentSegment], budget: int | None = None) -> list[list[Chunk]]:
+    """Per segment, its analysis units: one single-piece chunk per piece of that file, in order."""
+    budget = budget or chunk_token_budget()
+    return [[Chunk(pieces=[piece]) for piece in split_segment(segment, budget)] for segment in segments]
@@ -52,13 +52,19 @@ def run_hybrid_pipeline(
     skip_fix: bool = False,
     analysis_client: LLMClient | None = None,
     fix_client: LLMClient | None = None,
+    follow_modules: bool | None = None,
+    rule_findings: list[Finding] | None = None,
 ) -> PipelineResult:
     """Run the hybrid pipeline: rule pre-pass + LLM augment + fix.
 
     If the rule engine is unavailable AND engine='auto', falls back gracefully
     to the LLM-only pipeline (returns same PipelineResult shape).
+    `rule_findings` are the pre-pass results when the caller already ran the
+    engine (a batched `scan-tree` run); the engine is then not run again.
     """
-    if engine != "none" and not is_available(engine):
+    if rule_findings is not None:
+        engine = "none"  # already run by the caller
+    elif engine != "none" and not is_available(engine):
         if engine == "auto":
             logger.info("Rule engine unavailable; falling back to LLM-only pipeline.")
             engine = "none"
@@ -66,7 +72,7 @@ def run_hybrid_pipeline(
             # Non-auto but unavailable: let the caller see the error.
             pass
 
-    rule_findings: list[Finding] = []
+    rule_findings = list(rule_findings or [])
     if engine not in ("none", "auto") or (engine == "auto" and is_available("checkov")):
         try:
             rule_findings = run_rule_engine(
@@ -85,6 +91,7 @@ def run_hybrid_pipeline(
         skip_fix=skip_fix,
         analysis_client=analysis_client,
         fix_client=fix_client,
+        follow_modules=follow_modules,
     )
 
     merged = _dedupe_findings(rule_findings, llm_result.findings)
@@ -0,0 +1,328 @@
+"""Per-root fingerprint manifest: serve unchanged roots without re-scanning.
+
+After a successful pipeline run the manifest records, per root, every input
+file's fingerprint (size, mtime_ns, sha256 — see `iac_scanner.fingerprint`),
+the mtime of each directory those files live in, and the run's result. The
+next run with the same settings (`run_signature`) first revalidates that
+record with `stat()` calls only:
+
+- every directory mtime unchanged, so no file was added, removed or renamed
+  next to a recorded one, or, failing that, the scanner's own listing of the
+  inputs still matching the recorded set, and
+- every file's size and mtime unchanged, or, failing that, its content hash.
+
+If it holds, the recorded result is replayed; when every stat matched, no
+file body is read. A fresh CI checkout, which stamps every directory and
+file anew, costs one listing and one hash per input file. If it does not
+hold, the pipeline runs as usual and `metadata["changed_files"]` lists
+exactly which files were added, modified or removed since the recorded run.
+
+Entries live under `<cache dir>/manifest/` and follow the response cache's
+rules: best-effort, 30-day TTL, and off under `IAC_NO_CACHE`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+from iac_scanner import __version__
+from iac_scanner.cache import DEFAULT_TTL_SECONDS, cache_root, is_disabled
+from iac_scanner.cache.files import atomic_write
+from iac_scanner.fingerprint import RACY_WINDOW_NS, FileFingerprint, fingerprint, now_ns
+from iac_scanner.llm import resolve_model
+from iac_scanner.models import Finding
+from iac_scanner.orchestration.runner import PipelineResult
+from iac_scanner.orchestration.tasks import PROMPT_VERSION
+from iac_scanner.rules.checkov import checkov_available, checkov_version
+from iac_scanner.scanners.base import IacScanner, ScanResult
+from iac_scanner.scanners.tf_modules import module_files
+
+if TYPE_CHECKING:
+    from iac_scanner.llm.providers import Provider
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_SCHEMA_VERSION = "1"  # Bump when the entry layout or the replayed result shape changes.
+
+# Settings that change what a run produces, beyond the explicit arguments.
+_SIGNATURE_ENV = (
+    "IAC_PROVIDER",
+    "IAC_ANALYSIS_AI",
+    "IAC_FIX_AI",
+    "IAC_ANALYSIS_MODEL",
+    "IAC_FIX_MODEL",
+    "IAC_CHUNKED",
+    "IAC_GRANULAR",
+    "IAC_CHUNK_TOKENS",
+    "IAC_MAX_INPUT_BYTES",
+    "IAC_NO_MODULES",
+    "IAC_NO_REDACT",
+)
+
+
+def run_signature(*, provider: str | None, skip_fix: bool, rules_engine: str, follow_modules: bool | None) -> str:
+    """Hash of every setting that affects a root's result. Manifests are keyed by it.
+
+    Besides the arguments and `_SIGNATURE_ENV`, it covers what an upgrade can
+    change: the scanner version (file selection), the resolved analysis and fix
+    models (defaults included) and the installed Checkov when it can run.
+    """
+    checkov = rules_engine in ("auto", "checkov") and checkov_available()
+    payload = {
+        "prompt_version": PROMPT_VERSION,
+        "scanner_version": __version__,
+        "provider": provider,
+        "analysis_model": resolve_model(cast("Provider | None", provider), "analysis"),
+        "fix_model": None if skip_fix else resolve_model(cast("Provider | None", provider), "fix"),
+        "checkov": checkov_version() if checkov else None,
+        "skip_fix": skip_fix,
+        "rules_engine": rules_engine,
+        "follow_modules": follow_modules,
+        "env": {name: os.environ.get(name) for name in _SIGNATURE_ENV},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _manifest_path(root: Path, signature: str) -> Path:
+    digest = hashlib.sha256(f"{root}\0{signature}".encode()).hexdigest()[:32]
+    return cache_root() / "manifest" / f"{digest}.json"
+
+
+def _load(path: Path) -> dict[str, Any] | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(data, dict) or data.get("schema") != MANIFEST_SCHEMA_VERSION:
+        return None
+    if time.time() - float(data.get("stored_at", 0)) > DEFAULT_TTL_SECONDS:
+        return None
+    return data
+
+
+def _save(path: Path, entry: dict[str, Any]) -> None:
+    try:
+        atomic_write(path, json.dumps(entry).encode("utf-8"))
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Manifest write failed for %s: %s", path, e)
+
+
+def _rel(path: Path, root: Path) -> str:
+    return Path(os.path.relpath(path, root)).as_posix()
+
+
+def _input_files(result: PipelineResult) -> list[Path]:
+    """Every file the run read: the root's own files plus those of followed local modules."""
+    metadata = result.scan_result.metadata
+    files = [Path(f) for f in metadata.get("files") or []]
+    root = result.scan_result.entry_path.parent
+    for row in metadata.get("modules") or []:
+        files.extend(module_files((root / row["path"]).resolve()))
+    return files
+
+
+def _dump_result(result: PipelineResult) -> dict[str, Any]:
+    """The replayable part of a result. File content (segments) is not kept; reports never need it."""
+    return {
+        "scan_result": result.scan_result.model_dump(mode="json", exclude={"segments"}),
+        "findings": [f.model_dump(mode="json") for f in result.findings],
+        "findings_raw": result.findings_raw,
+        "fixed_code": result.fixed_code,
+        "prompt_version": result.prompt_version,
+        "provider": result.provider,
+        "analysis_model": result.analysis_model,
+        "fix_model": result.fix_model,
+    }
+
+
+def _restore_result(data: dict[str, Any]) -> PipelineResult:
+    return PipelineResult(
+        scan_result=ScanResult.model_validate(data["scan_result"]),
+        findings=[Finding.model_validate(f) for f in data["findings"]],
+        findings_raw=data["findings_raw"],
+        fixed_code=data["fixed_code"],
+        prompt_version=data["prompt_version"],
+        provider=data["provider"],
+        analysis_model=data["analysis_model"],
+        fix_model=data["fix_model"],
+    )
+
+
+def _dir_unchanged(directory: Path, mtime_ns: int, recorded_ns: int) -> bool:
+    """A directory's mtime proves its listing unchanged, unless the mtime is racy."""
+    try:
+        current = directory.stat().st_mtime_ns
+    except OSError:
+        return False
+    return current == mtime_ns and mtime_ns < recorded_ns - RACY_WINDOW_NS
+
+
+def _relisted(entry: dict[str, Any], scanner: IacScanner) -> set[str]:
+    """The inputs a scan would select now, relative to the root: the scanner's listing plus module files.
+
+    Module directories are those of recorded files the root listing does not
+    cover; while every recorded file keeps its content, the root still uses
+    exactly those modules.
+    """
+    root = scanner.base_path
+    listed = {_rel(path, root) for path in scanner.list_files()}
+    for rel in {_posix_dirname(rel) for rel in entry["files"] if rel not in listed}:
+        listed.update(_rel(path, root) for path in module_files((root / rel).resolve()))
+    return listed
+
+
+def _revalidate(entry: dict[str, Any], scanner: IacScanner) -> dict[str, FileFingerprint] | None:
+    """Current fingerprints if the recorded inputs are unchanged; None at the first difference.
+
+    Unchanged directory mtimes prove no input was added or removed. When one
+    moved (an edit next to an input, or a fresh checkout that stamps every
+    directory), the inputs are listed again with the scanner's own filters and
+    compared with the recorded set instead.
+    """
+    root = scanner.base_path
+    recorded_ns = int(entry["recorded_ns"])
+    dirs_unchanged = all(
+        _dir_unchanged((root / rel).resolve(), int(mtime_ns), recorded_ns) for rel, mtime_ns in entry["dirs"].items()
+    )
+    if not dirs_unchanged:
+        try:
+            if _relisted(entry, scanner) != set(entry["files"]):
+                return None
+        except OSError:
+            return None
+    current: dict[str, FileFingerprint] = {}
+    for rel, stored in entry["files"].items():
+        previous = FileFingerprint.from_dict(stored)
+        if previous is None:
+            return None
+        try:
+            fp = fingerprint(root / rel, previous, recorded_ns)
+        except OSError:
+            return None
+        if fp.sha256 != previous.sha256:
+            return None
+        current[rel] = fp
+    return current
+
+
+def _fingerprints(
+    files: list[Path], root: Path, previous: dict[str, Any], recorded_ns: int
+) -> dict[str, FileFingerprint]:
+    """Fingerprint `files`, re-hashing only those whose stat moved since the recorded run."""
+    fps: dict[str, FileFingerprint] = {}
+    for path in files:
+        rel = _rel(path, root)
+        try:
+            fps[rel] = fingerprint(path, FileFingerprint.from_dict(previous.get(rel, {})), recorded_ns)
+        except OSError as e:
+            logger.debug("Manifest skipped unreadable %s: %s", path, e)
+    return fps
+
+
+def _changed_files(previous: dict[str, Any], current: dict[str, FileFingerprint]) -> dict[str, list[str]]:
+    modified = []
+    for rel, fp in current.items():
+        old = FileFingerprint.from_dict(previous.get(rel, {}))
+        if old is not None and old.sha256 != fp.sha256:
+            modified.append(rel)
+    return {
+        "added": sorted(current.keys() - previous.keys()),
+        "modified": sorted(modified),
+        "removed": sorted(previous.keys() - current.keys()),
+    }
+
+
+def _posix_dirname(rel: str) -> str:
+    head, _, _ = rel.rpartition("/")
+    return head or "."
+
+
+def _entry(
+    root: Path,
+    files: dict[str, FileFingerprint],
+    result: dict[str, Any],
+    recorded_ns: int,
+) -> dict[str, Any]:
+    dirs: dict[str, int] = {}
+    for rel in sorted({_posix_dirname(rel) for rel in files} | {"."}):
+        try:
+            dirs[rel] = (root / rel).resolve().stat().st_mtime_ns
+        except OSError:
+            continue
+    return {
+        "schema": MANIFEST_SCHEMA_VERSION,
+        "root": str(root),
+        "stored_at": time.time(),
+        "recorded_ns": recorded_ns,
+        "dirs": dirs,
+        "files": {rel: fp.to_dict() for rel, fp in files.items()},
+        "result": result,
+    }
+
+
+def is_unchanged(scanner: IacScanner, signature: str) -> bool:
+    """True when `run_incremental` would replay `scanner`'s root from its manifest."""
+    if is_disabled():
+        return False
+    entry = _load(_manifest_path(scanner.base_path, signature))
+    if entry is None:
+        return False
+    try:
+        return _revalidate(entry, scanner) is not None
+    except Exception:  # noqa: BLE001 — a malformed entry is just a miss
+        return False
+
+
+def run_incremental(
+    scanner: IacScanner,
+    run: Callable[[], PipelineResult],
+    signature: str,
+) -> PipelineResult:
+    """Serve `scanner`'s root from its manifest when unchanged; otherwise `run()` and record it.
+
+    Replayed results carry `metadata["manifest"] = "unchanged"` and report no
+    cache hits or cost (nothing ran). Fresh runs carry `"changed"` plus
+    `metadata["changed_files"]` when an older record existed, or `"new"`.
+    Only runs that complete without module errors are recorded.
+    """
+    if is_disabled():
+        return run()
+    root = scanner.base_path
+    path = _manifest_path(root, signature)
+    entry = _load(path)
+
+    if entry is not None:
+        try:
+            current = _revalidate(entry, scanner)
+            replay = _restore_result(entry["result"]) if current is not None else None
+        except Exception as e:  # noqa: BLE001 — a malformed entry is just a miss
+            logger.debug("Manifest entry for %s unusable: %s", root, e)
+            current, replay = None, None
+        if current is not None and replay is not None:
+            if any(fp.to_dict() != entry["files"][rel] for rel, fp in current.items()):
+                # Touched but identical files: refresh their stats so the next run skips the hash.
+                _save(path, _entry(root, current, entry["result"], now_ns()))
+            replay.scan_result.metadata["manifest"] = "unchanged"
+            return replay
+
+    started_ns = now_ns()
+    result = run()
+    metadata = result.scan_result.metadata
+    if "files" not in metadata or any("error" in row for row in metadata.get("modules") or []):
+        return result
+
+    previous_files: dict[str, Any] = entry["files"] if entry is not None else {}
+    recorded_ns = int(entry["recorded_ns"]) if entry is not None else 0
+    current = _fingerprints(_input_files(result), root, previous_files, recorded_ns)
+    _save(path, _entry(root, current, _dump_result(result), started_ns))
+    if entry is not None:
+        metadata["changed_files"] = _changed_files(previous_files, current)
+    metadata["manifest"] = "changed" if entry is not None else "new"
+    return result
@@ -5,26 +5,81 @@ a raw LLM string — the analysis task returns a Pydantic-validated FindingsList
 
 The cache layer (content-addressed SHA256) short-circuits repeat LLM calls
 with identical inputs. See `iac_scanner.cache`.
+
+In chunked mode (`IAC_CHUNKED`) content that does not fit one chunk is analyzed
+chunk by chunk, concurrently; see `iac_scanner.orchestration.chunking`. In
+granular mode (`IAC_GRANULAR`) analysis and fix run, and are cached, file by
+file, so a change to one file only re-sends that file.
+
+Terraform roots also analyze every local module they reach (`module` blocks with
+a `./` or `../` source), each unique module content once, and attach the
+module findings to the root. Disable with `IAC_NO_MODULES` / `--no-modules`.
 """
 
 from __future__ import annotations
 
 import json
+import logging
+import os
+import posixpath
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from iac_scanner.cache import CacheKey
+from iac_scanner.cache import compute_model_once as cache_compute_model_once
+from iac_scanner.cache import compute_once as cache_compute_once
 from iac_scanner.cache import get as cache_get
-from iac_scanner.cache import put as cache_put
-from iac_scanner.cost import CostEstimate, enforce_budget, estimate
+from iac_scanner.cache import get_many as cache_get_many
+from iac_scanner.cache import get_many_models as cache_get_many_models
+from iac_scanner.cache import get_model as cache_get_model
+from iac_scanner.cache.canonical import LANGUAGES as CANONICAL_LANGUAGES
+from iac_scanner.cache.canonical import canonical_keys_enabled
+from iac_scanner.cost import CostBudgetExceeded, CostEstimate, enforce_budget, estimate
 from iac_scanner.llm import make_llm
 from iac_scanner.models import Finding, FindingsList
+from iac_scanner.orchestration.chunking import (
+    Chunk,
+    chunk_workers,
+    chunking_enabled,
+    granular_enabled,
+    plan_chunks,
+    plan_file_units,
+)
 from iac_scanner.orchestration.tasks import PROMPT_VERSION, run_analysis, run_fix
+from iac_scanner.scanners._filters import InputTooLargeError
 from iac_scanner.scanners.base import IacScanner, ScanResult
+from iac_scanner.scanners.terraform import TerraformModuleScanner
+from iac_scanner.scanners.tf_modules import LocalModule, resolve_local_modules
 
 if TYPE_CHECKING:
     from iac_scanner.llm.providers import LLMClient, Provider
 
+logger = logging.getLogger(__name__)
+
+# A location that starts with a file name (`main.tf:12`, `lib/stack.ts`) can be
+# re-rooted by prefixing a relative path; anything else is kept as-is.
+_FILE_LOCATION_RE = re.compile(r"^[^\s:]+\.(?:tf|ts|js|tsx|jsx|yaml|yml|json|hcl|py)\b")
+
+
+def modules_enabled() -> bool:
+    """Local module following is on unless IAC_NO_MODULES is set."""
+    return not os.environ.get("IAC_NO_MODULES")
+
+
+def rebase_finding(finding: Finding, rel: str) -> Finding:
+    """Re-root a finding's location under `rel` (a POSIX path relative to the new root)."""
+    if rel in ("", "."):
+        return finding
+    location = finding.location
+    if m := _FILE_LOCATION_RE.match(location):
+        location = posixpath.normpath(f"{rel}/{m.group()}") + location[m.end() :]
+    else:
+        location = f"{rel}: {location}" if location else rel
+    return finding.model_copy(update={"location": location})
+
 
 @dataclass
 class PipelineResult:
@@ -59,13 +114,16 @@ def _serialize_findings(findings: FindingsList) -> str:
     )
 
 
-def _analysis_cache_key(raw_content: str, client: LLMClient) -> CacheKey:
+def _analysis_cache_key(raw_content: str, client: LLMClient, iac_type: str = "") -> CacheKey:
+    """Byte-exact key, or a formatting-insensitive one under IAC_CANONICAL_KEYS (fix keys never are)."""
+    canonical = iac_type if canonical_keys_enabled() and iac_type in CANONICAL_LANGUAGES else ""
     return CacheKey(
         call_kind="analysis",
         raw_content=raw_content,
         provider=client.provider,
         model=client.model,
         prompt_version=PROMPT_VERSION,
+        canonical=canonical,
     )
 
 
@@ -80,6 +138,265 @@ def _fix_cache_key(raw_content: str, findings_json: str, client: LLMClient) -> C
     )
 
 
+def _analyze_chunks(
+    scan_result: ScanResult,
+    chunks: list[Chunk],
+    client: LLMClient,
+    extra_estimates: list[CostEstimate] | None = None,
+) -> tuple[list[FindingsList], int, list[CostEstimate]]:
+    """Analyze each chunk under its own cache key, concurrently; only cache misses reach the LLM.
+
+    Returns each chunk's findings (piece-relative locations), the number of
+    cache hits, and the cost estimates of the calls made. They are
+    budget-checked first, together with `extra_estimates` (calls the caller
+    makes later in the same run).
+    """
+    contents = [chunk.render() for chunk in chunks]
+    keys = [_analysis_cache_key(content, client, scan_result.iac_type) for content in contents]
+    cached = cache_get_many_models(keys, FindingsList)
+    results: list[FindingsList | None] = [cached.get(key) for key in keys]
+    cache_hits = len(chunks) - sum(r is None for r in results)
+
+    todo = [i for i, r in enumerate(results) if r is None]
+    estimates = [
+        estimate(contents[i], provider=client.provider, model=client.model, call_kind="analysis") for i in todo
+    ]
+    enforce_budget([*estimates, *(extra_estimates or [])])
+
+    def analyze(i: int) -> tuple[FindingsList, bool]:
+        return cache_compute_model_once(
+            keys[i],
+            FindingsList,
+            lambda: run_analysis(
+                iac_type=scan_result.iac_type,
+                entry_path=str(scan_result.entry_path),
+                raw_content=contents[i],
+                client=client,
+            ),
+        )
+
+    if todo:
+        with ThreadPoolExecutor(max_workers=min(chunk_workers(), len(todo))) as pool:
+            for i, (findings, computed) in zip(todo, pool.map(analyze, todo), strict=True):
+                cache_hits += not computed
+                results[i] = findings
+    return [r if r is not None else FindingsList(root=[]) for r in results], cache_hits, estimates
+
+
+def _run_chunked_analysis(
+    scan_result: ScanResult,
+    chunks: list[Chunk],
+    client: LLMClient,
+    extra_estimates: list[CostEstimate] | None = None,
+) -> PipelineResult:
+    """Analyze each chunk under its own cache key, concurrently, and merge the findings.
+
+    Only chunks whose content changed miss the cache. Findings keep chunk order
+    and have their line numbers rebased onto the original files.
+    """
+    results, cache_hits, estimates = _analyze_chunks(scan_result, chunks, client, extra_estimates)
+    merged = FindingsList(
+        root=[chunk.rebase(f) for chunk, found in zip(chunks, results, strict=True) for f in found.root]
+    )
+    scan_result.metadata["analysis_chunks"] = len(chunks)
+    return PipelineResult(
+        scan_result=scan_result,
+        findings=list(merged.root),
+        findings_raw=_serialize_findings(merged),
+        provider=client.provider,
+        analysis_model=client.model,
+        cache_hits=cache_hits,
+        cost_estimates=estimates,
+    )
+
+
+def _run_granular(
+    scan_result: ScanResult,
+    *,
+    skip_fix: bool,
+    analysis_client: LLMClient,
+    fix_client: LLMClient | None,
+    extra_estimates: list[CostEstimate] | None = None,
+) -> PipelineResult:
+    """Analyze and fix file by file, each under its own cache key, and assemble the root result.
+
+    Editing one file re-sends only that file: every other file's findings and
+    fixed code come from the cache. Fixed code holds only the files that had
+    findings, each under its scan header. A file too large for one unit is
+    analyzed in pieces and left out of the fix step, as in chunked mode.
+    """
+    segments = scan_result.segments
+    units = plan_file_units(segments)
+    flat = [chunk for file_units in units for chunk in file_units]
+    # Which files get findings is unknown until they are analyzed, so the
+    # budget check up front assumes every fixable file needs a fix call.
+    worst_case_fixes = (
+        [
+            estimate(segments[i].render(), provider=fix_client.provider, model=fix_client.model, call_kind="fix")
+            for i, file_units in enumerate(units)
+            if len(file_units) == 1
+        ]
+        if not skip_fix and fix_client is not None
+        else []
+    )
+    results, cache_hits, estimates = _analyze_chunks(
+        scan_result, flat, analysis_client, [*worst_case_fixes, *(extra_estimates or [])]
+    )
+
+    per_file: list[FindingsList] = []
+    position = 0
+    for file_units in units:
+        found = results[position : position + len(file_units)]
+        position += len(file_units)
+        per_file.append(
+            FindingsList(root=[chunk.rebase(f) for chunk, r in zip(file_units, found, strict=True) for f in r.root])
+        )
+    merged = FindingsList(root=[f for findings in per_file for f in findings.root])
+
+    fixed_parts: list[str] = []
+    if not skip_fix and fix_client is not None:
+        to_fix = [i for i, findings in enumerate(per_file) if findings.root and len(units[i]) == 1]
+        contents = {i: segments[i].render() for i in to_fix}
+        findings_json = {i: _serialize_findings(per_file[i]) for i in to_fix}
+        keys = {i: _fix_cache_key(contents[i], findings_json[i], fix_client) for i in to_fix}
+        cached_fixes = cache_get_many(keys.values())
+        fixed = {i: cached_fixes[keys[i]] for i in to_fix if isinstance(cached_fixes.get(keys[i]), str)}
+        cache_hits += len(fixed)
+        todo = [i for i in to_fix if i not in fixed]
+        estimates += [
+            estimate(contents[i], provider=fix_client.provider, model=fix_client.model, call_kind="fix") for i in todo
+        ]
+
+        def fix(i: int) -> tuple[str, bool]:
+            return cache_compute_once(
+                keys[i],
+                lambda: run_fix(
+                    iac_type=scan_result.iac_type,
+                    raw_content=contents[i],
+                    findings_json=findings_json[i],
+                    client=fix_client,
+                ),
+            )
+
+        if todo:
+            with ThreadPoolExecutor(max_workers=min(chunk_workers(), len(todo))) as pool:
+                for i, (code, computed) in zip(todo, pool.map(fix, todo), strict=True):
+                    cache_hits += not computed
+                    fixed[i] = code
+        fixed_parts = [_with_header(fixed[i], segments[i].header) for i in to_fix]
+
+    scan_result.metadata["analysis_units"] = len(flat)
+    return PipelineResult(
+        scan_result=scan_result,
+        findings=list(merged.root),
+        findings_raw=_serialize_findings(merged),
+        fixed_code="\n".join(fixed_parts),
+        provider=analysis_client.provider,
+        analysis_model=analysis_client.model,
+        fix_model=fix_client.model if fix_client and not skip_fix else None,
+        cache_hits=cache_hits,
+        cost_estimates=estimates,
+    )
+
+
+def _with_header(fixed_code: str, header: str) -> str:
+    """Make sure one file's fixed code starts with its scan header, so the report can place it."""
+    code = fixed_code.strip("\n")
+    if not header or code.startswith(header):
+        return code
+    return f"{header}\n{code}"
+
+
+def attach_module_results(
+    result: PipelineResult,
+    root: Path,
+    modules: list[tuple[LocalModule, PipelineResult | None, str | None]],
+) -> None:
+    """Merge each module's findings into a root's result, with locations relative to the root.
+
+    Every module also gets a row in `scan_result.metadata["modules"]`.
+    """
+    rows: list[dict[str, object]] = []
+    for module, module_result, error in modules:
+        rel = Path(os.path.relpath(module.path, root)).as_posix()
+        row: dict[str, object] = {"path": rel, "sha256": module.sha256}
+        if module_result is not None:
+            result.findings.extend(rebase_finding(f, rel) for f in module_result.findings)
+            result.cache_hits += module_result.cache_hits
+            result.cost_estimates.extend(module_result.cost_estimates)
+            row["findings"] = len(module_result.findings)
+        if error:
+            row["error"] = error
+        rows.append(row)
+    if rows:
+        result.scan_result.metadata["modules"] = rows
+
+
+def _pending_analysis_estimates(scan_result: ScanResult, client: LLMClient) -> list[CostEstimate]:
+    """Estimates of the analysis calls `_run_scanned` would make (cache misses only), fix step excluded."""
+    if not scan_result.segments:
+        return []
+    contents = [scan_result.raw_content]
+    if granular_enabled():
+        contents = [chunk.render() for file_units in plan_file_units(scan_result.segments) for chunk in file_units]
+    elif chunking_enabled() and len(chunks := plan_chunks(scan_result.segments)) > 1:
+        contents = [chunk.render() for chunk in chunks]
+    keys = [_analysis_cache_key(content, client, scan_result.iac_type) for content in contents]
+    cached = cache_get_many_models(keys, FindingsList)
+    return [
+        estimate(content, provider=client.provider, model=client.model, call_kind="analysis")
+        for content, key in zip(contents, keys, strict=True)
+        if key not in cached
+    ]
+
+
+@dataclass
+class _ModulePlan:
+    """The local modules of one root, scanned and estimated before the root's budget check."""
+
+    modules: list[LocalModule]
+    scans: dict[str, ScanResult | str]  # sha256 -> scan, or the error that kept it from being scanned
+    estimates: list[CostEstimate]
+
+
+def _plan_modules(scan_result: ScanResult, scanner: IacScanner, client: LLMClient) -> _ModulePlan:
+    """Scan every local module reachable from a Terraform root, once per content hash."""
+    modules = resolve_local_modules(scanner.base_path, scan_result.blocks)
+    plan = _ModulePlan(modules=modules, scans={}, estimates=[])
+    for module in modules:
+        if module.sha256 in plan.scans:
+            continue
+        try:
+            module_scan = TerraformModuleScanner(module.path).scan()
+        except InputTooLargeError as e:
+            logger.warning("Module %s skipped: %s", module.path, e)
+            plan.scans[module.sha256] = f"{type(e).__name__}: {e}"
+            continue
+        plan.scans[module.sha256] = module_scan
+        plan.estimates += _pending_analysis_estimates(module_scan, client)
+    return plan
+
+
+def _analyze_modules(result: PipelineResult, scanner: IacScanner, plan: _ModulePlan, client: LLMClient) -> None:
+    """Analyze the planned modules (no fix step) and attach their findings to the root's result."""
+    by_sha: dict[str, tuple[PipelineResult | None, str | None]] = {}
+    for sha, module_scan in plan.scans.items():
+        if isinstance(module_scan, str):
+            by_sha[sha] = (None, module_scan)
+            continue
+        try:
+            module_result = _run_scanned(
+                module_scan, provider=None, skip_fix=True, analysis_client=client, fix_client=None
+            )
+        except CostBudgetExceeded as e:
+            # The root's check covered these calls; this only trips if the cache lost entries meanwhile.
+            logger.warning("Module %s skipped: %s", module_scan.entry_path.parent, e)
+            by_sha[sha] = (None, f"{type(e).__name__}: {e}")
+            continue
+        by_sha[sha] = (module_result, None)
+    attach_module_results(result, scanner.base_path, [(m, *by_sha[m.sha256]) for m in plan.modules])
+
+
 def run_pipeline(
     scanner: IacScanner,
     *,
@@ -87,14 +404,61 @@ def run_pipeline(
     skip_fix: bool = False,
     analysis_client: LLMClient | None = None,
     fix_client: LLMClient | None = None,
+    follow_modules: bool | None = None,
 ) -> PipelineResult:
     """Orchestrate: scan -> structured analysis -> fix generation, with caching.
 
     `analysis_client` / `fix_client` are injection points for tests (mocked LLMClient).
     `provider` is honored only when the clients are not injected.
+
+    With chunking enabled and content larger than one chunk, analysis runs per
+    chunk and the fix step is skipped: a single fix call would need the whole
+    input in one prompt again.
+
+    `follow_modules` (default: on for Terraform roots unless `IAC_NO_MODULES`)
+    also analyzes the local modules the root uses; see `attach_module_results`.
+    Module code is reported on, never rewritten by the fix step. Modules are
+    scanned before any LLM call and their uncached analyses count towards the
+    root's budget check, so `IAC_MAX_SPEND_USD` caps the whole run.
     """
     scan_result = scanner.scan()
-    if not scan_result.raw_content:
+    if follow_modules is None:
+        follow_modules = (
+            modules_enabled() and scanner.iac_type == "terraform" and not isinstance(scanner, TerraformModuleScanner)
+        )
+    plan: _ModulePlan | None = None
+    if follow_modules and scan_result.segments:
+        if analysis_client is None:
+            analysis_client = make_llm(provider=provider, role="analysis")
+        plan = _plan_modules(scan_result, scanner, analysis_client)
+    result = _run_scanned(
+        scan_result,
+        provider=provider,
+        skip_fix=skip_fix,
+        analysis_client=analysis_client,
+        fix_client=fix_client,
+        extra_estimates=plan.estimates if plan else None,
+    )
+    if plan is not None and plan.modules and analysis_client is not None:
+        _analyze_modules(result, scanner, plan, analysis_client)
+    return result
+
+
+def _run_scanned(
+    scan_result: ScanResult,
+    *,
+    provider: Provider | None,
+    skip_fix: bool,
+    analysis_client: LLMClient | None,
+    fix_client: LLMClient | None,
+    extra_estimates: list[CostEstimate] | None = None,
+) -> PipelineResult:
+    """Analysis + fix for content that has already been scanned.
+
+    `extra_estimates` (the root's modules) join this content's own estimates in
+    the one budget check made before the first LLM call.
+    """
+    if not scan_result.segments:
         return PipelineResult(scan_result=scan_result)
 
     cache_hits = 0
@@ -102,14 +466,32 @@ def run_pipeline(
     # Build clients up front so their (provider, model) is visible to the cache layer.
     if analysis_client is None:
         analysis_client = make_llm(provider=provider, role="analysis")
+    if granular_enabled():
+        if fix_client is None and not skip_fix:
+            fix_client = make_llm(provider=provider, role="fix")
+        return _run_granular(
+            scan_result,
+            skip_fix=skip_fix,
+            analysis_client=analysis_client,
+            fix_client=fix_client,
+            extra_estimates=extra_estimates,
+        )
+    if chunking_enabled():
+        chunks = plan_chunks(scan_result.segments)
+        if len(chunks) > 1:
+            if not skip_fix:
+                logger.info("Content split into %d chunks; skipping the fix step.", len(chunks))
+            return _run_chunked_analysis(scan_result, chunks, analysis_client, extra_estimates)
     if fix_client is None and not skip_fix:
         fix_client = make_llm(provider=provider, role="fix")
 
     # --- Pre-flight cost estimate + budget check ---
-    # Estimate only the calls we haven't cached. Cache is checked lazily below; we
-    # do a cheap cache-presence probe here so the budget check reflects actual spend.
+    # Estimate only the calls we haven't cached. The analysis lookup made here is
+    # the one used below, so a hit costs one read and one validation.
+    analysis_key = _analysis_cache_key(scan_result.raw_content, analysis_client, scan_result.iac_type)
+    cached_findings = cache_get_model(analysis_key, FindingsList)
     estimates: list[CostEstimate] = []
-    if cache_get(_analysis_cache_key(scan_result.raw_content, analysis_client)) is None:
+    if cached_findings is None:
         estimates.append(
             estimate(
                 scan_result.raw_content,
@@ -129,32 +511,26 @@ def run_pipeline(
                 call_kind="fix",
             )
         )
-    enforce_budget(estimates)
+    enforce_budget([*estimates, *(extra_estimates or [])])
 
     # --- Analysis: cache → LLM ---
-    analysis_key = _analysis_cache_key(scan_result.raw_content, analysis_client)
-    cached_analysis = cache_get(analysis_key)
     findings: FindingsList
-    if cached_analysis is not None:
-        try:
-            findings = FindingsList.model_validate(cached_analysis)
-            cache_hits += 1
-        except Exception:  # noqa: BLE001
-            findings = run_analysis(
+    if cached_findings is not None:
+        findings = cached_findings
+        cache_hits += 1
+    else:
+        # Single-flight: a concurrent worker analyzing the same content is waited for, not repeated.
+        findings, computed = cache_compute_model_once(
+            analysis_key,
+            FindingsList,
+            lambda: run_analysis(
                 iac_type=scan_result.iac_type,
                 entry_path=str(scan_result.entry_path),
                 raw_content=scan_result.raw_content,
                 client=analysis_client,
-            )
-            cache_put(analysis_key, findings.model_dump(exclude_none=True, mode="json"))
-    else:
-        findings = run_analysis(
-            iac_type=scan_result.iac_type,
-            entry_path=str(scan_result.entry_path),
-            raw_content=scan_result.raw_content,
-            client=analysis_client,
+            ),
         )
-        cache_put(analysis_key, findings.model_dump(exclude_none=True, mode="json"))
+        cache_hits += not computed
 
     findings_raw = _serialize_findings(findings)
 
@@ -167,13 +543,16 @@ def run_pipeline(
             fixed_code = cached_fix
             cache_hits += 1
         else:
-            fixed_code = run_fix(
-                iac_type=scan_result.iac_type,
-                raw_content=scan_result.raw_content,
-                findings_json=findings_raw,
-                client=fix_client,
+            fixed_code, computed = cache_compute_once(
+                fix_key,
+                lambda: run_fix(
+                    iac_type=scan_result.iac_type,
+                    raw_content=scan_result.raw_content,
+                    findings_json=findings_raw,
+                    client=fix_client,
+                ),
             )
-            cache_put(fix_key, fixed_code)
+            cache_hits += not computed
 
     return PipelineResult(
         scan_result=scan_result,
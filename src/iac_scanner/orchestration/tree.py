@@ -0,0 +1,411 @@
+"""Tree mode: run the per-root pipeline over every root in a monorepo.
+
+`discover_roots` finds the roots; `run_tree_pipeline` runs each root's
+pipeline (scan-only, LLM, or hybrid) on a process pool so the Python +
+LangChain import cost is paid once per worker instead of once per root.
+
+Failures are isolated per root: a root that trips the size cap, the cost
+guardrail, or a provider error is recorded on its `RootResult` and the rest of
+the tree keeps going.
+
+Local Terraform modules are resolved for every root up front and each unique
+module (by content hash) is analyzed once, on the same pool, no matter how many
+roots use it; its findings are then attached to every one of those roots. A
+discovered root that another root uses as a module is not run as a root.
+
+In hybrid mode (`rules_engine` set) the rule engine runs before the pool starts:
+one batched Checkov run per IaC type and worker slot (`run_rule_engine_batch`)
+instead of one per root, skipping roots the manifest will replay. Each unit
+receives its slice of the findings; a failed batch leaves its units to run the
+engine themselves.
+
+With a `budget_usd` (`iac-scan cache warm --budget`), at most `jobs` units are
+in flight and no new one starts once the finished ones have spent the budget;
+the rest are recorded as skipped. Overshoot is bounded by the units in flight.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from iac_scanner.cache.maintenance import flush_stats
+from iac_scanner.cache.remote import flush_uploads
+from iac_scanner.cost import CostEstimate
+from iac_scanner.models import Finding
+from iac_scanner.orchestration.hybrid import run_hybrid_pipeline
+from iac_scanner.orchestration.manifest import is_unchanged, run_incremental, run_signature
+from iac_scanner.orchestration.runner import (
+    PipelineResult,
+    attach_module_results,
+    modules_enabled,
+    rebase_finding,
+    run_pipeline,
+)
+from iac_scanner.orchestration.tasks import PROMPT_VERSION
+from iac_scanner.rules import is_available, run_rule_engine_batch
+from iac_scanner.scanners.base import IacScanner
+from iac_scanner.scanners.terraform import TerraformModuleScanner, TerraformScanner
+from iac_scanner.scanners.tf_modules import LocalModule, resolve_local_modules
+
+if TYPE_CHECKING:
+    from iac_scanner.llm.providers import Provider
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TreeOptions:
+    """Per-root pipeline settings, shared by every worker."""
+
+    provider: Provider | None = None
+    skip_fix: bool = False
+    scan_only: bool = False
+    rules_engine: str = "none"
+    follow_modules: bool = field(default_factory=modules_enabled)
+
+
+@dataclass
+class RootResult:
+    """Outcome of one root: either a PipelineResult or the error that stopped it."""
+
+    root: Path
+    iac_type: str
+    result: PipelineResult | None = None
+    error: str | None = None
+    skipped: bool = False  # never started: the tree's spend budget ran out first
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.result is not None
+
+
+@dataclass
+class TreeResult:
+    """All root results for one tree scan, in discovery order."""
+
+    base_path: Path
+    roots: list[RootResult] = field(default_factory=list)
+    prompt_version: str = PROMPT_VERSION
+
+    def relative_root(self, root: RootResult) -> str:
+        """Root path relative to the tree base, POSIX-style ('.' for the base itself)."""
+        try:
+            return root.root.relative_to(self.base_path).as_posix()
+        except ValueError:
+            return root.root.as_posix()
+
+    @property
+    def failed(self) -> list[RootResult]:
+        return [r for r in self.roots if not r.ok]
+
+    @property
+    def skipped(self) -> list[RootResult]:
+        return [r for r in self.roots if r.skipped]
+
+    @property
+    def findings(self) -> list[Finding]:
+        """Every root's findings, with locations re-rooted at the tree base."""
+        merged: list[Finding] = []
+        for root in self.roots:
+            if root.result is None:
+                continue
+            rel = self.relative_root(root)
+            merged.extend(rebase_finding(f, rel) for f in root.result.findings)
+        return merged
+
+    @property
+    def findings_list(self) -> list[dict[str, object]]:
+        return [f.model_dump(exclude_none=True, mode="json") for f in self.findings]
+
+    @property
+    def cache_hits(self) -> int:
+        return sum(r.result.cache_hits for r in self.roots if r.result is not None)
+
+    @property
+    def cost_estimates(self) -> list[CostEstimate]:
+        return [e for r in self.roots if r.result is not None for e in r.result.cost_estimates]
+
+    @property
+    def projected_cost_usd(self) -> float:
+        return sum(e.usd_est for e in self.cost_estimates)
+
+    def summaries(self) -> list[dict[str, object]]:
+        """One JSON-friendly summary row per root for the merged report."""
+        rows: list[dict[str, object]] = []
+        for root in self.roots:
+            row: dict[str, object] = {
+                "root": self.relative_root(root),
+                "iac_type": root.iac_type,
+                "status": "ok" if root.ok else "error",
+            }
+            if root.result is not None:
+                severity_counts: dict[str, int] = {}
+                for f in root.result.findings:
+                    severity_counts[f.severity.value] = severity_counts.get(f.severity.value, 0) + 1
+                row.update(
+                    {
+                        "entry_path": str(root.result.scan_result.entry_path),
+                        "files": len(root.result.scan_result.metadata.get("files") or []),
+                        "findings": len(root.result.findings),
+                        "severity_counts": severity_counts,
+                        "cache_hits": root.result.cache_hits,
+                        "projected_cost_usd": round(root.result.projected_cost_usd, 6),
+                    }
+                )
+            if root.error:
+                row["error"] = root.error
+            rows.append(row)
+        return rows
+
+
+def _skip_fix(scanner: IacScanner, options: TreeOptions) -> bool:
+    return options.skip_fix or isinstance(scanner, TerraformModuleScanner)
+
+
+def _signature(scanner: IacScanner, options: TreeOptions) -> str:
+    return run_signature(
+        provider=options.provider,
+        skip_fix=_skip_fix(scanner, options),
+        rules_engine=options.rules_engine,
+        follow_modules=False,
+    )
+
+
+def _run_root(scanner: IacScanner, options: TreeOptions, rule_findings: list[Finding] | None = None) -> RootResult:
+    """Worker body: run one root's pipeline, converting failures into a RootResult.
+
+    Module following is off here: `run_tree_pipeline` analyzes modules as
+    their own units so shared ones run once per tree, not once per root.
+    Units whose files are unchanged since the last run are served from the
+    fingerprint manifest (see `orchestration.manifest`). `rule_findings` come
+    from the batched rule-engine pre-pass, when it covered this unit.
+    """
+    root = RootResult(root=scanner.base_path, iac_type=scanner.iac_type)
+    skip_fix = _skip_fix(scanner, options)
+    try:
+        if options.scan_only:
+            root.result = PipelineResult(scan_result=scanner.scan())
+        else:
+            root.result = run_incremental(
+                scanner,
+                lambda: _run_pipeline(scanner, options, skip_fix, rule_findings),
+                _signature(scanner, options),
+            )
+    except Exception as e:  # noqa: BLE001 — one bad root must not sink the tree
+        logger.warning("Root %s failed: %s", scanner.base_path, e)
+        root.error = f"{type(e).__name__}: {e}"
+    finally:
+        flush_stats()  # pool workers exit without running atexit hooks
+        flush_uploads()
+    return root
+
+
+def _run_pipeline(
+    scanner: IacScanner, options: TreeOptions, skip_fix: bool, rule_findings: list[Finding] | None
+) -> PipelineResult:
+    if options.rules_engine != "none":
+        return run_hybrid_pipeline(
+            scanner,
+            engine=options.rules_engine,
+            provider=options.provider,
+            skip_fix=skip_fix,
+            follow_modules=False,
+            rule_findings=rule_findings,
+        )
+    return run_pipeline(scanner, provider=options.provider, skip_fix=skip_fix, follow_modules=False)
+
+
+def _resolve_modules(scanners: list[IacScanner]) -> list[list[LocalModule]]:
+    """Local modules per scanner (empty for CDK roots and unreadable trees)."""
+    per_root: list[list[LocalModule]] = []
+    for scanner in scanners:
+        modules: list[LocalModule] = []
+        if isinstance(scanner, TerraformScanner):
+            try:
+                modules = resolve_local_modules(scanner.base_path)
+            except OSError as e:
+                logger.warning("Module resolution failed for %s: %s", scanner.base_path, e)
+        per_root.append(modules)
+    return per_root
+
+
+def _drop_module_roots(
+    scanners: list[IacScanner], per_root: list[list[LocalModule]]
+) -> tuple[list[IacScanner], list[list[LocalModule]]]:
+    """Leave out roots that another root uses as a local module.
+
+    `discover_roots` also finds `modules/vpc/main.tf`, but such a directory is
+    analyzed as a module unit and reported under the roots that use it; run as
+    a root too, it would be analyzed twice and sent through the fix step.
+    Only modules of roots that are not modules themselves count, so a tree
+    made only of modules that use each other keeps its roots.
+    """
+    module_dirs = {m.path for modules in per_root for m in modules}
+    consumers = [
+        modules for s, modules in zip(scanners, per_root, strict=True) if s.base_path.resolve() not in module_dirs
+    ]
+    used = {m.path for modules in consumers for m in modules}
+    keep = [i for i, s in enumerate(scanners) if s.base_path.resolve() not in used]
+    if len(keep) < len(scanners):
+        logger.info("Analyzing %d root(s) as local modules of other roots", len(scanners) - len(keep))
+    return [scanners[i] for i in keep], [per_root[i] for i in keep]
+
+
+def _rule_prepass(units: list[IacScanner], options: TreeOptions, jobs: int) -> dict[Path, list[Finding]]:
+    """Checkov findings for every unit that will run, from a few batched invocations.
+
+    Only when the hybrid pipeline would run Checkov itself ('checkov', or 'auto'
+    with Checkov installed). Units are grouped by IaC type (Checkov's
+    `--framework`) and each group is split into up to `jobs` batches run side by
+    side. A failed batch is logged and its units run the engine on their own.
+    """
+    if options.scan_only or options.rules_engine not in ("auto", "checkov") or not is_available("checkov"):
+        return {}
+    groups: dict[str, list[Path]] = {}
+    for scanner in units:
+        if not is_unchanged(scanner, _signature(scanner, options)):
+            groups.setdefault(scanner.iac_type, []).append(scanner.base_path)
+    if sum(len(paths) for paths in groups.values()) <= 1:
+        return {}
+    batches = [
+        (iac_type, paths[i :: min(jobs, len(paths))])
+        for iac_type, paths in groups.items()
+        for i in range(min(jobs, len(paths)))
+    ]
+    logger.info("Running Checkov over %d unit(s) in %d batch(es)", sum(map(len, groups.values())), len(batches))
+    found: dict[Path, list[Finding]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(batches)))) as pool:
+        futures = [pool.submit(run_rule_engine_batch, paths, iac_type, engine="checkov") for iac_type, paths in batches]
+        for (_, paths), future in zip(batches, futures, strict=True):
+            try:
+                found.update(future.result())
+            except Exception as e:  # noqa: BLE001 — the units fall back to their own engine run
+                logger.warning("Batched rule engine failed for %d unit(s): %s", len(paths), e)
+    return found
+
+
+def _failed(scanner: IacScanner, e: Exception) -> RootResult:
+    return RootResult(root=scanner.base_path, iac_type=scanner.iac_type, error=f"{type(e).__name__}: {e}")
+
+
+def _skipped(scanner: IacScanner, budget_usd: float) -> RootResult:
+    return RootResult(
+        root=scanner.base_path,
+        iac_type=scanner.iac_type,
+        error=f"Skipped: spend budget ${budget_usd:.2f} reached",
+        skipped=True,
+    )
+
+
+def _spent(result: RootResult) -> float:
+    return result.result.projected_cost_usd if result.result is not None else 0.0
+
+
+def _run_units(
+    units: list[IacScanner],
+    options: TreeOptions,
+    jobs: int,
+    budget_usd: float | None = None,
+    rules: dict[Path, list[Finding]] | None = None,
+) -> list[RootResult]:
+    """Run roots and module units inline or on a process pool, preserving order.
+
+    `rules` maps unit paths to their pre-computed rule-engine findings.
+    """
+    rules = rules or {}
+    if budget_usd is not None:
+        return _run_units_within_budget(units, options, jobs, budget_usd, rules)
+    if jobs <= 1 or len(units) <= 1:
+        return [_run_root(s, options, rules.get(s.base_path)) for s in units]
+
+    results: list[RootResult] = []
+    with ProcessPoolExecutor(max_workers=min(jobs, len(units))) as pool:
+        futures = [pool.submit(_run_root, s, options, rules.get(s.base_path)) for s in units]
+        for scanner, future in zip(units, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:  # noqa: BLE001 — e.g. BrokenProcessPool
+                results.append(_failed(scanner, e))
+    return results
+
+
+def _run_units_within_budget(
+    units: list[IacScanner], options: TreeOptions, jobs: int, budget_usd: float, rules: dict[Path, list[Finding]]
+) -> list[RootResult]:
+    """`_run_units` that keeps at most `jobs` units in flight and starts none once `budget_usd` is spent."""
+    results: list[RootResult | None] = [None] * len(units)
+    spent = 0.0
+    if jobs <= 1 or len(units) <= 1:
+        for i, scanner in enumerate(units):
+            if spent >= budget_usd:
+                break
+            results[i] = result = _run_root(scanner, options, rules.get(scanner.base_path))
+            spent += _spent(result)
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(units))) as pool:
+            pending = iter(enumerate(units))
+            in_flight: dict[Future[RootResult], int] = {}
+            while True:
+                while spent < budget_usd and len(in_flight) < jobs and (nxt := next(pending, None)) is not None:
+                    in_flight[pool.submit(_run_root, nxt[1], options, rules.get(nxt[1].base_path))] = nxt[0]
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:  # noqa: BLE001 — e.g. BrokenProcessPool
+                        result = _failed(units[i], e)
+                    results[i] = result
+                    spent += _spent(result)
+    if spent >= budget_usd:
+        logger.info("Spend budget $%.2f reached ($%.4f projected); remaining units skipped", budget_usd, spent)
+    return [r if r is not None else _skipped(s, budget_usd) for s, r in zip(units, results, strict=True)]
+
+
+def run_tree_pipeline(
+    base_path: str | Path,
+    scanners: list[IacScanner],
+    *,
+    options: TreeOptions | None = None,
+    jobs: int = 1,
+    budget_usd: float | None = None,
+) -> TreeResult:
+    """Run every root's pipeline and collect the results in input order.
+
+    `jobs <= 1` runs in-process (no pool) — used by tests and tiny trees.
+    `budget_usd` caps the projected LLM spend of the whole tree (see module docstring).
+    Workers inherit the parent's environment, so CLI flags that are threaded
+    through env vars (`IAC_NO_CACHE`, `IAC_MAX_SPEND_USD`, ...) apply per root.
+    """
+    options = options or TreeOptions()
+    tree = TreeResult(base_path=Path(base_path).resolve())
+
+    follow = options.follow_modules and not options.scan_only
+    per_root = _resolve_modules(scanners) if follow else [[] for _ in scanners]
+    scanners, per_root = _drop_module_roots(scanners, per_root)
+    unique: dict[str, LocalModule] = {}
+    for modules in per_root:
+        for module in modules:
+            unique.setdefault(module.sha256, module)
+    if unique:
+        logger.info("Analyzing %d unique local module(s) shared by %d root(s)", len(unique), len(scanners))
+
+    units: list[IacScanner] = [*scanners, *(TerraformModuleScanner(m.path) for m in unique.values())]
+    results = _run_units(units, options, jobs, budget_usd, _rule_prepass(units, options, jobs))
+    tree.roots = results[: len(scanners)]
+    by_sha = {sha: r for sha, r in zip(unique, results[len(scanners) :], strict=True)}
+
+    for root, modules in zip(tree.roots, per_root, strict=True):
+        if root.result is not None and modules:
+            attach_module_results(
+                root.result,
+                root.root,
+                [(m, by_sha[m.sha256].result, by_sha[m.sha256].error) for m in modules],
+            )
+    return tree
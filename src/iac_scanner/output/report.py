@@ -9,6 +9,7 @@ from pathlib import Path
 
 from iac_scanner import __version__
 from iac_scanner.orchestration.runner import PipelineResult
+from iac_scanner.orchestration.tree import TreeResult
 from iac_scanner.output.sarif import write_sarif
 
 
@@ -40,6 +41,7 @@ def _split_by_scan_headers(
         try:
             rel = path.relative_to(base_path)
             name_to_rel[path.name] = rel
+            name_to_rel[rel.as_posix()] = rel  # headers name nested files by relative path
         except ValueError:
             name_to_rel[path.name] = Path(path.name)
 
@@ -132,6 +134,7 @@ def write_report_and_fixes(
             tool_version=__version__,
             entry_path=str(result.scan_result.entry_path),
             iac_type=result.scan_result.iac_type,
+            blocks=result.scan_result.blocks,
         )
         written.append(sarif_path)
 
@@ -162,3 +165,71 @@ def write_report_and_fixes(
             written.append(out_path)
 
     return written
+
+
+def write_tree_report(
+    tree: TreeResult,
+    output_dir: str | Path,
+    *,
+    report_name: str = "scan-tree-report.json",
+    write_fixed: bool = True,
+    output_format: str | None = None,
+) -> list[Path]:
+    """Write the merged tree report plus each root's own report under `roots/<rel>/`.
+
+    The merged JSON carries one summary row per root and every finding with its
+    location re-rooted at the tree base. SARIF (when requested) is emitted for
+    the merged findings so a single upload covers the whole tree.
+
+    Returns list of written paths (merged report first).
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written: list[Path] = []
+
+    fmt = (output_format or os.environ.get("IAC_OUTPUT_FORMAT") or "json").lower()
+    iac_types = sorted({r.iac_type for r in tree.roots})
+
+    if fmt in ("json", "both"):
+        providers = sorted({r.result.provider for r in tree.roots if r.result is not None and r.result.provider})
+        report_path = output_dir / report_name
+        report = {
+            "base_path": str(tree.base_path),
+            "iac_types": iac_types,
+            "roots": tree.summaries(),
+            "findings": tree.findings_list,
+            "iac_scanner_version": __version__,
+            "prompt_version": tree.prompt_version,
+            "providers": providers,
+        }
+        report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        written.append(report_path)
+
+    if fmt in ("sarif", "both"):
+        sarif_name = (
+            Path(report_name).with_suffix(".sarif").name if report_name.endswith(".json") else f"{report_name}.sarif"
+        )
+        sarif_path = output_dir / sarif_name
+        write_sarif(
+            tree.findings,
+            sarif_path,
+            tool_version=__version__,
+            entry_path=str(tree.base_path),
+            iac_type=",".join(iac_types),
+        )
+        written.append(sarif_path)
+
+    for root in tree.roots:
+        if root.result is None:
+            continue
+        rel = tree.relative_root(root)
+        written.extend(
+            write_report_and_fixes(
+                root.result,
+                output_dir / "roots" / rel,
+                write_fixed=write_fixed and bool(root.result.fixed_code),
+                output_format="json",
+            )
+        )
+
+    return written
@@ -12,11 +12,15 @@ from __future__ import annotations
 
 import json
 import re
+from collections.abc import Sequence
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from iac_scanner.models import Finding, Severity
 
+if TYPE_CHECKING:
+    from iac_scanner.scanners.hcl_index import HclBlock
+
 SARIF_SCHEMA = "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json"
 SARIF_VERSION = "2.1.0"
 TOOL_NAME = "iac-scanner"
@@ -58,6 +62,20 @@ _LOCATION_RE = re.compile(
 )
 
 
+# Terraform addresses inside free-form locations: `aws_s3_bucket.logs`, `module.vpc`, ...
+_ADDRESS_RE = re.compile(r"(?:data\.|module\.|var\.|output\.)?[A-Za-z_][\w-]*\.[A-Za-z_][\w-]*")
+
+
+def _block_for(raw: str, by_address: dict[str, HclBlock]) -> HclBlock | None:
+    """First indexed block whose address appears in a location string."""
+    if not by_address:
+        return None
+    for m in _ADDRESS_RE.finditer(raw):
+        if block := by_address.get(m.group()):
+            return block
+    return None
+
+
 def _parse_location(raw: str) -> tuple[str | None, int | None, int | None, int | None]:
     """Best-effort: return (file, start_line, end_line, start_col). Any may be None."""
     if not raw:
@@ -86,8 +104,15 @@ def build_sarif(
     tool_version: str,
     entry_path: str,
     iac_type: str,
+    blocks: Sequence[HclBlock] = (),
 ) -> dict[str, Any]:
-    """Build a SARIF 2.1.0 log from findings. Returns a JSON-serializable dict."""
+    """Build a SARIF 2.1.0 log from findings. Returns a JSON-serializable dict.
+
+    `blocks` (the scan's Terraform block index) resolves locations that name a
+    resource address instead of a file, e.g. `aws_s3_bucket.logs`, to the
+    block's file and line range.
+    """
+    by_address = {b.address: b for b in blocks}
     # Deduplicate rules: one SARIF rule per unique rule_id/title pair.
     rules: list[dict[str, Any]] = []
     rule_index: dict[str, int] = {}
@@ -118,6 +143,8 @@ def build_sarif(
             rules.append(rule_entry)
 
         file_, line, endline, col = _parse_location(f.location)
+        if file_ is None and (block := _block_for(f.location, by_address)) is not None:
+            file_, line, endline = block.file, block.start_line, block.end_line
         # Fall back to entry file if parsing failed so the finding still has a location.
         uri = file_ or Path(entry_path).name
         region: dict[str, Any] = {}
@@ -186,6 +213,7 @@ def write_sarif(
     tool_version: str,
     entry_path: str,
     iac_type: str,
+    blocks: Sequence[HclBlock] = (),
 ) -> Path:
     """Serialize SARIF JSON to `output_path`. Returns the path written."""
     sarif = build_sarif(
@@ -193,6 +221,7 @@ def write_sarif(
         tool_version=tool_version,
         entry_path=entry_path,
         iac_type=iac_type,
+        blocks=blocks,
     )
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(json.dumps(sarif, indent=2), encoding="utf-8")
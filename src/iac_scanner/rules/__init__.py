@@ -4,21 +4,27 @@ The rule engine is an *optional* layer that grounds the LLM with deterministic,
 framework-mapped findings. Install via `pip install iac-scanner[rules]`.
 
 `run_rule_engine(path, iac_type, engine='auto')` is the public entry point.
+`run_rule_engine_batch(paths, iac_type, engine)` runs Checkov once over many roots.
 `is_available(engine)` reports whether a given engine can run in this environment.
+Discovery and availability are remembered per process; `invalidate_engines()` forgets them.
 """
 
 from iac_scanner.rules.engine import (
     RuleEngineError,
     RuleEngineNotInstalled,
     available_engines,
+    invalidate_engines,
     is_available,
     run_rule_engine,
+    run_rule_engine_batch,
 )
 
 __all__ = [
     "RuleEngineError",
     "RuleEngineNotInstalled",
     "available_engines",
+    "invalidate_engines",
     "is_available",
     "run_rule_engine",
+    "run_rule_engine_batch",
 ]
@@ -11,19 +11,45 @@ Why subprocess instead of the Checkov Python API?
 
 Checkov command layout:
   checkov -d <path> -o json --quiet --soft-fail --framework <tf|cloudformation>
+
+With `IAC_CHECKOV_WORKER` set and the checkov package importable here, scans go
+to one long-lived worker process per scanner process instead
+(`rules/checkov_worker.py`). It pays the import and policy loading once, which
+helps tree scans and the MCP server. It takes the same arguments and returns the
+same JSON. Any worker failure other than a timeout falls back to the subprocess.
+The worker is replaced every `WORKER_MAX_SCANS` scans, which bounds the global
+state Checkov accumulates between runs.
+
+Results are cached in the response cache (off under `IAC_NO_CACHE`). The key
+covers the sha256 of every file Checkov may read under the root, plus the
+content hashes of local Terraform modules outside it, the installed Checkov's
+identity and the `--framework` flag. An unchanged root is then served without
+starting Checkov. The identity is the package version plus the `checkov`
+executable's path, size and mtime, so finding it never runs a subprocess.
 """
 
 from __future__ import annotations
 
+import atexit
+import importlib.metadata
+import importlib.util
 import json
 import logging
 import os
+import queue
 import shutil
 import subprocess
+import sys
+import threading
+from collections.abc import Sequence
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
-from iac_scanner.models import Finding, FindingSource, Severity
+from iac_scanner.cache import CacheKey, compute_model_once, get_many_models, is_disabled, put_model
+from iac_scanner.fingerprint import sha256_file
+from iac_scanner.models import Finding, FindingsList, FindingSource, Severity
+from iac_scanner.rules.registry import cached
+from iac_scanner.scanners.tf_modules import resolve_local_modules
 
 logger = logging.getLogger(__name__)
 
@@ -45,15 +71,27 @@ class CheckovNotInstalled(CheckovError):
     """The `checkov` command is not on PATH."""
 
 
+class CheckovTimeout(CheckovError):
+    """A Checkov scan ran past its timeout."""
+
+
+WORKER_MAX_SCANS = 200
+RESULT_CACHE_VERSION = "1"  # Bump when the Checkov arguments or `_adapt_check` change.
+
+# Files Checkov may read for our frameworks (variables, configs and templates included),
+# and directories it never scans by default.
+_INPUT_SUFFIXES = (".tf", ".tf.json", ".tfvars", ".hcl", ".json", ".yaml", ".yml", ".template")
+_UNSCANNED_DIRS = frozenset({".git", ".terraform", "node_modules"})
+
+
 def checkov_available() -> bool:
-    """True if `checkov` is importable via the package OR on PATH."""
-    if shutil.which("checkov"):
-        return True
-    try:
-        import checkov  # noqa: F401 — presence check only
-    except ImportError:
-        return False
-    return True
+    """True if `checkov` is on PATH OR importable. Remembered per PATH (`rules/registry.py`)."""
+    return cached(("checkov", os.environ.get("PATH", "")), _probe_checkov)
+
+
+def _probe_checkov() -> bool:
+    # find_spec locates the package without paying for Checkov's import graph.
+    return bool(shutil.which("checkov")) or importlib.util.find_spec("checkov") is not None
 
 
 def _checkov_framework_for(iac_type: str) -> str:
@@ -123,24 +161,118 @@ def _cwe_hint(result: dict[str, Any]) -> str | None:
     return None
 
 
+def _require_checkov() -> None:
+    if not checkov_available():
+        raise CheckovNotInstalled(
+            "Checkov not found. Install with `pip install iac-scanner[rules]` or `pip install checkov`."
+        )
+
+
 def run_checkov(path: Path, iac_type: str, *, timeout_seconds: int = 300) -> list[Finding]:
     """Run Checkov against `path` and return adapted findings.
 
     Returns an empty list on "no findings" or when only the checkov package is
     installed but not on PATH. Raises CheckovNotInstalled if no mechanism works.
+    Served from the result cache when no input changed.
     """
-    if not checkov_available():
-        raise CheckovNotInstalled(
-            "Checkov not found. Install with `pip install iac-scanner[rules]` or `pip install checkov`."
-        )
+    _require_checkov()
+    key = _result_key(path, iac_type)
+    if key is None:
+        return _scan(path, iac_type, timeout_seconds)
+    found, _ = compute_model_once(key, FindingsList, lambda: FindingsList(_scan(path, iac_type, timeout_seconds)))
+    return _copies(found)
+
+
+def run_checkov_batch(paths: Sequence[Path], iac_type: str, *, timeout_seconds: int = 300) -> dict[Path, list[Finding]]:
+    """Run one Checkov process over every path in `paths` and split the findings per path.
+
+    Checkov takes repeated `-d` flags, so its start-up and policy loading are
+    paid once per batch. `timeout_seconds` applies per path. Each failed check
+    belongs to the path whose directory joined with its `file_path` gives its
+    `file_abs_path`, which holds even for nested paths. If a check cannot be
+    placed, for example because an older Checkov leaves out `file_abs_path`,
+    every path is scanned on its own instead. Paths with a cached result are
+    left out of the batch.
+    """
+    _require_checkov()
+    keys = {path: _result_key(path, iac_type) for path in paths}
+    hits = get_many_models([key for key in keys.values() if key is not None], FindingsList)
+    found = {path: _copies(hits[key]) for path, key in keys.items() if key is not None and key in hits}
+    scanned = _scan_batch([path for path in paths if path not in found], iac_type, timeout_seconds)
+    for path, findings in scanned.items():
+        if (key := keys[path]) is not None:
+            put_model(key, FindingsList(findings))
+    found.update(scanned)
+    return {path: found[path] for path in paths}
+
+
+def _copies(found: FindingsList) -> list[Finding]:
+    # Cached instances may be shared through the in-process cache tier; callers get their own.
+    return [finding.model_copy() for finding in found.root]
+
+
+def checkov_version() -> str:
+    """Identity of the Checkov a scan would run, for cache keys; no subprocess. Remembered per PATH."""
+    return cached(("checkov-version", os.environ.get("PATH", "")), _probe_version)
+
+
+def _probe_version() -> str:
+    try:
+        parts = [importlib.metadata.version("checkov")]
+    except importlib.metadata.PackageNotFoundError:
+        parts = ["-"]
+    if exe := shutil.which("checkov"):
+        try:
+            st = os.stat(exe)
+            parts.append(f"{os.path.realpath(exe)}@{st.st_size}:{st.st_mtime_ns}")
+        except OSError:
+            parts.append(exe)
+    return " ".join(parts)
+
+
+def _input_manifest(root: Path, iac_type: str) -> str:
+    """`<relative path>\0<sha256>` per file Checkov may read for `root`. Raises OSError."""
+    root = Path(root).resolve()
+    if root.is_file():
+        return f"{root.name}\0{sha256_file(root)}"
+    if not root.is_dir():
+        raise FileNotFoundError(f"No such directory: {root}")
+    lines: list[str] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in _UNSCANNED_DIRS)
+        for name in sorted(filenames):
+            if name.endswith(_INPUT_SUFFIXES):
+                file = Path(dirpath, name)
+                lines.append(f"{file.relative_to(root).as_posix()}\0{sha256_file(file)}")
+    if iac_type == "terraform":
+        # Checkov evaluates local module sources, including those outside the root.
+        for module in resolve_local_modules(root):
+            if not module.path.is_relative_to(root):
+                lines.append(f"{Path(os.path.relpath(module.path, root)).as_posix()}/\0{module.sha256}")
+    return "\n".join(lines)
+
+
+def _result_key(path: Path, iac_type: str) -> CacheKey | None:
+    """Cache key for Checkov's findings on `path`; None when caching is off or the inputs can't be read."""
+    if is_disabled():
+        return None
+    try:
+        manifest = _input_manifest(path, iac_type)
+    except OSError as e:
+        logger.debug("Not caching Checkov results for %s: %s", path, e)
+        return None
+    return CacheKey(
+        call_kind="rules",
+        raw_content=manifest,
+        provider="checkov",
+        model=checkov_version(),
+        prompt_version=RESULT_CACHE_VERSION,
+        extra=_checkov_framework_for(iac_type),
+    )
 
-    # Prefer the CLI binary; fall back to `python -m checkov.main` if only the pkg is present.
-    if shutil.which("checkov"):
-        cmd = ["checkov"]
-    else:
-        cmd = [os.environ.get("PYTHON", "python"), "-m", "checkov.main"]
 
-    cmd += [
+def _scan(path: Path, iac_type: str, timeout_seconds: int) -> list[Finding]:
+    args = [
         "-d",
         str(path),
         "-o",
@@ -150,6 +282,62 @@ def run_checkov(path: Path, iac_type: str, *, timeout_seconds: int = 300) -> lis
         "--framework",
         _checkov_framework_for(iac_type),
     ]
+    return _extract_all(_json_payloads(_invoke(args, timeout_seconds)))
+
+
+def _scan_batch(paths: Sequence[Path], iac_type: str, timeout_seconds: int) -> dict[Path, list[Finding]]:
+    if len(paths) <= 1:
+        return {path: _scan(path, iac_type, timeout_seconds) for path in paths}
+
+    args: list[str] = []
+    for path in paths:
+        args += ["-d", str(path)]
+    args += ["-o", "json", "--quiet", "--soft-fail", "--framework", _checkov_framework_for(iac_type)]
+    stdout = _invoke(args, timeout_seconds * len(paths))
+
+    roots = {path: Path(path).resolve() for path in paths}
+    split: dict[Path, list[dict[str, Any]]] = {path: [] for path in paths}
+    for payload in _json_payloads(stdout):
+        for record in _failed_check_records(payload):
+            owner = _owner(record, roots)
+            if owner is None:
+                logger.debug("Cannot place Checkov result %r; scanning each path on its own", record.get("check_id"))
+                return {path: _scan(path, iac_type, timeout_seconds) for path in paths}
+            split[owner].append(record)
+    return {path: _adapt_records(records) for path, records in split.items()}
+
+
+def _owner(record: dict[str, Any], roots: dict[Path, Path]) -> Path | None:
+    """The path whose scan produced `record`: `<root>/<file_path>` is its `file_abs_path`."""
+    abs_path, rel_path = record.get("file_abs_path"), record.get("file_path")
+    if not isinstance(abs_path, str) or not isinstance(rel_path, str):
+        return None
+    target = Path(abs_path).resolve()
+    for path, root in roots.items():
+        if (root / rel_path.lstrip("/")).resolve() == target:
+            return path
+    return None
+
+
+def _invoke(args: list[str], timeout_seconds: int) -> str:
+    """What `checkov <args>` prints: from the warm worker when enabled, else a subprocess."""
+    if worker_enabled():
+        try:
+            return shared_worker().scan(args, timeout_seconds)
+        except CheckovTimeout:
+            raise
+        except CheckovError as e:
+            logger.warning("Checkov worker failed (%s); running the checkov command instead", e)
+    return _run_checkov_command(args, timeout_seconds)
+
+
+def _run_checkov_command(args: list[str], timeout_seconds: int) -> str:
+    # Prefer the CLI binary; fall back to `python -m checkov.main` if only the pkg is present.
+    if shutil.which("checkov"):
+        cmd = ["checkov"]
+    else:
+        cmd = [os.environ.get("PYTHON", "python"), "-m", "checkov.main"]
+    cmd += args
 
     logger.debug("Running: %s", " ".join(cmd))
     try:
@@ -161,44 +349,181 @@ def run_checkov(path: Path, iac_type: str, *, timeout_seconds: int = 300) -> lis
             check=False,
         )
     except subprocess.TimeoutExpired as e:
-        raise CheckovError(f"Checkov timed out after {timeout_seconds}s") from e
+        raise CheckovTimeout(f"Checkov timed out after {timeout_seconds}s") from e
     except FileNotFoundError as e:
         raise CheckovNotInstalled(str(e)) from e
+    return proc.stdout
 
-    if not proc.stdout.strip():
+
+def _json_payloads(stdout: str) -> list[dict[str, Any]]:
+    """The per-framework payloads in one Checkov JSON report."""
+    if not stdout.strip():
         # Checkov exits 0 with empty output when no files match the framework.
         return []
 
     try:
-        data = json.loads(proc.stdout)
+        data = json.loads(stdout)
     except json.JSONDecodeError as e:
-        preview = proc.stdout[:500]
+        preview = stdout[:500]
         raise CheckovError(f"Could not parse Checkov JSON output: {e}\n---\n{preview}") from e
 
     # Checkov output shape: either a dict (single framework) or a list of dicts (multi).
     if isinstance(data, dict):
-        return _extract_failed_checks(data)
+        return [data]
     if isinstance(data, list):
-        findings: list[Finding] = []
-        for entry in data:
-            if isinstance(entry, dict):
-                findings.extend(_extract_failed_checks(entry))
-        return findings
+        return [entry for entry in data if isinstance(entry, dict)]
     return []
 
 
-def _extract_failed_checks(payload: dict[str, Any]) -> list[Finding]:
-    """Pull 'results.failed_checks' out of a single-framework Checkov payload."""
+def _extract_all(payloads: list[dict[str, Any]]) -> list[Finding]:
+    findings: list[Finding] = []
+    for payload in payloads:
+        findings.extend(_extract_failed_checks(payload))
+    return findings
+
+
+def _failed_check_records(payload: dict[str, Any]) -> list[dict[str, Any]]:
     results = payload.get("results") or {}
     failed = results.get("failed_checks") or []
     if not isinstance(failed, list):
         return []
+    return [item for item in failed if isinstance(item, dict)]
+
+
+def _extract_failed_checks(payload: dict[str, Any]) -> list[Finding]:
+    """Pull 'results.failed_checks' out of a single-framework Checkov payload."""
+    return _adapt_records(_failed_check_records(payload))
+
+
+def _adapt_records(records: list[dict[str, Any]]) -> list[Finding]:
     findings: list[Finding] = []
-    for item in failed:
-        if not isinstance(item, dict):
-            continue
+    for item in records:
         try:
             findings.append(_adapt_check(item))
         except Exception as e:  # noqa: BLE001
             logger.debug("Failed to adapt Checkov result %r: %s", item.get("check_id"), e)
     return findings
+
+
+def worker_enabled() -> bool:
+    """IAC_CHECKOV_WORKER is set and the checkov package is importable by this interpreter."""
+    return bool(os.environ.get("IAC_CHECKOV_WORKER")) and importlib.util.find_spec("checkov") is not None
+
+
+class CheckovWorker:
+    """Client for one `checkov_worker` process, started on first use. Scans are serialized."""
+
+    def __init__(self, python: str = sys.executable) -> None:
+        self.python = python
+        self.scans = 0
+        self._proc: subprocess.Popen[str] | None = None
+        self._lines: queue.Queue[str | None] = queue.Queue()
+        self._lock = threading.Lock()
+
+    @property
+    def pid(self) -> int | None:
+        return self._proc.pid if self._proc is not None else None
+
+    def _start(self, timeout_seconds: float) -> None:
+        self._proc = subprocess.Popen(  # noqa: S603 — our own module, run by this interpreter
+            [self.python, "-m", "iac_scanner.rules.checkov_worker"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        self.scans = 0
+        self._lines = queue.Queue()
+        if self._proc.stdout is None:
+            self.close()
+            raise CheckovError("Checkov worker started without an output pipe")
+        threading.Thread(target=_pump, args=(self._proc.stdout, self._lines), daemon=True).start()
+        self._reply(timeout_seconds, "ready")
+
+    def _reply(self, timeout_seconds: float, key: str) -> Any:
+        """The value under `key` in the next reply line; stops the worker on timeout, exit or error."""
+        try:
+            line = self._lines.get(timeout=timeout_seconds)
+        except queue.Empty:
+            self.close()
+            raise CheckovTimeout(f"Checkov timed out after {timeout_seconds:g}s") from None
+        if line is None:
+            self.close()
+            raise CheckovError("Checkov worker exited")
+        try:
+            reply = json.loads(line)
+        except json.JSONDecodeError as e:
+            self.close()
+            raise CheckovError(f"Unreadable Checkov worker reply: {e}") from e
+        if key not in reply:
+            if key == "ready":  # startup failed and the worker exited; a failed scan leaves it usable
+                self.close()
+            raise CheckovError(str(reply.get("error") or f"Checkov worker reply without {key!r}"))
+        return reply[key]
+
+    def scan(self, args: list[str], timeout_seconds: float) -> str:
+        """What `checkov <args>` would print, from the warm worker."""
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None or self.scans >= WORKER_MAX_SCANS:
+                self.close()
+                self._start(timeout_seconds)
+            if self._proc is None or self._proc.stdin is None:
+                raise CheckovError("Checkov worker has no input pipe")
+            try:
+                self._proc.stdin.write(json.dumps({"argv": args}) + "\n")
+                self._proc.stdin.flush()
+            except OSError as e:
+                self.close()
+                raise CheckovError(f"Checkov worker unreachable: {e}") from e
+            self.scans += 1
+            return str(self._reply(timeout_seconds, "stdout"))
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        if proc.stdin is not None:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def _pump(stream: IO[str], lines: queue.Queue[str | None]) -> None:
+    for line in stream:
+        lines.put(line)
+    lines.put(None)
+
+
+_worker: CheckovWorker | None = None
+_worker_lock = threading.Lock()
+
+
+def shared_worker() -> CheckovWorker:
+    """The process-wide worker, stopped at exit."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = CheckovWorker()
+        return _worker
+
+
+def _stop_worker() -> None:
+    if _worker is not None:
+        _worker.close()
+
+
+def _forget_worker() -> None:
+    # A forked child must not write into its parent's worker pipes.
+    global _worker, _worker_lock
+    _worker, _worker_lock = None, threading.Lock()
+
+
+atexit.register(_stop_worker)
+os.register_at_fork(after_in_child=_forget_worker)
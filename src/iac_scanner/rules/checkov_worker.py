@@ -0,0 +1,73 @@
+"""Long-lived Checkov worker: `python -m iac_scanner.rules.checkov_worker`.
+
+Started by `rules/checkov.py` when `IAC_CHECKOV_WORKER` is set. It imports
+Checkov and loads its policies once, then serves scans over its stdin/stdout
+pipes, so every scan after the first pays only for the checks themselves.
+
+Protocol: one JSON object per line.
+
+- On startup the worker writes `{"ready": true}`, or `{"error": "..."}` and exits
+  when Checkov cannot be imported.
+- Request: `{"argv": [...]}`, the arguments a `checkov` command line would take.
+- Reply: `{"stdout": "..."}`, exactly what that command would have printed (the
+  JSON report `run_checkov` parses), or `{"error": "..."}`.
+
+Checkov's own prints go to a buffer and stray writes to file descriptor 1 go to
+stderr, so nothing but replies reaches the pipe.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import sys
+from collections.abc import Callable
+from typing import Any
+
+
+def _entry_point() -> Callable[[list[str]], Any]:
+    """Checkov's in-process CLI entry: the `Checkov` class (3.x) or `run()` (2.x)."""
+    from checkov import main as checkov_main
+
+    if hasattr(checkov_main, "Checkov"):
+        return lambda argv: checkov_main.Checkov(argv=argv).run()
+    return lambda argv: checkov_main.run(argv=argv)
+
+
+def _scan(run: Callable[[list[str]], Any], argv: list[str]) -> str:
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        try:
+            run(argv)
+        except SystemExit:
+            pass  # the CLI entry exits with the check status, as `checkov` would
+    return buf.getvalue()
+
+
+def main() -> int:
+    replies = os.fdopen(os.dup(1), "w", encoding="utf-8", buffering=1)
+    os.dup2(2, 1)
+
+    def reply(payload: dict[str, Any]) -> None:
+        replies.write(json.dumps(payload) + "\n")
+        replies.flush()
+
+    try:
+        run = _entry_point()
+    except Exception as e:  # noqa: BLE001 — reported to the parent, which falls back to the CLI
+        reply({"error": f"Cannot load Checkov: {type(e).__name__}: {e}"})
+        return 1
+    reply({"ready": True})
+    for line in sys.stdin:
+        try:
+            argv = json.loads(line)["argv"]
+            reply({"stdout": _scan(run, [str(a) for a in argv])})
+        except Exception as e:  # noqa: BLE001 — one bad scan must not take the worker down
+            reply({"error": f"{type(e).__name__}: {e}"})
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
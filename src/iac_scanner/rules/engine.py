@@ -12,20 +12,42 @@ Plugin contract:
     If the underlying tool isn't installed the plugin should raise a
     `*NotInstalled` exception (anything inheriting from RuntimeError); the
     dispatcher handles the `engine="auto"` fall-through.
+
+In `engine="auto"` the engines run concurrently, at most
+`IAC_RULE_ENGINE_WORKERS` at a time. Findings are still returned in engine
+order (Checkov, then plugins in discovery order). Checkov gets
+`IAC_RULE_ENGINE_TIMEOUT` as its own timeout. Plugins have no timeout
+argument, so the dispatcher stops waiting for one after that long and skips
+it. Engines run on daemon threads, so a hung plugin is abandoned outright:
+it neither blocks the caller nor keeps the interpreter alive at exit.
 """
 
 from __future__ import annotations
 
-from collections.abc import Callable
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import partial
 from importlib.metadata import entry_points
 from pathlib import Path
 
 from iac_scanner.models import Finding
-from iac_scanner.rules.checkov import CheckovNotInstalled, checkov_available, run_checkov
+from iac_scanner.rules.checkov import CheckovNotInstalled, checkov_available, run_checkov, run_checkov_batch
+from iac_scanner.rules.registry import cached, invalidate
+
+logger = logging.getLogger(__name__)
 
 RuleEnginePlugin = Callable[[Path, str], list[Finding]]
 _ENTRY_POINT_GROUP = "iac_scanner.rule_engines"
 
+DEFAULT_ENGINE_WORKERS = 4
+DEFAULT_ENGINE_TIMEOUT_SECONDS = 300
+
 
 class RuleEngineError(RuntimeError):
     """Generic rule-engine failure."""
@@ -38,22 +60,31 @@ class RuleEngineNotInstalled(RuleEngineError):
 def _discover_plugins() -> dict[str, RuleEnginePlugin]:
     """Return a {name: callable} map for every registered plugin engine.
 
-    Load failures are logged and skipped so a broken plugin doesn't take down
-    the whole scanner. This is called lazily on each dispatch — the cost is
-    negligible and it avoids stale caches during long-running processes.
+    Entry points are loaded once per process and remembered until
+    `invalidate_engines()` or a change to the installed distributions
+    (`rules/registry.py`), so repeated dispatches stay cheap in long-running
+    processes without going stale.
     """
+    return dict(cached("plugins", _load_plugins))
+
+
+def _load_plugins() -> dict[str, RuleEnginePlugin]:
+    """Load failures are logged and skipped so a broken plugin doesn't take down the whole scanner."""
     discovered: dict[str, RuleEnginePlugin] = {}
     eps = entry_points(group=_ENTRY_POINT_GROUP)
     for ep in eps:
         try:
             discovered[ep.name] = ep.load()
         except Exception:  # noqa: BLE001 — plugin load mustn't brick the scanner
-            import logging
-
-            logging.getLogger(__name__).warning("Failed to load rule-engine plugin %r", ep.name, exc_info=True)
+            logger.warning("Failed to load rule-engine plugin %r", ep.name, exc_info=True)
     return discovered
 
 
+def invalidate_engines() -> None:
+    """Forget discovered plugins and availability probes, e.g. after installing an engine in-process."""
+    invalidate()
+
+
 def is_available(engine: str = "checkov") -> bool:
     """Return True if the named engine can run in this environment.
 
@@ -76,6 +107,114 @@ def available_engines() -> list[str]:
     return names
 
 
+def engine_workers() -> int:
+    """Rule engines run at once in 'auto' mode. Configurable via IAC_RULE_ENGINE_WORKERS."""
+    raw = os.environ.get("IAC_RULE_ENGINE_WORKERS")
+    try:
+        return max(1, int(raw)) if raw is not None else DEFAULT_ENGINE_WORKERS
+    except ValueError:
+        logger.warning("Invalid IAC_RULE_ENGINE_WORKERS=%r; using default", raw)
+        return DEFAULT_ENGINE_WORKERS
+
+
+def engine_timeout_seconds() -> int:
+    """Per-engine timeout in 'auto' mode. Configurable via IAC_RULE_ENGINE_TIMEOUT; floored to 1 s."""
+    raw = os.environ.get("IAC_RULE_ENGINE_TIMEOUT")
+    try:
+        return max(1, int(raw)) if raw is not None else DEFAULT_ENGINE_TIMEOUT_SECONDS
+    except ValueError:
+        logger.warning("Invalid IAC_RULE_ENGINE_TIMEOUT=%r; using default", raw)
+        return DEFAULT_ENGINE_TIMEOUT_SECONDS
+
+
+def _run_checkov_auto(path: Path, iac_type: str, timeout_seconds: int) -> list[Finding]:
+    try:
+        return run_checkov(path, iac_type, timeout_seconds=timeout_seconds)
+    except CheckovNotInstalled:
+        # Race between availability probe and execution; ignore.
+        return []
+
+
+def _plugin_result(name: str, future: Future[list[Finding]], timeout: float) -> list[Finding]:
+    """A plugin's findings, or [] when it fails or runs past `timeout` (the 'auto' semantics)."""
+    try:
+        return future.result(timeout=max(0.0, timeout))
+    except FutureTimeout:
+        logger.warning("Rule engine %r timed out; skipping", name)
+    except RuntimeError:
+        # Plugin-specific NotInstalled / transient failure — skip in auto.
+        pass
+    except Exception:  # noqa: BLE001
+        logger.warning("Plugin %r raised unexpectedly; skipping", name, exc_info=True)
+    return []
+
+
+def _start_daemon_workers(jobs: list[Callable[[], list[Finding]]], workers: int) -> list[Future[list[Finding]]]:
+    """Run `jobs` in order on at most `workers` daemon threads; one Future per job.
+
+    Unlike a ThreadPoolExecutor, whose threads are joined at interpreter exit,
+    a daemon thread stuck in a plugin can simply be left behind. Jobs still
+    pending when their Future is cancelled are skipped.
+    """
+    pending: queue.SimpleQueue[tuple[Future[list[Finding]], Callable[[], list[Finding]]]] = queue.SimpleQueue()
+    futures: list[Future[list[Finding]]] = []
+    for job in jobs:
+        future: Future[list[Finding]] = Future()
+        futures.append(future)
+        pending.put((future, job))
+
+    def work() -> None:
+        while True:
+            try:
+                future, job = pending.get_nowait()
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(job())
+            except BaseException as exc:  # noqa: BLE001 — handed to the waiting caller
+                future.set_exception(exc)
+
+    for n in range(min(workers, len(jobs))):
+        threading.Thread(target=work, name=f"iac-rules-{n}", daemon=True).start()
+    return futures
+
+
+def _run_auto(
+    plugins: dict[str, RuleEnginePlugin],
+    path: Path,
+    iac_type: str,
+    *,
+    checkov: bool,
+) -> list[Finding]:
+    """Union of Checkov's (when `checkov`) and every plugin's findings, run concurrently, in engine order.
+
+    Checkov errors other than NotInstalled propagate, as before; failing or
+    timed-out plugins are skipped. Plugin `i` may wait for a free worker, so
+    its deadline is one timeout per wave of workers ahead of it.
+    """
+    names = list(plugins)
+    if not names:
+        return _run_checkov_auto(path, iac_type, engine_timeout_seconds()) if checkov else []
+    timeout, workers = engine_timeout_seconds(), engine_workers()
+    offset = int(checkov)
+    started = time.monotonic()
+    jobs: list[Callable[[], list[Finding]]] = [partial(_run_checkov_auto, path, iac_type, timeout)] if checkov else []
+    jobs.extend(partial(plugins[name], path, iac_type) for name in names)
+    futures = _start_daemon_workers(jobs, workers)
+    try:
+        findings = list(futures[0].result()) if checkov else []
+        for i, (name, future) in enumerate(zip(names, futures[offset:], strict=True)):
+            deadline = started + timeout * ((i + offset) // workers + 1)
+            findings.extend(_plugin_result(name, future, deadline - time.monotonic()))
+        return findings
+    finally:
+        # Engines not yet started are dropped; a running one cannot be interrupted and is left behind.
+        for future in futures:
+            future.cancel()
+
+
 def run_rule_engine(
     path: Path,
     iac_type: str,
@@ -88,9 +227,10 @@ def run_rule_engine(
         'none'     — no-op (returns [])
         'checkov'  — built-in; raises RuleEngineNotInstalled if Checkov missing
         '<plugin>' — any plugin name registered under iac_scanner.rule_engines
-        'auto'     — try Checkov, then each plugin in discovery order; union
-                     the findings they produce, skipping engines that aren't
-                     installed. Never raises on missing engines.
+        'auto'     — run Checkov and every plugin concurrently; union the
+                     findings they produce in that order, skipping engines
+                     that aren't installed, fail or time out. Never raises on
+                     missing engines.
     """
     if engine == "none":
         return []
@@ -98,26 +238,7 @@ def run_rule_engine(
     plugins = _discover_plugins()
 
     if engine == "auto":
-        findings: list[Finding] = []
-        if checkov_available():
-            try:
-                findings.extend(run_checkov(path, iac_type))
-            except CheckovNotInstalled:
-                # Race between availability probe and execution; ignore.
-                pass
-        for plugin_name, plugin in plugins.items():
-            try:
-                findings.extend(plugin(path, iac_type))
-            except RuntimeError:
-                # Plugin-specific NotInstalled / transient failure — skip in auto.
-                continue
-            except Exception:  # noqa: BLE001
-                import logging
-
-                logging.getLogger(__name__).warning(
-                    "Plugin %r raised unexpectedly; skipping", plugin_name, exc_info=True
-                )
-        return findings
+        return _run_auto(plugins, path, iac_type, checkov=checkov_available())
 
     if engine == "checkov":
         try:
@@ -137,3 +258,34 @@ def run_rule_engine(
     raise RuleEngineError(
         f"Unknown rule engine: {engine!r}. Built-ins: checkov. Installed plugins: {list(plugins) or 'none'}."
     )
+
+
+def run_rule_engine_batch(
+    paths: Sequence[Path],
+    iac_type: str,
+    *,
+    engine: str = "auto",
+) -> dict[Path, list[Finding]]:
+    """`run_rule_engine` over many roots of one IaC type, keyed by path.
+
+    Checkov runs once for the whole batch (`run_checkov_batch`). Plugins have no
+    batch contract, so they still run once per path. Engine names and error
+    handling are the same as in `run_rule_engine`.
+    """
+    if engine == "none":
+        return {path: [] for path in paths}
+    if engine == "checkov":
+        try:
+            return run_checkov_batch(paths, iac_type)
+        except CheckovNotInstalled as e:
+            raise RuleEngineNotInstalled(str(e)) from e
+    if engine == "auto":
+        batched: dict[Path, list[Finding]] = {}
+        if checkov_available():
+            try:
+                batched = run_checkov_batch(paths, iac_type)
+            except CheckovNotInstalled:
+                pass  # race between availability probe and execution, as in run_rule_engine
+        plugins = _discover_plugins()
+        return {path: [*batched.get(path, []), *_run_auto(plugins, path, iac_type, checkov=False)] for path in paths}
+    return {path: run_rule_engine(path, iac_type, engine=engine) for path in paths}
@@ -0,0 +1,65 @@
+"""Per-process memo for rule-engine discovery and availability probes.
+
+Loading the `iac_scanner.rule_engines` entry points, and probing for Checkov,
+each cost a metadata scan, a PATH walk or an import. One hybrid run asks
+several times, and a long-lived MCP server asks on every request. Answers are
+therefore remembered until either:
+
+- `invalidate()` is called (`iac_scanner.rules.invalidate_engines`), or
+- the installed distribution set changes. Installing or removing a
+  distribution adds or removes a `*.dist-info` entry in a `sys.path`
+  directory, which changes that directory's mtime. Each lookup stats those
+  directories, which is far cheaper than re-reading their metadata.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+Stamp = tuple[tuple[str, int], ...]
+
+_lock = threading.Lock()
+_values: dict[Hashable, Any] = {}
+_stamp: Stamp | None = None
+
+
+def environment_stamp() -> Stamp:
+    """`sys.path` directories and their mtimes; changes when a distribution is installed or removed."""
+    stamp: list[tuple[str, int]] = []
+    for entry in sys.path:
+        try:
+            stamp.append((entry, os.stat(entry or ".").st_mtime_ns))
+        except OSError:
+            continue
+    return tuple(stamp)
+
+
+def cached(key: Hashable, compute: Callable[[], T]) -> T:
+    """`compute()`, remembered under `key` until invalidated or the environment changes."""
+    global _stamp
+    stamp = environment_stamp()
+    with _lock:
+        if stamp != _stamp:
+            _values.clear()
+            _stamp = stamp
+        if key in _values:
+            return _values[key]  # type: ignore[no-any-return]
+    value = compute()  # outside the lock: plugin imports can be slow and may probe again
+    with _lock:
+        if _stamp == stamp:
+            _values[key] = value
+    return value
+
+
+def invalidate() -> None:
+    """Forget every remembered answer; the next lookup discovers and probes again."""
+    global _stamp
+    with _lock:
+        _values.clear()
+        _stamp = None
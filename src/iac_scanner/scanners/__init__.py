@@ -2,11 +2,12 @@
 
 from iac_scanner.scanners.base import IacScanner, ScanResult
 from iac_scanner.scanners.cdk import CdkScanner
-from iac_scanner.scanners.terraform import TerraformScanner
+from iac_scanner.scanners.terraform import TerraformModuleScanner, TerraformScanner
 
 __all__ = [
     "IacScanner",
     "ScanResult",
     "TerraformScanner",
+    "TerraformModuleScanner",
     "CdkScanner",
 ]
@@ -4,11 +4,15 @@ Three concerns, all applied before raw IaC content is sent to an LLM:
 
 1. **Skip-list** — files we refuse to read at all (state files, `.env`, `.tfvars`,
    lock files). These are the highest-risk secret carriers in a typical IaC repo.
+   Compiled once into a `SkipMatcher`; tree walkers use `walk_unskipped` so
+   skip-listed directories are pruned rather than entered.
 
 2. **Secret redaction** — obvious secret patterns are masked inline so a forgotten
    AWS key in a `main.tf` comment doesn't get shipped to OpenAI.
 
-3. **Input size cap** — a hard limit on total raw content. Protects against:
+3. **Input size cap** — a hard limit on total raw content, checked against
+   `stat()` sizes before any file is read and against a running byte count
+   while reading (`InputBudget`). Protects against:
      (a) accidentally scanning a multi-MB module (runaway cost),
      (b) prompt-injection attacks that try to stuff the context to override
          the system prompt.
@@ -22,6 +26,9 @@ import fnmatch
 import logging
 import os
 import re
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -65,18 +72,73 @@ DEFAULT_SKIP_PATTERNS: tuple[str, ...] = (
 )
 
 
+class SkipMatcher:
+    """A skip-list compiled into one regex, with decisions memoised per path component.
+
+    `fnmatch` per pattern per ancestor is O(patterns x depth) for every file.
+    Here every pattern is translated once into a single alternation, and since
+    directory names repeat across a tree (`modules`, `lib`, `envs`), each
+    component is matched at most once per process.
+    """
+
+    _MEMO_LIMIT = 65536
+
+    def __init__(self, patterns: tuple[str, ...] = DEFAULT_SKIP_PATTERNS):
+        self.patterns = tuple(patterns)
+        # fnmatch normalises case the same way (os.path.normcase) before matching.
+        self._regex = re.compile("|".join(fnmatch.translate(os.path.normcase(p)) for p in self.patterns) or "(?!)")
+        self._memo: dict[str, bool] = {}
+
+    def matches(self, component: str) -> bool:
+        """True if a single path component (file or directory name) is skip-listed."""
+        hit = self._memo.get(component)
+        if hit is None:
+            if len(self._memo) >= self._MEMO_LIMIT:
+                self._memo.clear()
+            hit = self._regex.match(os.path.normcase(component)) is not None
+            self._memo[component] = hit
+        return hit
+
+    def should_skip(self, path: Path) -> bool:
+        """True if this file or any parent directory matches a skip pattern."""
+        return any(self.matches(part) for part in path.parts)
+
+    def prune(self, dirnames: list[str]) -> None:
+        """Drop skip-listed names from an `os.walk` dirnames list, in place."""
+        dirnames[:] = [d for d in dirnames if not self.matches(d)]
+
+    def walk(self, top: str | Path) -> Iterator[tuple[str, list[str], list[str]]]:
+        """`os.walk(top)` that never descends into skip-listed directories.
+
+        Callers may prune `dirnames` further before resuming the generator.
+        """
+        for dirpath, dirnames, filenames in os.walk(top):
+            self.prune(dirnames)
+            yield dirpath, dirnames, filenames
+
+
+_DEFAULT_MATCHER = SkipMatcher(DEFAULT_SKIP_PATTERNS)
+
+
+@lru_cache(maxsize=8)
+def skip_matcher(patterns: tuple[str, ...] = DEFAULT_SKIP_PATTERNS) -> SkipMatcher:
+    """Return the shared compiled matcher for a pattern set."""
+    if patterns == DEFAULT_SKIP_PATTERNS:
+        return _DEFAULT_MATCHER
+    return SkipMatcher(patterns)
+
+
 def should_skip(path: Path, patterns: tuple[str, ...] = DEFAULT_SKIP_PATTERNS) -> bool:
     """True if this file or any parent directory matches a skip pattern."""
-    name = path.name
-    for pattern in patterns:
-        if fnmatch.fnmatch(name, pattern):
-            return True
-    # Also skip if any ancestor directory is in the list (node_modules, .venv, etc.)
-    for part in path.parts:
-        for pattern in patterns:
-            if fnmatch.fnmatch(part, pattern):
-                return True
-    return False
+    matcher = _DEFAULT_MATCHER if patterns is DEFAULT_SKIP_PATTERNS else skip_matcher(patterns)
+    return matcher.should_skip(path)
+
+
+def walk_unskipped(
+    top: str | Path, patterns: tuple[str, ...] = DEFAULT_SKIP_PATTERNS
+) -> Iterator[tuple[str, list[str], list[str]]]:
+    """Directory-pruning walk: `os.walk` minus skip-listed directories. See `SkipMatcher.walk`."""
+    return skip_matcher(patterns).walk(top)
 
 
 # ---- Secret redaction ------------------------------------------------------
@@ -123,45 +185,230 @@ _SECRET_PATTERNS: tuple[tuple[re.Pattern[str], str], ...] = (
 )
 
 
+def _is_word_char(c: str) -> bool:
+    """Same definition of a word character as `re`'s `\\b` / `\\w` on str patterns."""
+    return c.isalnum() or c == "_"
+
+
+@dataclass(frozen=True)
+class _Anchor:
+    """A cheap literal that every match of one redaction rule must contain.
+
+    `lookbehind` is how far before the literal a match may start ("aws_"
+    precedes "secret_" in `aws_secret_access_key`). `word_start` mirrors a
+    leading `\\b` in the rule, so `task-` is not an anchor for `\\bsk-`.
+    """
+
+    literal: str
+    word_start: bool = False
+    ignore_case: bool = False
+    lookbehind: int = 0
+
+    def find(self, text: str, pos: int = 0) -> int:
+        """Index of the next usable occurrence at or after `pos`, or -1."""
+        while True:
+            i = self._find_literal(text, pos)
+            if i <= 0 or not self.word_start or not _is_word_char(text[i - 1]):
+                return i
+            pos = i + 1
+
+    def _find_literal(self, text: str, pos: int) -> int:
+        if not self.ignore_case:
+            return text.find(self.literal, pos)
+        # Lower-case bounded windows (overlapping by len-1) instead of the whole
+        # text; non-ASCII windows use `re`, whose IGNORECASE rules are the ones
+        # the redaction pattern itself applies.
+        step = 1 << 20
+        overlap = len(self.literal) - 1
+        for start in range(pos, len(text), step):
+            window = text[start : start + step + overlap]
+            if window.isascii():
+                j = window.lower().find(self.literal)
+            else:
+                m = re.search(re.escape(self.literal), window, re.IGNORECASE)
+                j = m.start() if m else -1
+            if j >= 0:
+                return start + j
+        return -1
+
+
+# One anchor per entry of `_SECRET_PATTERNS`, same order.
+_SECRET_ANCHORS: tuple[_Anchor, ...] = (
+    _Anchor("AKIA", word_start=True),
+    _Anchor("ASIA", word_start=True),
+    _Anchor("secret_", ignore_case=True, lookbehind=len("aws_")),
+    _Anchor("ghp_", word_start=True),
+    _Anchor("gho_", word_start=True),
+    _Anchor("ghu_", word_start=True),
+    _Anchor("ghs_", word_start=True),
+    _Anchor("ghr_", word_start=True),
+    _Anchor("sk-", word_start=True),
+    _Anchor("sk-ant-", word_start=True),
+    _Anchor("xox", word_start=True),
+    _Anchor("Bearer"),
+    _Anchor("-----BEGIN "),
+    _Anchor("eyJ", word_start=True),
+)
+
+
+def _redact_rule(text: str, pattern: re.Pattern[str], replacement: str, anchor: _Anchor) -> str:
+    """Equivalent of `pattern.sub(replacement, text)` that only tries match starts near anchors.
+
+    Every match contains its anchor at most `anchor.lookbehind` chars after its
+    start, so trying `pattern.match` at those few offsets — leftmost first —
+    finds exactly the matches `sub` would, without running the regex at every
+    position of the text.
+    """
+    out: list[str] = []
+    copied = 0  # text[:copied] is already in `out`
+    tried = -1  # highest match start already tried
+    pos = 0
+    while (at := anchor.find(text, pos)) >= 0:
+        m = None
+        for start in range(max(copied, at - anchor.lookbehind, tried + 1), at + 1):
+            if (m := pattern.match(text, start)) is not None:
+                break
+        tried = max(tried, at)
+        if m is None:
+            pos = at + 1
+            continue
+        out.append(text[copied : m.start()])
+        out.append(m.expand(replacement))
+        copied = pos = m.end()
+    if not out:
+        return text
+    out.append(text[copied:])
+    return "".join(out)
+
+
 def redact_secrets(text: str) -> str:
-    """Return `text` with common secret patterns masked inline. Best-effort."""
+    """Return `text` with common secret patterns masked inline. Best-effort.
+
+    A literal prefilter (`str.find` per distinct anchor — `AKIA`, `ghp_`, `sk-`,
+    `Bearer`, `-----BEGIN`, ...) decides which rules can match at all; only
+    those run, and only at offsets next to their anchor. Rules still apply in
+    `_SECRET_PATTERNS` order, so output is identical to running every pattern's
+    `sub` in turn. Text with no anchors is returned as-is, uncopied.
+
+    Skipping a rule up front is sound because no replacement string contains,
+    or creates a word boundary in front of, a *later* rule's anchor.
+    """
     if os.environ.get("IAC_NO_REDACT"):
         return text
-    redacted = text
-    for pattern, replacement in _SECRET_PATTERNS:
-        redacted = pattern.sub(replacement, redacted)
-    return redacted
+    present = {anchor for anchor in dict.fromkeys(_SECRET_ANCHORS) if anchor.find(text) >= 0}
+    if not present:
+        return text
+    for (pattern, replacement), anchor in zip(_SECRET_PATTERNS, _SECRET_ANCHORS, strict=True):
+        if anchor in present:
+            text = _redact_rule(text, pattern, replacement, anchor)
+    return text
 
 
 # ---- Input size cap --------------------------------------------------------
 
 DEFAULT_MAX_INPUT_BYTES = 200 * 1024  # 200 KB
+MAX_INPUT_BYTES_CEILING = 10 * 1024 * 1024  # 10 MB
 
 
 class InputTooLargeError(RuntimeError):
-    """Raised when aggregate scanner content exceeds the configured cap."""
+    """Raised when aggregate scanner content exceeds the configured cap.
+
+    `files` holds (path, size in bytes) for the largest inputs, when known.
+    """
+
+    def __init__(self, message: str, files: Sequence[tuple[str, int]] = ()) -> None:
+        super().__init__(message)
+        self.files = list(files)
 
 
 def max_input_bytes() -> int:
-    """Configurable via IAC_MAX_INPUT_BYTES. Minimum 1KB, maximum 10MB."""
+    """Configurable via IAC_MAX_INPUT_BYTES. Minimum 1KB, maximum 10MB.
+
+    In chunked and granular modes (`IAC_CHUNKED`, `IAC_GRANULAR`) no single
+    prompt carries the whole input, so the default rises to the 10MB ceiling.
+    """
     raw = os.environ.get("IAC_MAX_INPUT_BYTES")
     if raw is None:
-        return DEFAULT_MAX_INPUT_BYTES
+        split = os.environ.get("IAC_CHUNKED") or os.environ.get("IAC_GRANULAR")
+        return MAX_INPUT_BYTES_CEILING if split else DEFAULT_MAX_INPUT_BYTES
     try:
         val = int(raw)
     except ValueError:
         logger.warning("Invalid IAC_MAX_INPUT_BYTES=%r; using default", raw)
         return DEFAULT_MAX_INPUT_BYTES
-    return max(1024, min(val, 10 * 1024 * 1024))
+    return max(1024, min(val, MAX_INPUT_BYTES_CEILING))
 
 
 def enforce_input_size(content: str) -> None:
     """Raise InputTooLargeError if content exceeds the cap."""
-    size = len(content.encode("utf-8"))
+    enforce_input_bytes(len(content.encode("utf-8")))
+
+
+def enforce_input_bytes(size: int) -> None:
+    """Raise InputTooLargeError if a precomputed UTF-8 byte size exceeds the cap."""
     cap = max_input_bytes()
     if size > cap:
-        raise InputTooLargeError(
-            f"Input size {size:,} bytes exceeds cap {cap:,} bytes "
-            f"(IAC_MAX_INPUT_BYTES). Reduce the scan scope, split the module, "
-            f"or raise the cap explicitly."
-        )
+        raise _too_large(f"Input size {size:,} bytes exceeds cap {cap:,} bytes", [])
+
+
+_LISTED_FILES = 5
+
+
+def _too_large(head: str, sizes: list[tuple[str, int]]) -> InputTooLargeError:
+    largest = sorted(sizes, key=lambda item: -item[1])[:_LISTED_FILES]
+    listing = ""
+    if largest:
+        listing = " Largest files: " + ", ".join(f"{name} ({size:,} bytes)" for name, size in largest)
+        if len(sizes) > len(largest):
+            listing += f", +{len(sizes) - len(largest)} more"
+        listing += "."
+    return InputTooLargeError(
+        f"{head} (IAC_MAX_INPUT_BYTES).{listing} Reduce the scan scope, split the module, "
+        f"analyze it in chunks (--chunked), or raise the cap explicitly.",
+        largest,
+    )
+
+
+class InputBudget:
+    """The size cap for one scan, enforced before and while its files are read.
+
+    `precheck` sums `stat()` sizes plus fixed overhead (section headers) and
+    rejects the scan before any file is opened. `read_text` then reads each
+    file with a bounded read and keeps a running total, so a file that grew
+    since the stat, or whose stat size means nothing (pipes, `/proc`), stops
+    the scan as soon as the total passes the cap, without reading the rest.
+    """
+
+    def __init__(self, cap: int | None = None) -> None:
+        self.cap = max_input_bytes() if cap is None else cap
+        self.used = 0
+        self._sizes: dict[str, int] = {}
+
+    def precheck(self, files: Sequence[Path], overhead: int = 0) -> None:
+        """Charge `overhead` and raise InputTooLargeError if the on-disk sizes already exceed the cap."""
+        self.used += overhead
+        for f in files:
+            try:
+                self._sizes[str(f)] = f.stat().st_size
+            except OSError:
+                continue  # reported by the read
+        total = self.used + sum(self._sizes.values())
+        if total > self.cap:
+            raise _too_large(f"Input size {total:,} bytes exceeds cap {self.cap:,} bytes", list(self._sizes.items()))
+
+    def read_text(self, path: Path) -> str:
+        """Read `path` as UTF-8 text (universal newlines, invalid bytes replaced) within the budget."""
+        remaining = max(0, self.cap - self.used)
+        with path.open("rb") as fh:
+            data = fh.read(remaining + 1)
+        self.used += len(data)
+        if self.used > self.cap:
+            self._sizes[str(path)] = max(self._sizes.get(str(path), 0), len(data))
+            raise _too_large(
+                f"Input size exceeds cap {self.cap:,} bytes while reading {path.name}",
+                list(self._sizes.items()),
+            )
+        text = data.decode("utf-8", errors="replace")
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
@@ -4,24 +4,134 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr, model_validator
+
+from iac_scanner.scanners._filters import InputBudget, InputTooLargeError, enforce_input_bytes, redact_secrets
+from iac_scanner.scanners.hcl_index import HclBlock
+
+
+def utf8_len(text: str) -> int:
+    """UTF-8 byte length of `text` without materialising the encoded copy for ASCII."""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+class ContentSegment(BaseModel):
+    """One file's contribution to the scanned content.
+
+    Scanners produce one segment per file; the joined string the LLM sees is
+    only rendered when a consumer asks for `ScanResult.raw_content`.
+    """
+
+    path: Path | None = None
+    label: str = ""  # file name as it appears in `header` ('lib/stack.ts'); empty for ad-hoc content
+    header: str = ""  # e.g. '# --- main.tf ---'; empty for ad-hoc content
+    text: str = ""  # redacted file text
+    nbytes: int = 0  # UTF-8 length of `text`
+    offset: int = 0  # byte offset of this segment within the rendered content
+
+    @property
+    def rendered_bytes(self) -> int:
+        """UTF-8 length of `render()` without rendering it."""
+        if not self.header:
+            return self.nbytes
+        return utf8_len(self.header) + 1 + self.nbytes
+
+    def render(self) -> str:
+        return f"{self.header}\n{self.text}" if self.header else self.text
 
 
 class ScanResult(BaseModel):
-    """Result of scanning IaC code."""
+    """Result of scanning IaC code.
+
+    Content is held as a list of per-file `segments`. `raw_content` renders
+    (and memoises) the joined string; passing `raw_content=` to the constructor
+    is still accepted and becomes a single header-less segment.
+    """
 
     iac_type: str
     entry_path: Path
-    raw_content: str
+    segments: list[ContentSegment] = []
+    blocks: list[HclBlock] = []  # top-level block index (Terraform only)
     findings: list[dict[str, Any]] = []
     metadata: dict[str, Any] = {}
 
+    _joined: str | None = PrivateAttr(default=None)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _accept_raw_content(cls, data: Any) -> Any:
+        if isinstance(data, dict) and "raw_content" in data:
+            data = dict(data)
+            raw = data.pop("raw_content")
+            if raw and not data.get("segments"):
+                data["segments"] = [ContentSegment(text=raw, nbytes=utf8_len(raw))]
+        return data
+
+    @property
+    def raw_content(self) -> str:
+        """The joined content sent to the LLM. Rendered once, on first access."""
+        if self._joined is None:
+            self._joined = "\n".join(seg.render() for seg in self.segments)
+        return self._joined
+
+    @property
+    def content_bytes(self) -> int:
+        """UTF-8 size of `raw_content`, computed from segment sizes (no join)."""
+        if not self.segments:
+            return 0
+        last = self.segments[-1]
+        return last.offset + last.rendered_bytes
+
+
+def segment_label(path: Path, root: Path | None = None) -> str:
+    """How a file is named in its segment header: relative to `root` when given and inside it, else its name."""
+    if root is not None and path.is_relative_to(root):
+        return path.relative_to(root).as_posix()
+    return path.name
+
+
+def read_segments(files: list[Path], comment_prefix: str, root: Path | None = None) -> list[ContentSegment]:
+    """Read, redact and size each file as its own segment, enforcing the input cap.
+
+    Headers name each file relative to `root` (`// --- lib/stack.ts ---`) when
+    given, so files with the same name in different directories stay distinct.
+
+    The cap is checked against on-disk sizes before the first read and against
+    a running byte count during reads (`InputBudget`), so an oversized input is
+    rejected without reading or redacting the rest. Redaction and byte
+    accounting run per file, so the joined content is never copied just to be
+    measured or masked.
+    """
+    labels = [segment_label(f, root) for f in files]
+    headers = [f"{comment_prefix} --- {label} ---" for label in labels]
+    budget = InputBudget()
+    # Each segment renders as `header\ntext`, and segments are joined with "\n".
+    budget.precheck(files, overhead=max(0, sum(utf8_len(h) + 2 for h in headers) - 1))
+    segments: list[ContentSegment] = []
+    offset = 0
+    for i, (f, label, header) in enumerate(zip(files, labels, headers, strict=True)):
+        try:
+            text = redact_secrets(budget.read_text(f))
+        except InputTooLargeError:
+            raise
+        except Exception as e:  # noqa: BLE001
+            text = ""
+            header = f"{comment_prefix} --- {label} (read error: {e}) ---"
+        if i == len(files) - 1:
+            text = text.rstrip()
+        seg = ContentSegment(path=f, label=label, header=header, text=text, nbytes=utf8_len(text), offset=offset)
+        segments.append(seg)
+        offset += seg.rendered_bytes + 1  # +1 for the newline joining segments
+    enforce_input_bytes(max(0, offset - 1))
+    return segments
+
 
 class IacScanner(ABC):
     """Abstract scanner for Infrastructure-as-Code. Concrete scanners (TF, CDK) implement this."""
 
     iac_type: str = "base"
     entry_name: str = ""
+    comment_prefix: str = "#"  # line-comment syntax used for per-file section headers
 
     def __init__(self, base_path: Path):
         self.base_path = Path(base_path).resolve()
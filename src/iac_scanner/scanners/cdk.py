@@ -4,12 +4,9 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from iac_scanner.scanners._filters import (
-    enforce_input_size,
-    redact_secrets,
-    should_skip,
-)
-from iac_scanner.scanners.base import IacScanner, ScanResult
+from iac_scanner.scanners._filters import should_skip
+from iac_scanner.scanners.base import IacScanner, ScanResult, read_segments
+from iac_scanner.scanners.ts_imports import reachable_sources
 
 
 class CdkScanner(IacScanner):
@@ -17,6 +14,7 @@ class CdkScanner(IacScanner):
 
     iac_type = "cdk"
     entry_name = "index.ts"
+    comment_prefix = "//"
 
     def __init__(self, base_path: Path):
         super().__init__(base_path)
@@ -45,9 +43,17 @@ class CdkScanner(IacScanner):
         return (path / "index.ts").is_file() or (path / "index.js").is_file()
 
     def list_files(self) -> list[Path]:
-        """CDK: entry file and common lib/stack files in same dir, minus skip-list."""
+        """CDK: the entry file plus every source file it reaches through relative imports.
+
+        When the entry imports nothing local (a bare `index.ts`, or an app that
+        wires stacks up dynamically), fall back to the `lib/` and `bin/` files
+        next to it, minus the skip-list.
+        """
         if not self._entry_resolved.exists():
             return []
+        reachable = reachable_sources(self._entry_resolved, self.base_path)
+        if len(reachable) > 1:
+            return sorted(reachable)
         files = [self._entry_resolved]
         base = self._entry_resolved.parent
         for name in ("lib", "bin"):
@@ -64,24 +70,12 @@ class CdkScanner(IacScanner):
             return ScanResult(
                 iac_type=self.iac_type,
                 entry_path=self._entry_resolved,
-                raw_content="",
                 findings=[{"error": "No index.ts/index.js or related files found"}],
             )
-        raw_content = ""
-        for f in files:
-            try:
-                file_text = f.read_text(encoding="utf-8", errors="replace")
-                raw_content += f"\n// --- {f.name} ---\n{file_text}"
-            except Exception as e:  # noqa: BLE001
-                raw_content += f"\n// --- {f.name} (read error: {e}) ---\n"
-
-        raw_content = redact_secrets(raw_content.strip())
-        enforce_input_size(raw_content)
-
         return ScanResult(
             iac_type=self.iac_type,
             entry_path=self._entry_resolved,
-            raw_content=raw_content,
+            segments=read_segments(files, self.comment_prefix, self.base_path),
             findings=[],
             metadata={"files": [str(p) for p in files]},
         )
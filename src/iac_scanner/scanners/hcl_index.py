@@ -0,0 +1,249 @@
+"""Lightweight index of top-level Terraform blocks.
+
+One streaming pass per `.tf` file records every `resource`, `data`, `module`,
+`variable` and `output` block with its file, line range, type, name and a
+sha256 of its source text. It is not an HCL evaluator: the pass only tracks
+strings (including `${...}` interpolation), comments and heredocs well enough
+to know where each top-level block's braces close.
+
+The index is persisted under `<cache dir>/index/`, keyed by root directory and
+each file's fingerprint, so unchanged files are never re-parsed, and usually
+not even re-read. Persistence follows the response cache's rules: best-effort,
+and off under `IAC_NO_CACHE`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+from pydantic import BaseModel, ConfigDict
+
+from iac_scanner.cache import cache_root, is_disabled
+from iac_scanner.cache.files import atomic_write
+from iac_scanner.fingerprint import FileFingerprint, fingerprint, now_ns
+
+logger = logging.getLogger(__name__)
+
+INDEX_SCHEMA_VERSION = "3"  # Bump when HclBlock or the parse rules change.
+
+BLOCK_KINDS = ("resource", "data", "module", "variable", "output")
+
+_TWO_LABEL_RE = re.compile(r'[ \t]*(resource|data)[ \t]+("?)([\w.-]+)\2[ \t]+("?)([\w.-]+)\4[ \t]*\{')
+_ONE_LABEL_RE = re.compile(r'[ \t]*(module|variable|output)[ \t]+("?)([\w.-]+)\2[ \t]*\{')
+
+# Everything that can change string / comment / brace state. A quoted string
+# without interpolation is one token (most strings are); `\\.` swallows
+# escapes so `\"` never closes a string.
+_TOKEN_RE = re.compile(
+    r'"(?:[^"\\$%\n]|\\.|[$%](?!\{))*"|\\.|\$\{|%\{|"|\{|\}|#|//|/\*|<<-?[ \t]*"?([A-Za-z_][\w-]*)"?'
+)
+
+# `source = "../modules/vpc"` inside a module block.
+_SOURCE_RE = re.compile(r'^[ \t]*source[ \t]*=[ \t]*"([^"]*)"', re.MULTILINE)
+
+_ADDRESS_PREFIX = {"resource": "", "data": "data.", "module": "module.", "variable": "var.", "output": "output."}
+
+
+class HclBlock(BaseModel):
+    """One top-level block: `resource "aws_s3_bucket" "logs" { ... }`."""
+
+    model_config = ConfigDict(frozen=True)
+
+    kind: str  # one of BLOCK_KINDS
+    type: str = ""  # resource / data type; empty for module, variable, output
+    name: str
+    file: str  # POSIX path relative to the scanned root
+    start_line: int  # 1-based, inclusive
+    end_line: int
+    sha256: str  # of the block's source lines
+    source: str | None = None  # module blocks: the `source` argument, verbatim
+
+    @property
+    def address(self) -> str:
+        """Terraform-style address: `aws_s3_bucket.logs`, `data.x.y`, `module.vpc`, `var.region`."""
+        ref = f"{self.type}.{self.name}" if self.type else self.name
+        return _ADDRESS_PREFIX[self.kind] + ref
+
+
+def index_hcl(text: str, file: str) -> list[HclBlock]:
+    """Return the top-level blocks of one HCL file, in source order.
+
+    One regex token scan over the whole text. Only a `{` at depth 0 looks back
+    for a block header, and lines are only counted when a block opens or closes.
+    """
+    blocks: list[HclBlock] = []
+    stack: list[str] = []  # 'str' / 'tmpl' nesting inside quoted strings
+    depth = 0
+    open_block: tuple[str, str, str, int, int] | None = None  # kind, type, name, line, offset
+    pos = 0
+    heredoc_at: tuple[int, int] | None = None  # (end of the `<<EOT` line, end of the heredoc)
+    counted, newlines = 0, 0
+
+    def line_at(offset: int) -> int:
+        nonlocal counted, newlines
+        newlines += text.count("\n", counted, offset)
+        counted = offset
+        return newlines + 1
+
+    while (tok := _TOKEN_RE.search(text, pos)) is not None:
+        if heredoc_at is not None and tok.start() >= heredoc_at[0]:
+            pos, heredoc_at = heredoc_at[1], None
+            continue
+        t = tok.group()
+        pos = tok.end()
+        if stack and stack[-1] == "str":
+            if t[0] == '"':
+                # Closes the current string; a whole-string token matched here
+                # really starts after this quote, so rescan from there.
+                stack.pop()
+                pos = tok.start() + 1
+            elif t in ("${", "%{"):
+                stack.append("tmpl")
+            continue
+        if t[0] == '"':
+            if len(t) == 1:
+                stack.append("str")
+        elif t in ("#", "//"):
+            eol = text.find("\n", pos)
+            pos = len(text) if eol < 0 else eol
+        elif t == "/*":
+            end = text.find("*/", pos)
+            pos = len(text) if end < 0 else end + 2
+        elif t in ("{", "${", "%{"):
+            if stack:
+                stack.append("tmpl")
+                continue
+            if depth == 0:
+                bol = text.rfind("\n", 0, tok.start()) + 1
+                m = _TWO_LABEL_RE.match(text, bol) or _ONE_LABEL_RE.match(text, bol)
+                if m is not None and m.end() == pos:
+                    two = m.re is _TWO_LABEL_RE
+                    open_block = (m.group(1), m.group(3) if two else "", m.group(5 if two else 3), line_at(bol), bol)
+            depth += 1
+        elif t == "}":
+            if stack:
+                stack.pop()
+            elif depth > 0:
+                depth -= 1
+                if depth == 0 and open_block is not None:
+                    kind, type_, name, start_line, start = open_block
+                    eol = text.find("\n", pos)
+                    end = len(text) if eol < 0 else eol + 1
+                    source = _SOURCE_RE.search(text, start, end) if kind == "module" else None
+                    blocks.append(
+                        HclBlock(
+                            kind=kind,
+                            type=type_,
+                            name=name,
+                            file=file,
+                            start_line=start_line,
+                            end_line=line_at(tok.start()),
+                            sha256=hashlib.sha256(text[start:end].encode("utf-8")).hexdigest(),
+                            source=source.group(1) if source else None,
+                        )
+                    )
+                    open_block = None
+        elif tok.group(1) and heredoc_at is None:
+            eol = text.find("\n", pos)
+            if eol < 0:
+                break
+            close = re.compile(rf"^[ \t]*{re.escape(tok.group(1))}[ \t]*\r?$", re.MULTILINE).search(text, eol + 1)
+            heredoc_at = (eol, len(text) if close is None else close.end())
+    return blocks
+
+
+def _index_path(root: Path) -> Path:
+    digest = hashlib.sha256(str(root).encode("utf-8")).hexdigest()[:24]
+    return cache_root() / "index" / f"{digest}.json"
+
+
+def _load(root: Path) -> tuple[int, dict[str, dict[str, object]]]:
+    """Persisted (recorded_ns, per-file entries) for a root; (0, {}) when absent or stale."""
+    if is_disabled():
+        return 0, {}
+    try:
+        data = json.loads(_index_path(root).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return 0, {}
+    if data.get("schema") != INDEX_SCHEMA_VERSION:
+        return 0, {}
+    files = data.get("files")
+    return int(data.get("recorded_ns") or 0), files if isinstance(files, dict) else {}
+
+
+def _save(root: Path, files: dict[str, dict[str, object]]) -> None:
+    if is_disabled():
+        return
+    path = _index_path(root)
+    try:
+        payload = {"schema": INDEX_SCHEMA_VERSION, "root": str(root), "recorded_ns": now_ns(), "files": files}
+        atomic_write(path, json.dumps(payload).encode("utf-8"))
+    except OSError as e:
+        logger.debug("Index write failed for %s: %s", path, e)
+
+
+def _stored_blocks(entry: dict[str, object]) -> list[HclBlock] | None:
+    stored = entry.get("blocks")
+    if not isinstance(stored, list):
+        return None
+    try:
+        return [HclBlock.model_validate(b) for b in stored]
+    except Exception:  # noqa: BLE001 — a bad entry is just a miss
+        return None
+
+
+def index_files(root: Path, files: Iterable[Path]) -> tuple[list[HclBlock], dict[str, str]]:
+    """Index `files` under `root`; return (blocks, {relative path: sha256}).
+
+    Persisted entries are reused when a `stat()` proves the file unchanged (see
+    `iac_scanner.fingerprint`) — the body is not even read — or when the
+    re-read content hashes the same.
+    """
+    root = Path(root).resolve()
+    recorded_ns, persisted = _load(root)
+    entries: dict[str, dict[str, object]] = {}
+    blocks: list[HclBlock] = []
+    digests: dict[str, str] = {}
+    changed = False
+
+    for path in files:
+        try:
+            rel = path.resolve().relative_to(root).as_posix()
+        except ValueError:
+            rel = path.as_posix()
+        entry = persisted.get(rel) or {}
+        previous = FileFingerprint.from_dict(entry)
+        try:
+            fp = fingerprint(path, previous, recorded_ns)
+        except OSError as e:
+            logger.debug("Index skipped unreadable %s: %s", path, e)
+            continue
+        file_blocks = _stored_blocks(entry) if previous is not None and previous.sha256 == fp.sha256 else None
+        if file_blocks is None:
+            text = path.read_bytes().decode("utf-8", errors="replace")
+            file_blocks = index_hcl(text, rel)
+            changed = True
+        elif fp != previous:
+            changed = True
+        entries[rel] = {**fp.to_dict(), "blocks": [b.model_dump() for b in file_blocks]}
+        digests[rel] = fp.sha256
+        blocks.extend(file_blocks)
+
+    if changed or entries.keys() != persisted.keys():
+        _save(root, entries)
+    return blocks, digests
+
+
+def build_index(root: Path, files: Iterable[Path]) -> list[HclBlock]:
+    """Index `files` under `root`, reusing persisted entries for unchanged files."""
+    return index_files(root, files)[0]
+
+
+def find_block(blocks: Iterable[HclBlock], address: str) -> HclBlock | None:
+    """Return the block with this Terraform address, if indexed."""
+    return next((b for b in blocks if b.address == address), None)
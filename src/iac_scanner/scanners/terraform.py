@@ -4,12 +4,10 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from iac_scanner.scanners._filters import (
-    enforce_input_size,
-    redact_secrets,
-    should_skip,
-)
-from iac_scanner.scanners.base import IacScanner, ScanResult
+from iac_scanner.scanners._filters import should_skip
+from iac_scanner.scanners.base import IacScanner, ScanResult, read_segments
+from iac_scanner.scanners.hcl_index import build_index
+from iac_scanner.scanners.tf_modules import module_files
 
 
 class TerraformScanner(IacScanner):
@@ -35,30 +33,28 @@ class TerraformScanner(IacScanner):
         return sorted(files)
 
     def scan(self) -> ScanResult:
-        """Load main.tf (and related .tf), redact secrets, enforce size cap."""
+        """Load main.tf (and related .tf), redact secrets, enforce size cap, index blocks."""
         files = self.list_files()
         if not files:
             return ScanResult(
                 iac_type=self.iac_type,
                 entry_path=self.entry_path,
-                raw_content="",
                 findings=[{"error": "No main.tf or .tf files found"}],
             )
-        raw_content = ""
-        for f in files:
-            try:
-                file_text = f.read_text(encoding="utf-8", errors="replace")
-                raw_content += f"\n# --- {f.name} ---\n{file_text}"
-            except Exception as e:  # noqa: BLE001
-                raw_content += f"\n# --- {f.name} (read error: {e}) ---\n"
-
-        raw_content = redact_secrets(raw_content.strip())
-        enforce_input_size(raw_content)
-
         return ScanResult(
             iac_type=self.iac_type,
             entry_path=self.entry_path,
-            raw_content=raw_content,
+            segments=read_segments(files, self.comment_prefix),
+            blocks=build_index(self.base_path, files),
             findings=[],
             metadata={"files": [str(p) for p in files]},
         )
+
+
+class TerraformModuleScanner(TerraformScanner):
+    """Scanner for a local module directory: every .tf file, no main.tf required."""
+
+    entry_name = ""
+
+    def list_files(self) -> list[Path]:
+        return module_files(self.base_path) if self.base_path.is_dir() else []
@@ -0,0 +1,80 @@
+"""Resolve local Terraform module sources into a module graph.
+
+`module "vpc" { source = "../modules/vpc" }` points outside the root's own
+`.tf` files, so the root scan never sees it. `resolve_local_modules` walks the
+block index from a root, follows every local source (Terraform's rule: it
+starts with `./` or `../`) recursively, and returns each reachable module
+directory once, with a hash of its content.
+
+Registry, git and other remote sources are not followed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+from iac_scanner.scanners._filters import should_skip
+from iac_scanner.scanners.hcl_index import HclBlock, build_index, index_files
+
+
+@dataclass(frozen=True)
+class LocalModule:
+    """A module directory reachable from a root through local `source` arguments."""
+
+    path: Path  # resolved directory
+    files: tuple[Path, ...]
+    sha256: str  # over the files' names and bytes; identical copies share it
+
+
+def is_local_source(source: str) -> bool:
+    return source.startswith(("./", "../"))
+
+
+def module_files(directory: Path) -> list[Path]:
+    """Every `.tf` file directly in `directory`, minus skip-list matches."""
+    return sorted(p for p in directory.glob("*.tf") if p.is_file() and not should_skip(p))
+
+
+def _content_sha(directory: Path, files: list[Path], digests: dict[str, str]) -> str:
+    """Hash of the files' names and content digests (as recorded by the index; no re-read)."""
+    h = hashlib.sha256()
+    for f in files:
+        rel = f.resolve().relative_to(directory).as_posix()
+        h.update(f.name.encode("utf-8") + b"\0")
+        h.update(bytes.fromhex(digests[rel]) if rel in digests else b"\0")
+    return h.hexdigest()
+
+
+def resolve_local_modules(root: Path, blocks: list[HclBlock] | None = None) -> list[LocalModule]:
+    """Every module directory reachable from `root`, breadth-first, each listed once.
+
+    `blocks` is the root's own index when the caller already has it (the
+    `ScanResult` does); module directories are indexed as they are reached.
+    Cycles and self-references are ignored; missing directories are skipped.
+    """
+    root = Path(root).resolve()
+    if blocks is None:
+        blocks = build_index(root, module_files(root))
+    seen = {root}
+    modules: list[LocalModule] = []
+    queue: deque[tuple[Path, list[HclBlock]]] = deque([(root, blocks)])
+
+    while queue:
+        directory, dir_blocks = queue.popleft()
+        for block in dir_blocks:
+            if block.kind != "module" or not block.source or not is_local_source(block.source):
+                continue
+            target = (directory / block.source).resolve()
+            if target in seen or not target.is_dir():
+                continue
+            seen.add(target)
+            files = module_files(target)
+            if not files:
+                continue
+            target_blocks, digests = index_files(target, files)
+            modules.append(LocalModule(path=target, files=tuple(files), sha256=_content_sha(target, files, digests)))
+            queue.append((target, target_blocks))
+    return modules
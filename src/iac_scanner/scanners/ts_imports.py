@@ -0,0 +1,100 @@
+"""Static import graph for CDK apps.
+
+Starting from an entry file, follow every relative `import ... from './x'`,
+`export ... from './x'`, `import('./x')` and `require('./x')` specifier and
+return exactly the set of reachable source files. Bare specifiers
+(`aws-cdk-lib`, `constructs`) are packages and are never followed.
+
+Resolution follows Node / TypeScript conventions closely enough for CDK code:
+`./x` tries `x.ts`, `x.tsx`, `x.js`, ... then `x/index.*`; a `./x.js`
+specifier also finds `x.ts` (TypeScript ESM style). Declaration files
+(`.d.ts`), skip-listed paths (`node_modules`, `cdk.out`, ...) and files outside
+the scanned root are excluded.
+
+Parse results are cached in-process by file content hash, so re-resolving an
+app (another scan in the same MCP session, or a per-stack scan) only re-parses
+files that changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import deque
+from pathlib import Path
+
+from iac_scanner.scanners._filters import should_skip
+
+SOURCE_SUFFIXES = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+
+_SPECIFIER_RE = re.compile(
+    r"""(?:\bfrom\s*|\bimport\s*\(?\s*|\brequire\s*\(\s*)(['"])(\.{1,2}/[^'"\n]*)\1""",
+)
+
+_PARSE_CACHE_MAX = 4096
+_parse_cache: dict[str, tuple[str, ...]] = {}
+
+
+def relative_specifiers(text: str) -> tuple[str, ...]:
+    """Relative module specifiers in one source file, in order of appearance, deduplicated."""
+    return tuple(dict.fromkeys(m.group(2) for m in _SPECIFIER_RE.finditer(text)))
+
+
+def _cached_specifiers(raw: bytes) -> tuple[str, ...]:
+    sha = hashlib.sha256(raw).hexdigest()
+    specs = _parse_cache.get(sha)
+    if specs is None:
+        specs = relative_specifiers(raw.decode("utf-8", errors="replace"))
+        if len(_parse_cache) >= _PARSE_CACHE_MAX:
+            _parse_cache.clear()
+        _parse_cache[sha] = specs
+    return specs
+
+
+def _is_source(path: Path) -> bool:
+    return path.suffix in SOURCE_SUFFIXES and not path.name.endswith(".d.ts") and path.is_file()
+
+
+def resolve_specifier(importer: Path, specifier: str) -> Path | None:
+    """Resolve a relative specifier from `importer` to a source file, or None."""
+    target = importer.parent / specifier
+    candidates = [target]
+    if target.suffix in (".js", ".jsx", ".mjs", ".cjs"):
+        stem = target.with_suffix("")
+        candidates += [stem.with_suffix(".ts"), stem.with_suffix(".tsx")]
+    candidates += [target.with_name(target.name + ext) for ext in SOURCE_SUFFIXES]
+    candidates += [target / f"index{ext}" for ext in SOURCE_SUFFIXES]
+    for candidate in candidates:
+        if _is_source(candidate):
+            return candidate.resolve()
+    return None
+
+
+def reachable_sources(entry: Path, root: Path | None = None) -> list[Path]:
+    """Every source file under `root` reachable from `entry` through relative imports, `entry` first.
+
+    `root` defaults to the entry's directory. Imports that resolve outside it
+    (a sibling app, a shared folder above the repository) are not followed, so
+    nothing beyond the scanned project is read or sent to the LLM. Files are
+    listed in breadth-first discovery order. Unreadable files and unresolvable
+    specifiers are skipped.
+    """
+    entry = Path(entry).resolve()
+    root = Path(root).resolve() if root is not None else entry.parent
+    seen = {entry}
+    order = [entry]
+    queue = deque([entry])
+    while queue:
+        current = queue.popleft()
+        try:
+            raw = current.read_bytes()
+        except OSError:
+            continue
+        for specifier in _cached_specifiers(raw):
+            target = resolve_specifier(current, specifier)
+            if target is None or target in seen or not target.is_relative_to(root) or should_skip(target):
+                continue
+            seen.add(target)
+            order.append(target)
+            queue.append(target)
+    return order
@@ -9,6 +9,7 @@ from typing import Any
 import pytest
 
 from iac_scanner.models import Finding, FindingsList
+from iac_scanner.rules import invalidate_engines
 
 
 @pytest.fixture(autouse=True)
@@ -22,6 +23,14 @@ def isolate_cache_dir(tmp_path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Non
     yield
 
 
+@pytest.fixture(autouse=True)
+def fresh_engine_registry() -> Iterator[None]:
+    """Rule-engine discovery and availability are memoized per process; start each test clean."""
+    invalidate_engines()
+    yield
+    invalidate_engines()
+
+
 @pytest.fixture(autouse=True)
 def clear_llm_env(monkeypatch: pytest.MonkeyPatch) -> None:
     """Clear provider-related env vars so tests have deterministic auto-detect."""
@@ -37,6 +46,18 @@ def clear_llm_env(monkeypatch: pytest.MonkeyPatch) -> None:
         "IAC_MAX_SPEND_USD",
         "IAC_MAX_INPUT_BYTES",
         "IAC_NO_REDACT",
+        "IAC_CHUNKED",
+        "IAC_CHUNK_TOKENS",
+        "IAC_CHUNK_WORKERS",
+        "IAC_GRANULAR",
+        "IAC_NO_MODULES",
+        "IAC_CACHE_URL",
+        "IAC_CACHE_TOKEN",
+        "IAC_CACHE_BACKEND",
+        "IAC_CANONICAL_KEYS",
+        "IAC_CHECKOV_WORKER",
+        "IAC_RULE_ENGINE_WORKERS",
+        "IAC_RULE_ENGINE_TIMEOUT",
     ):
         monkeypatch.delenv(var, raising=False)
     # Point Ollama detector at a port that definitely won't respond
@@ -1,17 +1,52 @@
-"""Unit tests for cache.py — key derivation, get/put, TTL."""
+"""Unit tests for the cache package — key derivation, get/put, TTL, backends."""
 
 from __future__ import annotations
 
+import http.client
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
 import pytest
+from pydantic import RootModel
 
 from iac_scanner.cache import (
     DEFAULT_TTL_SECONDS,
     CacheKey,
+    backend,
+    backend_name,
     cache_root,
+    clear,
+    compute_once,
+    gc,
     get,
+    get_many,
+    get_many_models,
+    get_model,
     is_disabled,
+    maintenance,
+    memory,
     put,
+    put_many,
+    put_model,
+    stats,
 )
+from iac_scanner.cache.canonical import canonicalize
+from iac_scanner.cache.codec import LZMA_MIN_BYTES, ZLIB_MIN_BYTES, CodecError, decode, encode
+from iac_scanner.cache.files import FileBackend
+from iac_scanner.cache.flight import lock_path
+from iac_scanner.cache.memory import MemoryCache
+from iac_scanner.cache.remote import flush_uploads, remote_cache
+from iac_scanner.cache.server import CacheServer
+from iac_scanner.cache.sqlite import SqliteBackend
 
 
 class TestCacheKey:
@@ -51,6 +86,103 @@ class TestCacheKey:
         assert k1.digest() != k2.digest()
 
 
+_TF = """# --- main.tf ---
+resource "aws_s3_bucket" "logs" {
+  bucket = "logs  #1" # keep the name
+  acl    = "private"
+  policy = <<EOT
+{ "Version" :  "2012-10-17" }
+EOT
+}
+"""
+
+_TF_REFORMATTED = """# --- main.tf ---
+resource "aws_s3_bucket" "logs"{
+    bucket="logs  #1"
+  acl = "private"   // reworded comment
+  policy   = <<EOT
+{ "Version" :  "2012-10-17" }
+EOT
+}
+"""
+
+
+class TestCanonicalKeys:
+    def test_formatting_and_comments_do_not_change_the_key(self) -> None:
+        k1 = CacheKey("analysis", _TF, "openai", "gpt-4o", "v1", canonical="terraform")
+        k2 = CacheKey("analysis", _TF_REFORMATTED, "openai", "gpt-4o", "v1", canonical="terraform")
+        assert k1.digest() == k2.digest()
+
+    @pytest.mark.parametrize(
+        "edit",
+        [
+            ('"logs  #1"', '"logs #1"'),  # string literal
+            ('"2012-10-17" }', '"2012-10-17"  }'),  # heredoc body
+            ("# --- main.tf ---", "# --- other.tf ---"),  # file header
+            ('acl    = "private"\n', 'acl    = "private"\n\n'),  # line count
+        ],
+    )
+    def test_semantic_edits_change_the_key(self, edit: tuple[str, str]) -> None:
+        edited = _TF.replace(*edit)
+        assert edited != _TF
+        k1 = CacheKey("analysis", _TF, "openai", "gpt-4o", "v1", canonical="terraform")
+        k2 = CacheKey("analysis", edited, "openai", "gpt-4o", "v1", canonical="terraform")
+        assert k1.digest() != k2.digest()
+
+    @pytest.mark.parametrize(
+        ("a", "b"),
+        [
+            ('x = "${replace(var.name, "#", "")}"', 'x = "${replace(var.name, "#", "-")}"'),
+            ('x = "${format("%s  x", var.a)}"', 'x = "${format("%s x", var.a)}"'),
+            ('x = "%{ if var.on }#on%{ endif }"', 'x = "%{ if var.on }#off%{ endif }"'),
+        ],
+    )
+    def test_strings_nested_in_interpolations_are_kept(self, a: str, b: str) -> None:
+        assert canonicalize(a, "terraform") == a.replace(" = ", "=")
+        assert canonicalize(a, "terraform") != canonicalize(b, "terraform")
+
+    def test_cdk_template_interpolation_keeps_nested_strings(self) -> None:
+        a = 'const s = `${names.join("  // ")}` // note'
+        assert canonicalize(a, "cdk") == 'const s=`${names.join("  // ")}`'
+
+    @pytest.mark.parametrize(
+        "regex",
+        [r"dir.replace(/\/*$/, '')", r"url.replace(/^https?:\/\//, '')"],
+    )
+    def test_cdk_regex_literals_are_not_comments(self, regex: str) -> None:
+        def source(public: bool) -> str:
+            return f"const x = {regex}; new Bucket(this, 'B', {{ publicReadAccess: {str(public).lower()} }});\nlast();"
+
+        compact = regex.replace(", ", ",")
+        assert canonicalize(source(False), "cdk") == (
+            f"const x={compact};new Bucket(this,'B',{{publicReadAccess:false}});\nlast();"
+        )
+        assert canonicalize(source(False), "cdk") != canonicalize(source(True), "cdk")
+
+    def test_cdk_division_is_not_a_regex(self) -> None:
+        assert canonicalize("const half = total / 2; // note", "cdk") == "const half=total / 2;"
+
+    def test_canonical_form_keeps_line_numbers(self) -> None:
+        out = canonicalize(_TF, "terraform").split("\n")
+        assert len(out) == len(_TF.split("\n"))
+        assert out[0] == "# --- main.tf ---"
+        assert out[2] == 'bucket="logs  #1"'
+
+    def test_cdk_comments_and_template_literals(self) -> None:
+        src = "// --- index.ts ---\nconst s = `a\n  // kept`; /* gone */\nnew Bucket(this, 'B', { versioned: true });\n"
+        assert canonicalize(src, "cdk").split("\n") == [
+            "// --- index.ts ---",
+            "const s=`a",
+            "  // kept`;",
+            "new Bucket(this,'B',{versioned:true});",
+            "",
+        ]
+
+    def test_canonical_and_exact_keys_differ(self) -> None:
+        exact = CacheKey("analysis", _TF, "openai", "gpt-4o", "v1")
+        assert exact.digest() != CacheKey("analysis", _TF, "openai", "gpt-4o", "v1", canonical="terraform").digest()
+
+
 class TestGetPut:
     def test_roundtrip(self) -> None:
         key = CacheKey("analysis", "some code", "openai", "gpt-4o", "v1")
@@ -96,3 +228,467 @@ class TestCacheRoot:
         monkeypatch.delenv("IAC_CACHE_DIR", raising=False)
         monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
         assert cache_root() == tmp_path / "xdg" / "iac-scanner"
+
+
+class TestContentSha:
+    def test_sliced_hash_matches_whole_string_hash(self) -> None:
+        import hashlib
+
+        content = "résumé = true\n" * 100_000  # > 1 MiB, non-ASCII across slice boundaries
+        key = CacheKey("analysis", content, "openai", "gpt-4o", "v1")
+        assert key.content_sha == hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _key(i: int) -> CacheKey:
+    return CacheKey("analysis", f"code {i}", "openai", "gpt-4o", "v1")
+
+
+def _put_range(args: tuple[str, int, int]) -> None:
+    """Process-pool worker: write keys [start, stop) through the sqlite backend."""
+    import os
+
+    cache_dir, start, stop = args
+    os.environ["IAC_CACHE_DIR"] = cache_dir
+    os.environ["IAC_CACHE_BACKEND"] = "sqlite"
+    for i in range(start, stop):
+        put(_key(i), {"i": i})
+
+
+class TestSqliteBackend:
+    @pytest.fixture(autouse=True)
+    def _sqlite(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_CACHE_BACKEND", "sqlite")
+
+    def test_selected_by_env(self) -> None:
+        assert backend_name() == "sqlite"
+        assert isinstance(backend(), SqliteBackend)
+        put(_key(1), {"findings": []})
+        assert get(_key(1)) == {"findings": []}
+        assert (cache_root() / "cache.sqlite3").exists()
+
+    def test_unknown_backend_falls_back_to_files(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_CACHE_BACKEND", "redis")
+        assert backend_name() == "files"
+
+    def test_batch_get_and_put(self) -> None:
+        put_many({_key(i): i for i in range(1_200)})
+        found = get_many([_key(i) for i in range(0, 1_300, 100)])
+        assert found == {_key(i): i for i in range(0, 1_200, 100)}
+
+    def test_ttl(self) -> None:
+        put(_key(1), "v")
+        assert get(_key(1), ttl_seconds=0) is None
+        assert get(_key(1)) == "v"
+
+    def test_lru_eviction_keeps_recently_used(self, tmp_path: Path) -> None:
+        store = SqliteBackend(tmp_path / "c.sqlite3", max_bytes=10_000)
+        store.put_many({f"d{i}": "x" * 1_000 for i in range(5)})
+        # Make d0 the most recently used entry, then overflow the budget.
+        with sqlite3.connect(tmp_path / "c.sqlite3") as conn:
+            conn.execute("UPDATE entries SET accessed_at = accessed_at - 3600 WHERE digest != 'd0'")
+        store.put_many({f"n{i}": "x" * 1_000 for i in range(8)})
+        kept = store.get_many([f"d{i}" for i in range(5)] + [f"n{i}" for i in range(8)], DEFAULT_TTL_SECONDS)
+        assert "d0" in kept
+        assert sum(len(v) + 2 for _, v in kept.values()) <= 10_000
+        assert all(f"n{i}" in kept for i in range(8))
+
+    def test_hit_refreshes_access_time(self, tmp_path: Path) -> None:
+        path = tmp_path / "c.sqlite3"
+        store = SqliteBackend(path)
+        store.put("d", 1)
+        with sqlite3.connect(path) as conn:
+            conn.execute("UPDATE entries SET accessed_at = 0")
+        assert store.get("d", DEFAULT_TTL_SECONDS) == 1
+        with sqlite3.connect(path) as conn:
+            (accessed,) = conn.execute("SELECT accessed_at FROM entries").fetchone()
+        assert accessed > time.time() - 60
+
+    def test_corrupt_database_is_a_miss(self, tmp_path: Path) -> None:
+        path = tmp_path / "c.sqlite3"
+        path.write_bytes(b"not a database" * 100)
+        store = SqliteBackend(path)
+        store.put("d", 1)  # does not raise
+        assert store.get("d", DEFAULT_TTL_SECONDS) is None
+
+    def test_concurrent_threads(self) -> None:
+        def work(start: int) -> None:
+            for i in range(start, start + 50):
+                put(_key(i), i)
+                assert get(_key(i)) == i
+
+        threads = [threading.Thread(target=work, args=(n * 50,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(get_many([_key(i) for i in range(200)])) == 200
+
+    def test_concurrent_processes(self) -> None:
+        root = str(cache_root())
+        with ProcessPoolExecutor(max_workers=3) as pool:
+            list(pool.map(_put_range, [(root, n * 40, n * 40 + 40) for n in range(3)]))
+        assert len(get_many([_key(i) for i in range(120)])) == 120
+
+
+def _backdate(key: CacheKey, seconds: float) -> None:
+    """Make one entry look `seconds` older, whichever backend holds it."""
+    store = backend()
+    if isinstance(store, SqliteBackend):
+        with sqlite3.connect(store.path) as conn:
+            conn.execute(
+                "UPDATE entries SET stored_at = stored_at - ?, accessed_at = accessed_at - ? WHERE digest = ?",
+                (seconds, seconds, key.digest()),
+            )
+    else:
+        assert isinstance(store, FileBackend)
+        path = store.entry_path(key.digest())
+        mtime = path.stat().st_mtime - seconds
+        os.utime(path, (mtime, mtime))
+
+
+class TestMaintenance:
+    @pytest.fixture(autouse=True, params=["files", "sqlite"])
+    def _backend(self, request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_CACHE_BACKEND", request.param)
+        monkeypatch.setenv("IAC_CACHE_GC_INTERVAL", "0")
+
+    def test_stats_counts_entries_ages_and_hit_rate(self) -> None:
+        put_many({_key(i): "x" * 100 for i in range(3)})
+        _backdate(_key(0), 2 * 24 * 3600)
+        get(_key(1))
+        get_many([_key(2), _key(9)])
+        s = stats()
+        assert (s.entries, s.hits, s.misses) == (3, 2, 1)
+        assert s.bytes >= 300
+        assert s.hit_rate == pytest.approx(2 / 3)
+        assert s.ages["<1h"] == 2 and s.ages["<7d"] == 1
+
+    def test_gc_removes_expired_then_oldest_over_the_cap(self) -> None:
+        put_many({_key(i): "x" * 1_000 for i in range(4)})
+        _backdate(_key(0), DEFAULT_TTL_SECONDS + 60)
+        _backdate(_key(1), 3600)
+        result = gc(max_bytes=2_500)
+        assert result.removed == 2
+        assert set(get_many([_key(i) for i in range(4)])) == {_key(2), _key(3)}
+
+    def test_gc_expires_manifests(self) -> None:
+        manifest = cache_root() / "manifest" / "old.json"
+        manifest.parent.mkdir(parents=True)
+        manifest.write_text("{}")
+        os.utime(manifest, (0, 0))
+        assert gc().removed == 1
+        assert not manifest.exists()
+
+    def test_clear_removes_everything(self) -> None:
+        put_many({_key(i): i for i in range(3)})
+        get(_key(0))
+        index = cache_root() / "index" / "x.json"
+        index.parent.mkdir(parents=True)
+        index.write_text("{}")
+        assert clear() == 3
+        s = stats()
+        assert (s.entries, s.hits, s.misses) == (0, 0, 0)
+        assert not index.exists()
+
+
+class TestOpportunisticGc:
+    @pytest.fixture(autouse=True)
+    def _fresh_process(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(maintenance, "_gc_checked", set())
+
+    def _stamp(self, age: float) -> None:
+        stamp = cache_root() / ".last-gc"
+        stamp.parent.mkdir(parents=True, exist_ok=True)
+        stamp.touch()
+        os.utime(stamp, (time.time() - age, time.time() - age))
+
+    def test_runs_when_the_last_gc_is_stale(self) -> None:
+        self._stamp(0)
+        put(_key(0), "old")
+        _backdate(_key(0), DEFAULT_TTL_SECONDS + 60)
+        self._stamp(2 * maintenance.DEFAULT_GC_INTERVAL_SECONDS)
+        maintenance._gc_checked.clear()
+        put(_key(1), "new")
+        assert stats().entries == 1
+
+    def test_rate_limited_and_lock_respected(self) -> None:
+        self._stamp(0)
+        put(_key(0), "old")
+        _backdate(_key(0), DEFAULT_TTL_SECONDS + 60)
+        maintenance._gc_checked.clear()
+        put(_key(1), "new")  # stamp is fresh: no collection
+        assert stats().entries == 2
+        self._stamp(2 * maintenance.DEFAULT_GC_INTERVAL_SECONDS)
+        (cache_root() / ".gc.lock").touch()  # another process is collecting
+        maintenance._gc_checked.clear()
+        put(_key(2), "new")
+        assert stats().entries == 3
+
+    def test_disabled_by_zero_interval(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_CACHE_GC_INTERVAL", "0")
+        put(_key(0), "v")
+        assert not (cache_root() / ".last-gc").exists()
+
+
+class _Names(RootModel[list[str]]):
+    pass
+
+
+class TestMemoryCache:
+    def test_lru_eviction_by_bytes(self) -> None:
+        l1 = MemoryCache(max_bytes=30)
+        for name in "abc":
+            l1.put(name, name, 10)
+        assert l1.get("a", 60) == "a"  # a is now the most recently used
+        l1.put("d", "d", 10)
+        assert (l1.get("b", 60), len(l1), l1.bytes) == (None, 3, 30)
+
+    def test_oversized_value_is_not_kept_and_ttl_applies(self) -> None:
+        l1 = MemoryCache(max_bytes=30)
+        l1.put("big", "x", 31)
+        l1.put("k", "v", 1)
+        assert l1.get("big", 60) is None
+        assert l1.get("k", -1) is None
+        assert l1.bytes == 0
+
+
+class TestTwoTier:
+    def test_model_hit_skips_backend_and_validation(self) -> None:
+        names = _Names(["a", "b"])
+        put_model(_key(1), names)
+        with (
+            patch.object(backend(), "get_many", side_effect=AssertionError("disk read")),
+            patch.object(_Names, "model_validate", side_effect=AssertionError("validated")),
+        ):
+            assert get_model(_key(1), _Names) is names
+
+    def test_disk_hit_is_validated_once_then_served_from_memory(self) -> None:
+        put(_key(1), ["a"])
+        assert memory() is not None
+        memory().clear()  # type: ignore[union-attr]
+        first = get_model(_key(1), _Names)
+        assert first == _Names(["a"])
+        with patch.object(backend(), "get_many", side_effect=AssertionError("disk read")):
+            assert get_many_models([_key(1)], _Names) == {_key(1): first}
+
+    @pytest.mark.parametrize("backend_name", ["files", "sqlite"])
+    def test_memory_keeps_the_backend_entry_age(self, monkeypatch: pytest.MonkeyPatch, backend_name: str) -> None:
+        monkeypatch.setenv("IAC_CACHE_BACKEND", backend_name)
+        backend().put(_key(1).digest(), ["a"], stored_at=time.time() - DEFAULT_TTL_SECONDS + 60)
+        assert get_model(_key(1), _Names) == _Names(["a"])  # loaded into memory a minute before expiry
+        assert get_model(_key(1), _Names, ttl_seconds=DEFAULT_TTL_SECONDS - 120) is None
+
+    def test_invalid_entry_is_a_miss(self) -> None:
+        put(_key(1), {"not": "a list"})
+        assert get_model(_key(1), _Names) is None
+
+    def test_disabled_by_zero_budget(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_CACHE_MEMORY_BYTES", "0")
+        assert memory() is None
+        put(_key(1), "v")
+        assert get(_key(1)) == "v"
+
+    def test_clear_empties_memory(self) -> None:
+        put_model(_key(1), _Names(["a"]))
+        clear()
+        assert get_model(_key(1), _Names) is None
+
+
+class TestCodec:
+    @pytest.mark.parametrize(
+        ("value", "tag"),
+        [
+            ({"findings": []}, b"j"),
+            ("resource {}\n" * (ZLIB_MIN_BYTES // 8), b"z"),
+            ("resource {}\n" * (LZMA_MIN_BYTES // 8), b"x"),
+        ],
+    )
+    def test_roundtrip_picks_codec_by_size(self, value: object, tag: bytes) -> None:
+        blob = encode(value)
+        assert blob[:1] == tag
+        assert decode(blob) == value
+
+    def test_corrupt_blob_raises_codec_error(self) -> None:
+        with pytest.raises(CodecError):
+            decode(b"z" + b"not zlib")
+        with pytest.raises(CodecError):
+            decode(b"?{}")
+
+    @pytest.mark.parametrize("name", ["files", "sqlite"])
+    def test_backends_store_large_values_compressed(self, name: str, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_CACHE_BACKEND", name)
+        fixed = 'resource "aws_s3_bucket" "b" {}\n' * 2_000
+        put(_key(1), fixed)
+        memory().clear()  # type: ignore[union-attr]
+        assert get(_key(1)) == fixed
+        assert stats().bytes < len(fixed) // 10
+
+    def test_expired_entry_is_not_decoded(self) -> None:
+        store = FileBackend(cache_root())
+        store.put("d", "x" * 5_000)
+        with patch("iac_scanner.cache.files.decode", side_effect=AssertionError("decoded")):
+            assert store.get("d", ttl_seconds=-1) is None
+
+    def test_corrupt_file_entry_is_a_miss(self) -> None:
+        store = FileBackend(cache_root())
+        store.put("d", "v")
+        path = store.entry_path("d")
+        path.write_bytes(path.read_bytes()[:-1] + b"\xff")
+        assert store.get("d", DEFAULT_TTL_SECONDS) is None
+
+
+def _slow_compute(args: tuple[str, str]) -> tuple[str, bool]:
+    """Process-pool worker: compute_once on one shared key, logging every real computation."""
+    cache_dir, log = args
+    os.environ["IAC_CACHE_DIR"] = cache_dir
+
+    def compute() -> str:
+        with open(log, "a") as f:
+            f.write(f"{os.getpid()}\n")
+        time.sleep(0.5)
+        return "fixed code"
+
+    return compute_once(_key(1), compute)
+
+
+class TestAtomicWritesAndSingleFlight:
+    def test_failed_write_keeps_the_old_entry_and_no_temp_file(self) -> None:
+        put(_key(1), "old")
+        with patch("iac_scanner.cache.files.os.replace", side_effect=OSError("disk full")):
+            put(_key(1), "new")
+        memory().clear()  # type: ignore[union-attr]
+        assert get(_key(1)) == "old"
+        assert [p.name for p in cache_root().rglob("*.tmp")] == []
+
+    def test_gc_removes_stale_temp_files(self) -> None:
+        stale = cache_root() / "ab" / ".abc.entry.x.tmp"
+        stale.parent.mkdir(parents=True)
+        stale.write_bytes(b"partial")
+        os.utime(stale, (0, 0))
+        gc()
+        assert not stale.exists()
+
+    def test_concurrent_misses_compute_once(self, tmp_path: Path) -> None:
+        log = tmp_path / "computed.log"
+        with ProcessPoolExecutor(max_workers=3) as pool:
+            results = list(pool.map(_slow_compute, [(str(cache_root()), str(log))] * 3))
+        assert len(log.read_text().splitlines()) == 1
+        assert sorted(computed for _, computed in results) == [False, False, True]
+        assert {value for value, _ in results} == {"fixed code"}
+
+    def test_lock_of_a_dead_process_is_taken_over(self) -> None:
+        dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+        lock = lock_path(cache_root() / "locks", _key(1).digest())
+        lock.parent.mkdir(parents=True)
+        lock.write_text(f"{socket.gethostname()} {dead.stdout.strip()}\n")
+        assert compute_once(_key(1), lambda: "v") == ("v", True)
+        assert not lock.exists()
+
+    def test_failed_compute_releases_the_lock(self) -> None:
+        def boom() -> str:
+            raise RuntimeError("provider down")
+
+        with pytest.raises(RuntimeError):
+            compute_once(_key(1), boom)
+        assert compute_once(_key(1), lambda: "v") == ("v", True)
+        assert compute_once(_key(1), lambda: "other") == ("v", False)
+
+
+@pytest.fixture
+def cache_server(tmp_path: Path) -> Iterator[CacheServer]:
+    server = CacheServer(("127.0.0.1", 0), tmp_path / "server", token="s3cret")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+_real_connect = http.client.HTTPConnection.connect
+
+
+def _use_remote(monkeypatch: pytest.MonkeyPatch, server: CacheServer, token: str = "s3cret") -> None:
+    monkeypatch.setenv("IAC_CACHE_URL", f"http://127.0.0.1:{server.server_address[1]}/team")
+    monkeypatch.setenv("IAC_CACHE_TOKEN", token)
+
+
+class TestRemoteTier:
+    def test_write_back_then_read_through_on_another_machine(
+        self, cache_server: CacheServer, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        _use_remote(monkeypatch, cache_server)
+        put(_key(1), {"findings": ["x" * 2000]})
+        flush_uploads()
+        assert cache_server.store.read_blob(_key(1).digest(), DEFAULT_TTL_SECONDS) is not None
+
+        monkeypatch.setenv("IAC_CACHE_DIR", str(tmp_path / "other-machine"))
+        assert get(_key(1)) == {"findings": ["x" * 2000]}
+        monkeypatch.delenv("IAC_CACHE_URL")
+        memory().clear()  # type: ignore[union-attr]
+        assert get(_key(1)) == {"findings": ["x" * 2000]}  # stored locally by the read-through
+
+    def test_lookups_reuse_one_connection(self, cache_server: CacheServer, monkeypatch: pytest.MonkeyPatch) -> None:
+        _use_remote(monkeypatch, cache_server)
+        with patch.object(http.client.HTTPConnection, "connect", autospec=True, side_effect=_real_connect) as connect:
+            assert get_many([_key(i) for i in range(5)]) == {}
+        assert connect.call_count == 1
+
+    def test_rejected_token_switches_the_tier_off(
+        self, cache_server: CacheServer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        _use_remote(monkeypatch, cache_server, token="wrong")
+        assert get(_key(1)) is None
+        remote = remote_cache()
+        assert remote is not None and not remote.available()
+        with patch.object(remote, "_request", side_effect=AssertionError("request while down")):
+            assert get(_key(2)) is None
+            put(_key(2), "v")
+        assert get(_key(2)) == "v"  # the local tier is unaffected
+
+    def test_unreachable_server_never_blocks(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_CACHE_URL", "http://127.0.0.1:1")
+        monkeypatch.setenv("IAC_CACHE_REMOTE_TIMEOUT", "0.5")
+        start = time.monotonic()
+        assert get_many([_key(i) for i in range(20)]) == {}
+        put(_key(1), "v")
+        flush_uploads()
+        assert time.monotonic() - start < 2
+        assert get(_key(1)) == "v"
+
+    def test_stale_remote_entries_are_misses(self, cache_server: CacheServer, monkeypatch: pytest.MonkeyPatch) -> None:
+        _use_remote(monkeypatch, cache_server)
+        cache_server.store.write_blob(_key(1).digest(), encode("old"), stored_at=0)
+        assert get(_key(1)) is None
+
+    @pytest.mark.parametrize("backend_name", ["files", "sqlite"])
+    def test_remote_hits_keep_their_age_locally(
+        self, cache_server: CacheServer, monkeypatch: pytest.MonkeyPatch, backend_name: str
+    ) -> None:
+        monkeypatch.setenv("IAC_CACHE_BACKEND", backend_name)
+        _use_remote(monkeypatch, cache_server)
+        cache_server.store.write_blob(_key(1).digest(), encode("v"), stored_at=time.time() - 3600)
+        assert get(_key(1)) == "v"
+        monkeypatch.delenv("IAC_CACHE_URL")
+        memory().clear()  # type: ignore[union-attr]
+        assert get(_key(1), ttl_seconds=1800) is None  # an hour old locally too, not fresh
+        assert get(_key(1)) == "v"
+
+    @pytest.mark.parametrize(
+        ("path", "body", "status"),
+        [
+            ("/team/not-a-digest", b"jnull", 404),
+            (f"/team/{'a' * 64}", b"?garbage", 400),
+            (f"/team/{'a' * 64}", b"j" + b"0" * 100, 413),
+        ],
+    )
+    def test_server_rejects_bad_puts(self, tmp_path: Path, path: str, body: bytes, status: int) -> None:
+        server = CacheServer(("127.0.0.1", 0), tmp_path / "server", max_body_bytes=64)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+            conn.request("PUT", path, body=body)
+            assert conn.getresponse().status == status
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert FileBackend(tmp_path / "server").stats().entries == 0
@@ -0,0 +1,110 @@
+"""Tests for changes.py and `scan-tree --since`."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from iac_scanner.changes import GitDiffError, affected_roots, changed_paths
+from iac_scanner.cli import main
+from iac_scanner.discovery import discover_roots
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """Three Terraform roots; `prod` and `staging` use modules/vpc, which uses modules/subnet.
+
+    Module files are not named main.tf, so the modules are not discovered as roots themselves.
+    """
+    base = tmp_path / "repo"
+    files = {
+        "envs/prod/main.tf": 'module "vpc" {\n  source = "../../modules/vpc"\n}\n',
+        "envs/staging/main.tf": 'module "vpc" {\n  source = "../../modules/vpc"\n}\n',
+        "envs/dev/main.tf": 'resource "aws_s3_bucket" "dev" {}\n',
+        "modules/vpc/vpc.tf": 'module "subnet" {\n  source = "../subnet"\n}\n',
+        "modules/subnet/subnet.tf": 'resource "aws_subnet" "s" {}\n',
+    }
+    for rel, text in files.items():
+        (base / rel).parent.mkdir(parents=True, exist_ok=True)
+        (base / rel).write_text(text)
+    _git(base, "init", "-q")
+    _git(base, "-c", "user.email=t@example.com", "-c", "user.name=t", "add", ".")
+    _git(base, "-c", "user.email=t@example.com", "-c", "user.name=t", "commit", "-q", "-m", "base")
+    return base
+
+
+def _affected(repo: Path, since: str = "HEAD") -> list[str]:
+    roots = affected_roots(discover_roots(repo), changed_paths(repo, since))
+    return [s.base_path.relative_to(repo.resolve()).as_posix() for s in roots]
+
+
+class TestChangedPaths:
+    def test_clean_tree_has_no_changes(self, repo: Path) -> None:
+        assert changed_paths(repo, "HEAD") == []
+
+    def test_modified_deleted_and_untracked(self, repo: Path) -> None:
+        (repo / "envs/dev/main.tf").write_text('resource "aws_s3_bucket" "dev2" {}\n')
+        (repo / "modules/subnet/subnet.tf").unlink()
+        (repo / "envs/dev/extra.tf").write_text("")
+        rel = sorted(p.relative_to(repo.resolve()).as_posix() for p in changed_paths(repo / "envs", "HEAD"))
+        assert rel == ["envs/dev/extra.tf", "envs/dev/main.tf", "modules/subnet/subnet.tf"]
+
+    def test_unknown_ref_and_option_like_ref_raise(self, repo: Path) -> None:
+        with pytest.raises(GitDiffError):
+            changed_paths(repo, "no-such-branch")
+        with pytest.raises(GitDiffError):
+            changed_paths(repo, "--output=/tmp/x")
+
+    def test_outside_a_work_tree_raises(self, tmp_path: Path) -> None:
+        outside = tmp_path / "plain"
+        outside.mkdir()
+        with pytest.raises(GitDiffError):
+            changed_paths(outside, "HEAD")
+
+
+class TestAffectedRoots:
+    def test_root_file_change_selects_only_that_root(self, repo: Path) -> None:
+        (repo / "envs/dev/main.tf").write_text('resource "aws_s3_bucket" "dev2" {}\n')
+        assert _affected(repo) == ["envs/dev"]
+
+    def test_nested_module_change_selects_every_consumer(self, repo: Path) -> None:
+        (repo / "modules/subnet/subnet.tf").write_text('resource "aws_subnet" "s2" {}\n')
+        assert _affected(repo) == ["envs/prod", "envs/staging"]
+
+    def test_new_file_in_a_root_selects_it(self, repo: Path) -> None:
+        (repo / "envs/dev/outputs.tf").write_text('output "x" { value = 1 }\n')
+        assert _affected(repo) == ["envs/dev"]
+
+    def test_unrelated_change_selects_nothing(self, repo: Path) -> None:
+        (repo / "README.md").write_text("docs\n")
+        assert _affected(repo) == []
+
+
+class TestScanTreeSince:
+    def test_scans_only_affected_roots(self, repo: Path, tmp_path: Path) -> None:
+        (repo / "modules/vpc/vpc.tf").write_text('module "subnet" {\n  source = "../subnet"\n}\n# edit\n')
+        out = tmp_path / "out"
+        result = CliRunner().invoke(main, ["scan-tree", str(repo), "--scan-only", "--since", "HEAD", "-o", str(out)])
+        assert result.exit_code == 0, result.output
+        assert "Affected by changes since HEAD: 2 root(s)" in result.output
+        assert "Roots: 2 (0 failed)" in result.output
+
+    def test_nothing_affected_exits_0_without_scanning(self, repo: Path, tmp_path: Path) -> None:
+        result = CliRunner().invoke(main, ["scan-tree", str(repo), "--scan-only", "--since", "HEAD"])
+        assert result.exit_code == 0, result.output
+        assert "Nothing to scan." in result.output
+
+    def test_bad_ref_exits_1(self, repo: Path) -> None:
+        result = CliRunner().invoke(main, ["scan-tree", str(repo), "--scan-only", "--since", "nope"])
+        assert result.exit_code == 1
+        assert "git error" in result.output
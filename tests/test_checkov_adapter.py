@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+import os
+import textwrap
+from collections.abc import Iterator
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
 from iac_scanner.models import FindingSource, Severity
+from iac_scanner.rules import checkov as checkov_mod
 from iac_scanner.rules.checkov import (
+    CheckovError,
     CheckovNotInstalled,
+    CheckovTimeout,
+    CheckovWorker,
     _adapt_check,
     _cwe_hint,
     _extract_failed_checks,
@@ -122,3 +130,157 @@ class TestRunCheckovNotInstalled:
                 from pathlib import Path
 
                 run_checkov(Path("."), "terraform")
+
+
+_FAKE_CHECKOV = """
+import json, os, sys, time
+
+class Checkov:
+    def __init__(self, argv):
+        self.argv = argv
+
+    def run(self):
+        path = self.argv[self.argv.index("-d") + 1]
+        if path.endswith("hang"):
+            time.sleep(30)
+        if path.endswith("boom"):
+            raise ValueError("bad input")
+        os.write(1, b"stray write\\n")
+        check = {"check_id": "CKV_AWS_20", "check_name": f"pid {os.getpid()}", "severity": "HIGH",
+                 "file_path": "/main.tf", "file_line_range": [3, 5]}
+        print(json.dumps({"results": {"failed_checks": [check]}}))
+        sys.exit(1)
+"""
+
+
+@pytest.fixture
+def fake_checkov(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[CheckovWorker]:
+    """A stand-in `checkov` package, importable here and by the worker process; yields a fresh worker."""
+    pkg = tmp_path / "site" / "checkov"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "main.py").write_text(textwrap.dedent(_FAKE_CHECKOV))
+    monkeypatch.syspath_prepend(str(pkg.parent))
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(filter(None, [str(pkg.parent), os.environ.get("PYTHONPATH")])))
+    monkeypatch.setenv("IAC_CHECKOV_WORKER", "1")
+    worker = CheckovWorker()
+    monkeypatch.setattr(checkov_mod, "_worker", worker)
+    yield worker
+    worker.close()
+
+
+class TestCheckovWorker:
+    def test_scans_reuse_one_warm_process(self, fake_checkov: CheckovWorker) -> None:
+        first = run_checkov(Path("a"), "terraform")
+        second = run_checkov(Path("b"), "terraform")
+        assert [f.location for f in first] == ["main.tf:3"]
+        assert first[0].title == second[0].title == f"pid {fake_checkov.pid}"
+        assert fake_checkov.scans == 2
+
+    def test_timeout_stops_the_worker_and_the_next_scan_restarts_it(self, fake_checkov: CheckovWorker) -> None:
+        with pytest.raises(CheckovTimeout):
+            fake_checkov.scan(["-d", "hang"], timeout_seconds=1)
+        assert fake_checkov.pid is None
+        assert "CKV_AWS_20" in fake_checkov.scan(["-d", "ok"], timeout_seconds=30)
+        assert fake_checkov.scans == 1
+
+    def test_failed_scan_keeps_the_worker(self, fake_checkov: CheckovWorker) -> None:
+        fake_checkov.scan(["-d", "ok"], timeout_seconds=30)
+        pid = fake_checkov.pid
+        with pytest.raises(CheckovError, match="bad input"):
+            fake_checkov.scan(["-d", "boom"], timeout_seconds=30)
+        assert fake_checkov.pid == pid
+
+    def test_worker_failure_falls_back_to_the_command(self, fake_checkov: CheckovWorker) -> None:
+        with (
+            patch.object(fake_checkov, "scan", side_effect=CheckovError("worker exited")),
+            patch.object(checkov_mod, "_run_checkov_command", return_value="") as command,
+        ):
+            assert run_checkov(Path("a"), "terraform") == []
+        command.assert_called_once()
+
+    def test_disabled_without_the_env_var(self, fake_checkov: CheckovWorker, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("IAC_CHECKOV_WORKER")
+        assert checkov_mod.worker_enabled() is False
+
+
+_REPORT = (
+    '{"results": {"failed_checks": [{"check_id": "CKV_AWS_20", "check_name": "public ACL",'
+    ' "severity": "HIGH", "file_path": "/main.tf", "file_line_range": [1, 2]}]}}'
+)
+
+
+@pytest.fixture
+def checkov_command() -> Iterator[list[list[str]]]:
+    """Patch the Checkov command; yields the argument lists it was run with."""
+    calls: list[list[str]] = []
+
+    def fake_command(args: list[str], timeout_seconds: int) -> str:
+        calls.append(args)
+        return _REPORT
+
+    with (
+        patch.object(checkov_mod, "checkov_available", return_value=True),
+        patch.object(checkov_mod, "_run_checkov_command", side_effect=fake_command),
+    ):
+        yield calls
+
+
+def _root(path: Path, body: str = 'resource "aws_s3_bucket" "b" {}\n') -> Path:
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "main.tf").write_text(body)
+    return path
+
+
+class TestResultCache:
+    def test_unchanged_root_runs_checkov_once(self, tmp_path: Path, checkov_command: list[list[str]]) -> None:
+        root = _root(tmp_path / "root")
+        first = run_checkov(root, "terraform")
+        assert run_checkov(root, "terraform") == first
+        assert first[0].rule_id == "CKV_AWS_20"
+        assert len(checkov_command) == 1
+
+    def test_edited_file_or_new_checkov_misses(self, tmp_path: Path, checkov_command: list[list[str]]) -> None:
+        root = _root(tmp_path / "root")
+        run_checkov(root, "terraform")
+        (root / "terraform.tfvars").write_text('region = "eu-west-1"\n')  # read by Checkov, never by the LLM scan
+        run_checkov(root, "terraform")
+        with patch.object(checkov_mod, "checkov_version", return_value="99.0"):
+            run_checkov(root, "terraform")
+        run_checkov(root, "cdk")  # another --framework
+        assert len(checkov_command) == 4
+
+    def test_local_module_outside_root_is_part_of_the_key(
+        self, tmp_path: Path, checkov_command: list[list[str]]
+    ) -> None:
+        module = _root(tmp_path / "modules" / "vpc")
+        root = _root(tmp_path / "envs" / "prod", 'module "vpc" {\n  source = "../../modules/vpc"\n}\n')
+        run_checkov(root, "terraform")
+        (module / "main.tf").write_text('resource "aws_vpc" "v" {}\n')
+        run_checkov(root, "terraform")
+        assert len(checkov_command) == 2
+
+    def test_no_cache_always_runs(
+        self, tmp_path: Path, checkov_command: list[list[str]], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("IAC_NO_CACHE", "1")
+        root = _root(tmp_path / "root")
+        run_checkov(root, "terraform")
+        run_checkov(root, "terraform")
+        assert len(checkov_command) == 2
+
+    def test_batch_scans_only_the_misses(self, tmp_path: Path, checkov_command: list[list[str]]) -> None:
+        cached, fresh = _root(tmp_path / "cached"), _root(tmp_path / "fresh", 'resource "aws_sqs_queue" "q" {}\n')
+        run_checkov(cached, "terraform")
+        split = checkov_mod.run_checkov_batch([cached, fresh], "terraform")
+        assert [call[1] for call in checkov_command] == [str(cached), str(fresh)]
+        assert [f.rule_id for f in split[cached]] == [f.rule_id for f in split[fresh]] == ["CKV_AWS_20"]
+        assert checkov_mod.run_checkov_batch([cached, fresh], "terraform") == split
+        assert len(checkov_command) == 2
+
+    def test_version_needs_no_subprocess(self) -> None:
+        with (
+            patch.object(checkov_mod.shutil, "which", return_value=None),
+            patch.object(checkov_mod.subprocess, "run", side_effect=AssertionError("subprocess")),
+        ):
+            assert checkov_mod.checkov_version()
@@ -0,0 +1,244 @@
+"""Tests for orchestration/chunking.py and the chunked path through run_pipeline."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from iac_scanner.cost import CostBudgetExceeded, estimate
+from iac_scanner.models import Finding, FindingsList
+from iac_scanner.orchestration.chunking import (
+    ContentPiece,
+    approx_tokens,
+    chunk_token_budget,
+    plan_chunks,
+    plan_file_units,
+    rebase_location,
+    split_segment,
+)
+from iac_scanner.orchestration.runner import run_pipeline
+from iac_scanner.scanners._filters import DEFAULT_MAX_INPUT_BYTES, max_input_bytes
+from iac_scanner.scanners.base import ContentSegment, utf8_len
+from iac_scanner.scanners.terraform import TerraformScanner
+from tests.conftest import FakeLLMClient
+
+
+def _resource(i: int, body_lines: int = 20) -> str:
+    body = "".join(f'  tag_{j} = "value-{i}-{j}"\n' for j in range(body_lines))
+    return f'# bucket {i}\nresource "aws_s3_bucket" "b{i}" {{\n{body}}}\n\n'
+
+
+def _segment(text: str, name: str = "main.tf") -> ContentSegment:
+    return ContentSegment(path=Path(name), header=f"# --- {name} ---", text=text, nbytes=utf8_len(text))
+
+
+@dataclass
+class RecordingClient:
+    """Thread-safe analysis double: one finding at line 2 of every chunk it sees."""
+
+    provider: str = "openai"
+    model: str = "gpt-4o-mini"
+    seen: list[str] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def invoke_structured(self, prompt: Any, schema: type, variables: dict[str, Any]) -> Any:
+        with self._lock:
+            self.seen.append(variables["raw_content"])
+        first_file = variables["raw_content"].split("---")[1].strip()
+        return FindingsList(
+            root=[Finding(severity="low", title="t", description="d", location=f"{first_file}:2")]  # type: ignore[arg-type]
+        )
+
+    def invoke_text(self, prompt: Any, variables: dict[str, Any]) -> str:
+        raise AssertionError("fix must not run in chunked mode")
+
+
+class TestSplitting:
+    def test_small_file_is_one_piece(self) -> None:
+        pieces = split_segment(_segment(_resource(0)), budget=10_000)
+        assert len(pieces) == 1
+        assert pieces[0].start_line == 1
+
+    def test_large_file_splits_on_block_boundaries_with_comments(self) -> None:
+        text = "".join(_resource(i) for i in range(40))
+        pieces = split_segment(_segment(text), budget=1_000)
+        assert len(pieces) > 1
+        for piece in pieces:
+            assert piece.text.startswith("# bucket ")
+            assert approx_tokens(piece.render()) <= 1_000
+        # Pieces are contiguous and reassemble the file line-for-line.
+        lines = text.splitlines()
+        for piece in pieces:
+            n = len(piece.text.splitlines())
+            assert piece.text.splitlines() == lines[piece.start_line - 1 : piece.start_line - 1 + n]
+
+    def test_oversized_block_falls_back_to_line_splits(self) -> None:
+        pieces = split_segment(_segment(_resource(0, body_lines=2_000)), budget=1_000)
+        assert len(pieces) > 1
+        assert all(approx_tokens(p.render()) <= 1_000 for p in pieces)
+
+    def test_plan_packs_small_files_together(self) -> None:
+        segments = [_segment(_resource(i), name=f"f{i}.tf") for i in range(5)]
+        chunks = plan_chunks(segments, budget=10_000)
+        assert len(chunks) == 1
+        assert [p.label for p in chunks[0].pieces] == [f"f{i}.tf" for i in range(5)]
+
+    def test_plan_never_puts_two_pieces_of_one_file_in_a_chunk(self) -> None:
+        text = "".join(_resource(i) for i in range(40))
+        for chunk in plan_chunks([_segment(text)], budget=1_000):
+            assert len({p.label for p in chunk.pieces}) == len(chunk.pieces)
+
+    def test_budget_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_CHUNK_TOKENS", "5")
+        assert chunk_token_budget() == 1_000
+        monkeypatch.setenv("IAC_CHUNK_TOKENS", "nope")
+        assert chunk_token_budget() == 24_000
+
+
+class TestRebaseLocation:
+    pieces = [ContentPiece(label="main.tf", header="# --- main.tf ---", text="x", start_line=101)]
+
+    @pytest.mark.parametrize(
+        ("location", "expected"),
+        [
+            ("main.tf:5", "main.tf:105"),
+            ("main.tf:5-9", "main.tf:105-109"),
+            ("modules/main.tf:5 (aws_s3_bucket.b)", "modules/main.tf:105 (aws_s3_bucket.b)"),
+            ("variables.tf:5", "variables.tf:5"),
+            ("aws_s3_bucket.b", "aws_s3_bucket.b"),
+        ],
+    )
+    def test_rebase(self, location: str, expected: str) -> None:
+        assert rebase_location(location, self.pieces) == expected
+
+
+class TestChunkedPipeline:
+    @pytest.fixture
+    def big_root(self, tmp_path: Path) -> Path:
+        # ~215 KB: over the default 200 KB cap for single-call analysis.
+        (tmp_path / "main.tf").write_text("".join(_resource(i) for i in range(400)))
+        (tmp_path / "variables.tf").write_text('variable "x" {}\n')
+        return tmp_path
+
+    def test_oversize_input_is_analyzed_in_chunks(self, big_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_CHUNKED", "1")
+        client = RecordingClient()
+        result = run_pipeline(TerraformScanner(big_root), analysis_client=client, fix_client=client)  # type: ignore[arg-type]
+
+        chunks = result.scan_result.metadata["analysis_chunks"]
+        assert chunks > 1
+        assert len(client.seen) == chunks
+        assert result.fixed_code == ""
+        # Every chunk's `main.tf:2` maps to a distinct line of the original file.
+        main_locations = [f.location for f in result.findings if f.location.startswith("main.tf")]
+        assert len(set(main_locations)) == len(main_locations)
+        assert "main.tf:2" in main_locations
+
+    def test_editing_one_block_misses_only_one_chunk(self, big_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_CHUNKED", "1")
+        monkeypatch.setenv("IAC_CHUNK_TOKENS", "4000")
+        first = RecordingClient()
+        run_pipeline(TerraformScanner(big_root), analysis_client=first, skip_fix=True)  # type: ignore[arg-type]
+
+        main = big_root / "main.tf"
+        main.write_text(main.read_text().replace('"value-150-3"', '"changed"'))
+        second = RecordingClient()
+        result = run_pipeline(TerraformScanner(big_root), analysis_client=second, skip_fix=True)  # type: ignore[arg-type]
+
+        assert len(second.seen) == 1
+        assert "changed" in second.seen[0]
+        assert result.cache_hits == len(first.seen) - 1
+
+    def test_small_input_uses_the_single_call_path(
+        self, fake_analysis_client_with_findings: FakeLLMClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("IAC_CHUNKED", "1")
+        result = run_pipeline(
+            TerraformScanner(Path("samples/tf")), analysis_client=fake_analysis_client_with_findings, skip_fix=True
+        )
+        assert fake_analysis_client_with_findings.calls == 1
+        assert "analysis_chunks" not in result.scan_result.metadata
+
+    def test_chunked_mode_raises_the_default_input_cap(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        assert max_input_bytes() == DEFAULT_MAX_INPUT_BYTES
+        monkeypatch.setenv("IAC_CHUNKED", "1")
+        assert max_input_bytes() == 10 * 1024 * 1024
+        monkeypatch.setenv("IAC_MAX_INPUT_BYTES", "4096")
+        assert max_input_bytes() == 4096
+
+
+@dataclass
+class FixingClient(RecordingClient):
+    """RecordingClient that also answers fix calls, echoing the file under a marker."""
+
+    fixed: list[str] = field(default_factory=list)
+
+    def invoke_text(self, prompt: Any, variables: dict[str, Any]) -> str:
+        with self._lock:
+            self.fixed.append(variables["raw_content"])
+        return variables["raw_content"] + "\n# fixed"
+
+
+class TestGranularPipeline:
+    @pytest.fixture
+    def root(self, tmp_path: Path) -> Path:
+        for name in ("main.tf", "network.tf", "storage.tf"):
+            (tmp_path / name).write_text(_resource(0).replace("b0", name.split(".")[0]))
+        return tmp_path
+
+    def test_plan_file_units_never_packs_files(self) -> None:
+        units = plan_file_units([_segment("a = 1\n", "a.tf"), _segment("b = 1\n", "b.tf")])
+        assert [[c.render() for c in file_units] for file_units in units] == [
+            ["# --- a.tf ---\na = 1\n"],
+            ["# --- b.tf ---\nb = 1\n"],
+        ]
+
+    def test_editing_one_file_resends_only_that_file(self, root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_GRANULAR", "1")
+        first = FixingClient()
+        result = run_pipeline(TerraformScanner(root), analysis_client=first, fix_client=first)  # type: ignore[arg-type]
+        assert (len(first.seen), len(first.fixed)) == (3, 3)
+        assert result.scan_result.metadata["analysis_units"] == 3
+        assert sorted(f.location for f in result.findings) == ["main.tf:2", "network.tf:2", "storage.tf:2"]
+        assert result.fixed_code.count("# fixed") == 3
+        assert "# --- network.tf ---" in result.fixed_code
+
+        (root / "network.tf").write_text(_resource(1))
+        second = FixingClient()
+        again = run_pipeline(TerraformScanner(root), analysis_client=second, fix_client=second)  # type: ignore[arg-type]
+        assert len(second.seen) == len(second.fixed) == 1
+        assert "network.tf" in second.seen[0]
+        assert again.cache_hits == 4  # two analyses, two fixes
+        assert len(again.findings) == 3
+        assert again.fixed_code.count("# fixed") == 3
+
+    def test_fix_calls_count_towards_the_first_budget_check(self, root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_GRANULAR", "1")
+        client = FixingClient()
+        units = plan_file_units(TerraformScanner(root).scan().segments)
+        analyses = [
+            estimate(chunk.render(), provider=client.provider, model=client.model, call_kind="analysis")
+            for file_units in units
+            for chunk in file_units
+        ]
+        monkeypatch.setenv("IAC_MAX_SPEND_USD", f"{sum(e.usd_est for e in analyses) * 1.01:.10f}")
+        with pytest.raises(CostBudgetExceeded):
+            run_pipeline(TerraformScanner(root), analysis_client=client, fix_client=client)  # type: ignore[arg-type]
+        assert client.seen == []  # refused before any analysis was paid for
+
+    def test_single_file_root_shares_the_whole_root_key(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        (tmp_path / "main.tf").write_text(_resource(0))
+        run_pipeline(TerraformScanner(tmp_path), analysis_client=RecordingClient(), skip_fix=True)  # type: ignore[arg-type]
+        monkeypatch.setenv("IAC_GRANULAR", "1")
+        client = RecordingClient()
+        result = run_pipeline(TerraformScanner(tmp_path), analysis_client=client, skip_fix=True)  # type: ignore[arg-type]
+        assert client.seen == []
+        assert result.cache_hits == 1
+
+    def test_granular_mode_raises_the_default_input_cap(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_GRANULAR", "1")
+        assert max_input_bytes() == 10 * 1024 * 1024
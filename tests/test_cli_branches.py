@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import json
+import socket
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 from click.testing import CliRunner
 
+from iac_scanner import cache
 from iac_scanner.cli import _exit_code_for_findings, _resolve_provider, main
 from iac_scanner.cost import CostBudgetExceeded
 from iac_scanner.llm import ProviderError
@@ -149,6 +151,32 @@ class TestCliFailOn:
         assert result.exit_code == 0
 
 
+class TestCliChunkedSummary:
+    @pytest.mark.parametrize(("flags", "expected"), [([], " (fix step skipped)."), (["--no-fix"], ".")])
+    def test_skipped_fix_is_mentioned_only_when_requested(
+        self, tmp_path: Path, flags: list[str], expected: str
+    ) -> None:
+        mocked = PipelineResult(
+            scan_result=ScanResult(
+                iac_type="terraform",
+                entry_path=SAMPLES / "tf" / "main.tf",
+                raw_content="#",
+                metadata={"analysis_chunks": 3},
+            ),
+        )
+        with (
+            patch("iac_scanner.cli.auto_detect_provider", return_value="openai"),
+            patch("iac_scanner.cli.run_pipeline", return_value=mocked),
+        ):
+            result = CliRunner().invoke(
+                main,
+                ["scan", str(SAMPLES / "tf"), "-o", str(tmp_path / "out"), "--provider", "openai", *flags],
+                env={"OPENAI_API_KEY": "sk-test"},
+            )
+        assert result.exit_code == 0, result.output
+        assert f"Analyzed in 3 chunks{expected}\n" in result.output
+
+
 class TestCliRulesEngineRouting:
     def test_rules_engine_routes_through_hybrid(self, tmp_path: Path) -> None:
         out_dir = tmp_path / "out"
@@ -387,3 +415,46 @@ class TestCliReportWriting:
         assert data["iac_type"] == "terraform"
         assert "iac_scanner_version" in data
         assert "prompt_version" in data
+
+
+class TestCliCache:
+    def _fill(self, n: int) -> None:
+        for i in range(n):
+            cache.put(cache.CacheKey("analysis", f"code {i}", "openai", "gpt-4o", "v1"), {"i": i})
+
+    def test_stats_json(self) -> None:
+        self._fill(2)
+        cache.get(cache.CacheKey("analysis", "code 0", "openai", "gpt-4o", "v1"))
+        result = CliRunner().invoke(main, ["cache", "stats", "--json"])
+        assert result.exit_code == 0, result.output
+        data = json.loads(result.output)
+        assert (data["backend"], data["entries"], data["hits"], data["hit_rate"]) == ("files", 2, 1, 1.0)
+        assert data["ages"]["<1h"] == 2
+
+    def test_stats_text_and_gc(self) -> None:
+        self._fill(3)
+        result = CliRunner().invoke(main, ["cache", "stats"])
+        assert "Entries: 3" in result.output
+        assert "hit rate n/a" in result.output
+        result = CliRunner().invoke(main, ["cache", "gc", "--max-bytes", "1"])
+        assert result.exit_code == 0, result.output
+        assert "Removed 3 entries" in result.output
+
+    def test_clear_asks_unless_yes(self) -> None:
+        self._fill(2)
+        result = CliRunner().invoke(main, ["cache", "clear"], input="n\n")
+        assert result.exit_code == 1
+        assert cache.stats().entries == 2
+        result = CliRunner().invoke(main, ["cache", "clear", "--yes"])
+        assert result.exit_code == 0
+        assert "Removed 2 entries." in result.output
+        assert cache.stats().entries == 0
+
+    def test_serve_reports_a_busy_port(self) -> None:
+        with socket.socket() as busy:
+            busy.bind(("127.0.0.1", 0))
+            busy.listen()
+            port = busy.getsockname()[1]
+            result = CliRunner().invoke(main, ["cache", "serve", "--port", str(port)])
+        assert result.exit_code == 1
+        assert f"Cannot listen on 127.0.0.1:{port}" in result.output
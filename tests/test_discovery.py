@@ -0,0 +1,63 @@
+"""Tests for discovery.py — monorepo root discovery for `scan-tree`."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from iac_scanner.discovery import discover_roots
+
+
+def _tf(path: Path) -> None:
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "main.tf").write_text('resource "aws_s3_bucket" "b" {}')
+
+
+class TestDiscoverRoots:
+    def test_finds_nested_terraform_and_cdk_roots(self, tmp_path: Path) -> None:
+        _tf(tmp_path / "envs" / "prod")
+        _tf(tmp_path / "envs" / "dev")
+        (tmp_path / "apps" / "web").mkdir(parents=True)
+        (tmp_path / "apps" / "web" / "index.ts").write_text("// app")
+        roots = discover_roots(tmp_path)
+        found = {(s.iac_type, s.base_path.relative_to(tmp_path).as_posix()) for s in roots}
+        assert found == {
+            ("terraform", "envs/dev"),
+            ("terraform", "envs/prod"),
+            ("cdk", "apps/web"),
+        }
+
+    def test_results_are_sorted_by_path(self, tmp_path: Path) -> None:
+        for name in ("c", "a", "b"):
+            _tf(tmp_path / name)
+        roots = discover_roots(tmp_path)
+        assert [s.base_path.name for s in roots] == ["a", "b", "c"]
+
+    def test_never_enters_skip_list_directories(self, tmp_path: Path) -> None:
+        _tf(tmp_path / "stack")
+        _tf(tmp_path / "stack" / ".terraform" / "modules" / "vpc")
+        (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+        (tmp_path / "node_modules" / "pkg" / "index.js").write_text("// dep")
+        roots = discover_roots(tmp_path)
+        assert [s.base_path.relative_to(tmp_path).as_posix() for s in roots] == ["stack"]
+
+    def test_terraform_roots_may_nest(self, tmp_path: Path) -> None:
+        _tf(tmp_path)
+        _tf(tmp_path / "examples" / "basic")
+        assert len(discover_roots(tmp_path)) == 2
+
+    def test_cdk_root_owns_its_subdirectories(self, tmp_path: Path) -> None:
+        (tmp_path / "index.ts").write_text("// app")
+        (tmp_path / "lib" / "constructs").mkdir(parents=True)
+        (tmp_path / "lib" / "constructs" / "index.ts").write_text("export * from './bucket';")
+        roots = discover_roots(tmp_path)
+        assert [s.base_path for s in roots] == [tmp_path.resolve()]
+
+    def test_exclude_prunes_output_directory(self, tmp_path: Path) -> None:
+        _tf(tmp_path / "stack")
+        _tf(tmp_path / "scan-output" / "fixed")
+        roots = discover_roots(tmp_path, exclude=[tmp_path / "scan-output"])
+        assert [s.base_path.name for s in roots] == ["stack"]
+
+    def test_empty_tree_returns_nothing(self, tmp_path: Path) -> None:
+        (tmp_path / "README.md").write_text("nothing here")
+        assert discover_roots(tmp_path) == []
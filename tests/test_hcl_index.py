@@ -0,0 +1,103 @@
+"""Tests for scanners/hcl_index.py — streaming block index and its persistence."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from iac_scanner.scanners import hcl_index
+from iac_scanner.scanners.hcl_index import build_index, find_block, index_hcl
+from iac_scanner.scanners.terraform import TerraformScanner
+
+_TRICKY = """\
+# resource "commented" "out" {
+variable "region" {}
+
+resource "aws_s3_bucket" "logs" {
+  bucket = "logs-${var.region}-{literal}"
+  tags   = { Name = "${lookup(var.names, "k", "}")}" }
+  /* } a brace in a block comment
+     resource "nope" "nope" { */
+}
+
+data aws_iam_policy_document policy {
+  statement {
+    actions = ["s3:*"] // }
+  }
+}
+
+module "vpc" {
+  source = "../modules/vpc"
+  policy = <<-EOT
+    { "not": "a block" }
+    }
+  EOT
+}
+
+output "bucket" {
+  value = aws_s3_bucket.logs.id
+}
+"""
+
+
+class TestIndexHcl:
+    def test_finds_every_block_with_line_ranges(self) -> None:
+        blocks = index_hcl(_TRICKY, "main.tf")
+        assert [(b.address, b.start_line, b.end_line) for b in blocks] == [
+            ("var.region", 2, 2),
+            ("aws_s3_bucket.logs", 4, 9),
+            ("data.aws_iam_policy_document.policy", 11, 15),
+            ("module.vpc", 17, 23),
+            ("output.bucket", 25, 27),
+        ]
+        assert {b.file for b in blocks} == {"main.tf"}
+
+    def test_hash_changes_only_for_the_edited_block(self) -> None:
+        before = {b.address: b.sha256 for b in index_hcl(_TRICKY, "main.tf")}
+        after = {b.address: b.sha256 for b in index_hcl(_TRICKY.replace('"s3:*"', '"s3:Get*"'), "main.tf")}
+        assert [a for a in before if before[a] != after[a]] == ["data.aws_iam_policy_document.policy"]
+
+    def test_find_block(self) -> None:
+        blocks = index_hcl(_TRICKY, "main.tf")
+        found = find_block(blocks, "module.vpc")
+        assert found is not None and found.kind == "module" and found.name == "vpc"
+        assert find_block(blocks, "module.nope") is None
+
+
+class TestBuildIndex:
+    @pytest.fixture
+    def root(self, tmp_path: Path) -> Path:
+        (tmp_path / "main.tf").write_text(_TRICKY)
+        (tmp_path / "variables.tf").write_text('variable "x" {\n  default = 1\n}\n')
+        return tmp_path
+
+    def test_unchanged_files_are_not_reparsed(self, root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        files = sorted(root.glob("*.tf"))
+        first = build_index(root, files)
+
+        parsed: list[str] = []
+        real = hcl_index.index_hcl
+        monkeypatch.setattr(hcl_index, "index_hcl", lambda text, file: parsed.append(file) or real(text, file))
+        (root / "variables.tf").write_text('variable "x" {\n  default = 2\n}\n')
+        second = build_index(root, files)
+
+        assert parsed == ["variables.tf"]
+        assert [b.address for b in second] == [b.address for b in first]
+        assert second[-1].sha256 != first[-1].sha256
+
+    def test_no_cache_skips_persistence(self, root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_NO_CACHE", "1")
+        build_index(root, sorted(root.glob("*.tf")))
+        assert not hcl_index._index_path(root.resolve()).exists()
+
+    def test_corrupt_index_is_a_miss(self, root: Path) -> None:
+        files = sorted(root.glob("*.tf"))
+        build_index(root, files)
+        hcl_index._index_path(root.resolve()).write_text("{not json")
+        assert len(build_index(root, files)) == 6
+
+    def test_terraform_scan_carries_the_index(self, root: Path) -> None:
+        result = TerraformScanner(root).scan()
+        assert "aws_s3_bucket.logs" in {b.address for b in result.blocks}
+        assert {b.file for b in result.blocks} == {"main.tf", "variables.tf"}
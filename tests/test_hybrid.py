@@ -118,3 +118,18 @@ class TestRunHybridFallback:
         assert "CKV_AWS_20" in rule_ids
         # Original 2 LLM findings + 1 rule finding, no dupes
         assert len(result.findings) == 3
+
+    def test_precomputed_rule_findings_skip_the_engine(
+        self,
+        fake_analysis_client_with_findings: FakeLLMClient,
+    ) -> None:
+        scanner = create_scanner("samples/tf")
+        with patch("iac_scanner.orchestration.hybrid.run_rule_engine", side_effect=AssertionError("engine ran")):
+            result = run_hybrid_pipeline(
+                scanner,
+                engine="checkov",
+                skip_fix=True,
+                analysis_client=fake_analysis_client_with_findings,
+                rule_findings=[_rule(rule_id="CKV_AWS_20", title="S3 public ACL")],
+            )
+        assert len(result.findings) == 3
@@ -0,0 +1,217 @@
+"""Tests for fingerprint.py and orchestration/manifest.py (incremental scans)."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from iac_scanner.discovery import discover_roots
+from iac_scanner.fingerprint import FileFingerprint, fingerprint
+from iac_scanner.models import Finding, Severity
+from iac_scanner.orchestration.manifest import run_incremental, run_signature
+from iac_scanner.orchestration.runner import PipelineResult
+from iac_scanner.orchestration.tree import TreeOptions, run_tree_pipeline
+from iac_scanner.scanners.base import IacScanner
+from iac_scanner.scanners.terraform import TerraformScanner
+
+_HOUR_NS = 3600 * 10**9
+
+
+def _age(base: Path) -> None:
+    """Backdate every file and directory under `base` so their stats are trusted (not racy)."""
+    old = time.time_ns() - _HOUR_NS
+    for p in [base, *base.rglob("*")]:
+        os.utime(p, ns=(old, old))
+
+
+def _root(tmp_path: Path) -> Path:
+    # A subdirectory: the isolated cache dir also lives in tmp_path and would bump its mtime.
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "main.tf").write_text('resource "aws_s3_bucket" "logs" {}\n')
+    (root / "variables.tf").write_text('variable "region" {}\n')
+    _age(root)
+    return root
+
+
+class CountingRun:
+    """Pipeline double: scans for real, returns one finding, counts calls."""
+
+    def __init__(self, scanner: IacScanner) -> None:
+        self.scanner = scanner
+        self.calls = 0
+
+    def __call__(self) -> PipelineResult:
+        self.calls += 1
+        return PipelineResult(
+            scan_result=self.scanner.scan(),
+            findings=[Finding(severity=Severity.HIGH, title="t", description="d", location="main.tf:1")],
+        )
+
+
+_SIGNATURE = run_signature(provider="openai", skip_fix=True, rules_engine="none", follow_modules=None)
+
+
+class TestFingerprint:
+    def test_stat_match_skips_the_hash(self, tmp_path: Path) -> None:
+        f = tmp_path / "a.tf"
+        f.write_text("x")
+        _age(tmp_path)
+        first = fingerprint(f)
+        with patch("iac_scanner.fingerprint.sha256_file", side_effect=AssertionError("read")):
+            assert fingerprint(f, first, recorded_ns=time.time_ns()) is first
+
+    def test_racy_entry_is_rehashed(self, tmp_path: Path) -> None:
+        f = tmp_path / "a.tf"
+        f.write_text("x")
+        first = fingerprint(f)
+        # Same size and mtime, but recorded within the racy window: content may differ.
+        f.write_text("y")
+        os.utime(f, ns=(first.mtime_ns, first.mtime_ns))
+        assert fingerprint(f, first, recorded_ns=time.time_ns()).sha256 != first.sha256
+
+    def test_round_trip(self) -> None:
+        fp = FileFingerprint(size=1, mtime_ns=2, sha256="ab")
+        assert FileFingerprint.from_dict(fp.to_dict()) == fp
+        assert FileFingerprint.from_dict({"size": 1}) is None
+
+
+class TestRunIncremental:
+    def test_unchanged_root_is_replayed_without_reading_files(self, tmp_path: Path) -> None:
+        scanner = TerraformScanner(_root(tmp_path))
+        run = CountingRun(scanner)
+        first = run_incremental(scanner, run, _SIGNATURE)
+        assert first.scan_result.metadata["manifest"] == "new"
+
+        with (
+            patch("iac_scanner.fingerprint.sha256_file", side_effect=AssertionError("read")),
+            patch("iac_scanner.scanners.terraform.read_segments", side_effect=AssertionError("read")),
+        ):
+            replay = run_incremental(scanner, run, _SIGNATURE)
+        assert run.calls == 1
+        assert replay.scan_result.metadata["manifest"] == "unchanged"
+        assert [f.location for f in replay.findings] == ["main.tf:1"]
+        assert replay.scan_result.metadata["files"] == first.scan_result.metadata["files"]
+
+    def test_modified_added_and_removed_files_are_recorded(self, tmp_path: Path) -> None:
+        root = _root(tmp_path)
+        scanner = TerraformScanner(root)
+        run = CountingRun(scanner)
+        run_incremental(scanner, run, _SIGNATURE)
+
+        (root / "main.tf").write_text('resource "aws_s3_bucket" "logs" { acl = "public-read" }\n')
+        (root / "outputs.tf").write_text('output "x" { value = 1 }\n')
+        (root / "variables.tf").unlink()
+        result = run_incremental(scanner, run, _SIGNATURE)
+
+        assert run.calls == 2
+        assert result.scan_result.metadata["manifest"] == "changed"
+        assert result.scan_result.metadata["changed_files"] == {
+            "added": ["outputs.tf"],
+            "modified": ["main.tf"],
+            "removed": ["variables.tf"],
+        }
+
+    def test_touched_but_identical_file_is_still_replayed(self, tmp_path: Path) -> None:
+        root = _root(tmp_path)
+        scanner = TerraformScanner(root)
+        run = CountingRun(scanner)
+        run_incremental(scanner, run, _SIGNATURE)
+
+        old = time.time_ns() - _HOUR_NS // 2
+        os.utime(root / "main.tf", ns=(old, old))
+        assert run_incremental(scanner, run, _SIGNATURE).scan_result.metadata["manifest"] == "unchanged"
+        assert run.calls == 1
+
+    def test_fresh_checkout_is_replayed_after_relisting(self, tmp_path: Path) -> None:
+        root = _root(tmp_path)
+        scanner = TerraformScanner(root)
+        run = CountingRun(scanner)
+        run_incremental(scanner, run, _SIGNATURE)
+
+        # A new clone: identical content, every file and directory stamped anew, plus a non-input file.
+        for f in ("main.tf", "variables.tf"):
+            (root / f).write_text((root / f).read_text())
+        (root / "README.md").write_text("docs\n")
+        assert run_incremental(scanner, run, _SIGNATURE).scan_result.metadata["manifest"] == "unchanged"
+
+        (root / "outputs.tf").write_text('output "x" { value = 1 }\n')
+        result = run_incremental(scanner, run, _SIGNATURE)
+        assert result.scan_result.metadata["changed_files"]["added"] == ["outputs.tf"]
+        assert run.calls == 2
+
+    def test_different_settings_do_not_share_a_manifest(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        scanner = TerraformScanner(_root(tmp_path))
+        run = CountingRun(scanner)
+        run_incremental(scanner, run, _SIGNATURE)
+        run_incremental(
+            scanner, run, run_signature(provider="openai", skip_fix=False, rules_engine="none", follow_modules=None)
+        )
+        monkeypatch.setenv("IAC_ANALYSIS_MODEL", "gpt-4o")
+        run_incremental(
+            scanner, run, run_signature(provider="openai", skip_fix=True, rules_engine="none", follow_modules=None)
+        )
+        assert run.calls == 3
+
+    def test_upgrades_change_the_signature(self) -> None:
+        def sig() -> str:
+            return run_signature(provider="openai", skip_fix=False, rules_engine="auto", follow_modules=None)
+
+        with patch("iac_scanner.orchestration.manifest.checkov_available", return_value=True):
+            before = sig()
+            with patch("iac_scanner.orchestration.manifest.__version__", "999.0"):
+                assert sig() != before
+            with patch.dict("iac_scanner.llm.providers.DEFAULT_MODELS", {("openai", "fix"): "gpt-5"}):
+                assert sig() != before
+            with patch("iac_scanner.orchestration.manifest.checkov_version", return_value="checkov 99"):
+                assert sig() != before
+            assert sig() == before
+
+    def test_no_cache_always_runs(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_NO_CACHE", "1")
+        scanner = TerraformScanner(_root(tmp_path))
+        run = CountingRun(scanner)
+        run_incremental(scanner, run, _SIGNATURE)
+        result = run_incremental(scanner, run, _SIGNATURE)
+        assert run.calls == 2
+        assert "manifest" not in result.scan_result.metadata
+
+    def test_failed_run_is_not_recorded(self, tmp_path: Path) -> None:
+        scanner = TerraformScanner(_root(tmp_path))
+
+        def boom() -> PipelineResult:
+            raise RuntimeError("provider down")
+
+        with pytest.raises(RuntimeError):
+            run_incremental(scanner, boom, _SIGNATURE)
+        run = CountingRun(scanner)
+        assert run_incremental(scanner, run, _SIGNATURE).scan_result.metadata["manifest"] == "new"
+
+
+class TestTreeManifest:
+    def test_second_tree_run_only_reruns_changed_roots(self, tmp_path: Path) -> None:
+        base = tmp_path / "repo"
+        for name in ("alpha", "beta", "gamma"):
+            d = base / "envs" / name
+            d.mkdir(parents=True)
+            (d / "main.tf").write_text(f'resource "aws_s3_bucket" "{name}" {{}}\n')
+        _age(base)
+        calls: list[str] = []
+
+        def fake(scanner: IacScanner, **_: object) -> PipelineResult:
+            calls.append(scanner.base_path.name)
+            return PipelineResult(scan_result=scanner.scan())
+
+        options = TreeOptions(provider="openai")
+        with patch("iac_scanner.orchestration.tree.run_pipeline", side_effect=fake):
+            run_tree_pipeline(base, discover_roots(base), options=options)
+            (base / "envs" / "beta" / "main.tf").write_text('resource "aws_s3_bucket" "beta2" {}\n')
+            tree = run_tree_pipeline(base, discover_roots(base), options=options)
+
+        assert calls == ["alpha", "beta", "gamma", "beta"]
+        states = {r.root.name: r.result.scan_result.metadata["manifest"] for r in tree.roots if r.result}
+        assert states == {"alpha": "unchanged", "beta": "changed", "gamma": "unchanged"}
@@ -4,6 +4,10 @@ from __future__ import annotations
 
 import json
 import subprocess
+import sys
+import textwrap
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -14,10 +18,12 @@ from iac_scanner.rules import (
     RuleEngineError,
     RuleEngineNotInstalled,
     available_engines,
+    invalidate_engines,
     is_available,
     run_rule_engine,
+    run_rule_engine_batch,
 )
-from iac_scanner.rules.checkov import CheckovError, CheckovNotInstalled, run_checkov
+from iac_scanner.rules.checkov import CheckovError, CheckovNotInstalled, run_checkov, run_checkov_batch
 
 # ---- Fixture: a minimal Checkov JSON payload ----
 
@@ -104,6 +110,57 @@ class TestAvailableEngines:
             assert available_engines() == []
 
 
+class TestEngineRegistry:
+    def _entry_point(self, name: str) -> MagicMock:
+        ep = MagicMock()
+        ep.name = name
+        ep.load.return_value = lambda p, t: []
+        return ep
+
+    def test_plugins_load_once_per_process(self) -> None:
+        ep = self._entry_point("cdk-nag")
+        with (
+            patch("iac_scanner.rules.engine.checkov_available", return_value=False),
+            patch("iac_scanner.rules.engine.entry_points", return_value=[ep]) as eps,
+        ):
+            assert is_available("cdk-nag") is True
+            assert is_available("auto") is True
+            assert available_engines() == ["cdk-nag"]
+            run_rule_engine(Path("."), "cdk", engine="cdk-nag")
+        assert eps.call_count == 1
+        assert ep.load.call_count == 1
+
+    def test_invalidate_rediscovers(self) -> None:
+        with patch("iac_scanner.rules.engine.entry_points", return_value=[]) as eps:
+            assert is_available("cdk-nag") is False
+            eps.return_value = [self._entry_point("cdk-nag")]
+            assert is_available("cdk-nag") is False  # still the remembered answer
+            invalidate_engines()
+            assert is_available("cdk-nag") is True
+
+    def test_changed_installation_rediscovers(self) -> None:
+        with (
+            patch("iac_scanner.rules.registry.environment_stamp", return_value=(("site", 1),)) as stamp,
+            patch("iac_scanner.rules.engine.entry_points", return_value=[]) as eps,
+        ):
+            assert is_available("cdk-nag") is False
+            eps.return_value = [self._entry_point("cdk-nag")]
+            stamp.return_value = (("site", 2),)
+            assert is_available("cdk-nag") is True
+        assert eps.call_count == 2
+
+    def test_checkov_probe_is_remembered_per_path(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        with patch("iac_scanner.rules.checkov.shutil.which", return_value="/usr/local/bin/checkov") as which:
+            assert is_available("checkov") is True
+            assert is_available("checkov") is True
+            assert which.call_count == 1
+            monkeypatch.setenv("PATH", "/elsewhere")
+            which.return_value = None
+            with patch("iac_scanner.rules.checkov.importlib.util.find_spec", return_value=None):
+                assert is_available("checkov") is False
+        assert which.call_count == 2
+
+
 class TestPluginDispatch:
     def _plugin_finding(self) -> Finding:
         return Finding(
@@ -175,6 +232,70 @@ class TestPluginDispatch:
             # Should not raise — auto mode tolerates plugin failures
             assert run_rule_engine(Path("."), "cdk", engine="auto") == []
 
+    def test_auto_runs_engines_concurrently_in_engine_order(self) -> None:
+        both_running = threading.Barrier(2, timeout=5)
+        first, second = self._plugin_finding(), self._plugin_finding()
+
+        def slow(path: Path, iac_type: str) -> list[Finding]:
+            both_running.wait()  # deadlocks if the plugins ran one after another
+            time.sleep(0.05)
+            return [first]
+
+        def fast(path: Path, iac_type: str) -> list[Finding]:
+            both_running.wait()
+            return [second]
+
+        with (
+            patch("iac_scanner.rules.engine.checkov_available", return_value=False),
+            patch("iac_scanner.rules.engine._discover_plugins", return_value={"slow": slow, "fast": fast}),
+        ):
+            result = run_rule_engine(Path("."), "cdk", engine="auto")
+        assert result[0] is first
+        assert result[1] is second
+
+    def test_auto_skips_plugins_past_the_timeout(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_RULE_ENGINE_TIMEOUT", "1")
+        release = threading.Event()
+        finding = self._plugin_finding()
+
+        def hung(path: Path, iac_type: str) -> list[Finding]:
+            release.wait(10)
+            return [finding]
+
+        started = time.monotonic()
+        try:
+            with (
+                patch("iac_scanner.rules.engine.checkov_available", return_value=False),
+                patch(
+                    "iac_scanner.rules.engine._discover_plugins",
+                    return_value={"hung": hung, "ok": lambda p, t: [finding]},
+                ),
+            ):
+                assert run_rule_engine(Path("."), "cdk", engine="auto") == [finding]
+        finally:
+            release.set()
+        assert time.monotonic() - started < 5
+
+    def test_hung_plugin_does_not_block_interpreter_exit(self) -> None:
+        script = textwrap.dedent(
+            """
+            import os, threading
+            from pathlib import Path
+            from unittest.mock import patch
+            from iac_scanner.rules.engine import run_rule_engine
+
+            os.environ["IAC_RULE_ENGINE_TIMEOUT"] = "1"
+            hung = lambda path, iac_type: threading.Event().wait() or []
+            with (
+                patch("iac_scanner.rules.engine.checkov_available", return_value=False),
+                patch("iac_scanner.rules.engine._discover_plugins", return_value={"hung": hung}),
+            ):
+                assert run_rule_engine(Path("."), "cdk", engine="auto") == []
+            """
+        )
+        done = subprocess.run([sys.executable, "-c", script], timeout=30, check=False)
+        assert done.returncode == 0
+
 
 class TestRunRuleEngine:
     def test_engine_none_returns_empty(self) -> None:
@@ -328,3 +449,77 @@ class TestRunCheckovErrorPaths:
             ),
         ):
             assert run_checkov(tmp_path, "terraform") == []
+
+
+def _check(check_id: str, root: Path, rel: str) -> dict[str, object]:
+    return {
+        "check_id": check_id,
+        "check_name": check_id,
+        "severity": "HIGH",
+        "file_path": f"/{rel}",
+        "file_abs_path": str(root / rel),
+        "file_line_range": [1, 2],
+    }
+
+
+class TestRunCheckovBatch:
+    def test_one_invocation_split_per_root(self, tmp_path: Path) -> None:
+        outer, inner, other = tmp_path / "outer", tmp_path / "outer" / "inner", tmp_path / "other"
+        payload = {
+            "results": {
+                "failed_checks": [
+                    _check("CKV_AWS_1", outer, "main.tf"),
+                    _check("CKV_AWS_2", outer, "inner/main.tf"),  # nested root, seen from the outer scan
+                    _check("CKV_AWS_3", inner, "main.tf"),
+                    _check("CKV_AWS_4", other, "main.tf"),
+                ]
+            }
+        }
+        calls: list[list[str]] = []
+
+        def fake_run(cmd: list[str], **kwargs: object) -> MagicMock:
+            calls.append(cmd)
+            return _fake_proc(json.dumps(payload))
+
+        with (
+            patch("iac_scanner.rules.checkov.checkov_available", return_value=True),
+            patch("iac_scanner.rules.checkov.shutil.which", return_value="/usr/local/bin/checkov"),
+            patch("iac_scanner.rules.checkov.subprocess.run", side_effect=fake_run),
+        ):
+            split = run_checkov_batch([outer, inner, other], "terraform")
+        assert len(calls) == 1
+        assert calls[0].count("-d") == 3
+        assert {root: [f.rule_id for f in found] for root, found in split.items()} == {
+            outer: ["CKV_AWS_1", "CKV_AWS_2"],
+            inner: ["CKV_AWS_3"],
+            other: ["CKV_AWS_4"],
+        }
+        assert split[outer][1].location == "inner/main.tf:1"
+
+    def test_unplaceable_result_falls_back_to_one_run_per_root(self, tmp_path: Path) -> None:
+        a, b = tmp_path / "a", tmp_path / "b"
+        with (
+            patch("iac_scanner.rules.checkov.checkov_available", return_value=True),
+            patch("iac_scanner.rules.checkov.shutil.which", return_value="/usr/local/bin/checkov"),
+            patch("iac_scanner.rules.checkov.subprocess.run", return_value=_fake_proc(json.dumps(CHECKOV_PAYLOAD))),
+            patch("iac_scanner.rules.checkov._scan", return_value=[]) as single,
+        ):
+            assert run_checkov_batch([a, b], "terraform") == {a: [], b: []}
+        assert [c.args[0] for c in single.call_args_list] == [a, b]
+
+    def test_auto_adds_plugin_findings_per_root(self, tmp_path: Path) -> None:
+        a, b = tmp_path / "a", tmp_path / "b"
+        plugin_finding = Finding(
+            severity=Severity.LOW, title="nag", description="d", location="index.ts", source=FindingSource.CDK_NAG
+        )
+        with (
+            patch("iac_scanner.rules.engine.checkov_available", return_value=True),
+            patch("iac_scanner.rules.engine.run_checkov_batch", return_value={a: [], b: []}) as batch,
+            patch("iac_scanner.rules.engine._discover_plugins", return_value={"nag": lambda p, t: [plugin_finding]}),
+        ):
+            split = run_rule_engine_batch([a, b], "cdk", engine="auto")
+        batch.assert_called_once_with([a, b], "cdk")
+        assert split == {a: [plugin_finding], b: [plugin_finding]}
+
+    def test_none_engine_returns_empty_lists(self, tmp_path: Path) -> None:
+        assert run_rule_engine_batch([tmp_path], "terraform", engine="none") == {tmp_path: []}
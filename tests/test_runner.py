@@ -6,8 +6,12 @@ real LLM API. They exercise cache, cost estimation, and PipelineResult wiring.
 
 from __future__ import annotations
 
+from pathlib import Path
+from unittest.mock import patch
+
 import pytest
 
+from iac_scanner import cache
 from iac_scanner.factory import create_scanner
 from iac_scanner.orchestration.runner import _serialize_findings, run_pipeline
 from tests.conftest import FakeLLMClient
@@ -82,6 +86,39 @@ class TestRunPipeline:
         )
         assert fake_analysis_client_with_findings.calls == first_calls
 
+    def test_cached_analysis_is_looked_up_once_and_served_from_memory(
+        self,
+        fake_analysis_client_with_findings: FakeLLMClient,
+    ) -> None:
+        scanner = create_scanner("samples/tf")
+        run_pipeline(scanner, analysis_client=fake_analysis_client_with_findings, skip_fix=True)
+        with (
+            patch("iac_scanner.orchestration.runner.cache_get_model", wraps=cache.get_model) as lookup,
+            patch.object(cache.backend(), "get_many", side_effect=AssertionError("disk read")),
+        ):
+            result = run_pipeline(scanner, analysis_client=fake_analysis_client_with_findings, skip_fix=True)
+        assert lookup.call_count == 1
+        assert result.cache_hits == 1
+        assert result.cost_estimates == []
+        assert fake_analysis_client_with_findings.calls == 1
+
+    def test_canonical_keys_reuse_analysis_after_reformat(
+        self,
+        fake_analysis_client_with_findings: FakeLLMClient,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        monkeypatch.setenv("IAC_CANONICAL_KEYS", "1")
+        main = tmp_path / "main.tf"
+        main.write_text('resource "aws_s3_bucket" "b" {\n  bucket = "logs"\n}\n', encoding="utf-8")
+        run_pipeline(create_scanner(str(tmp_path)), analysis_client=fake_analysis_client_with_findings, skip_fix=True)
+        main.write_text('resource "aws_s3_bucket" "b" {\n    bucket="logs" # fmt\n}\n', encoding="utf-8")
+        result = run_pipeline(
+            create_scanner(str(tmp_path)), analysis_client=fake_analysis_client_with_findings, skip_fix=True
+        )
+        assert result.cache_hits == 1
+        assert fake_analysis_client_with_findings.calls == 1
+
     def test_no_cache_env_bypasses_cache(
         self,
         fake_analysis_client_with_findings: FakeLLMClient,
@@ -11,6 +11,7 @@ from click.testing import CliRunner
 from iac_scanner.cli import main
 from iac_scanner.models import Finding, FindingSource, Severity
 from iac_scanner.output.sarif import _parse_location, build_sarif, write_sarif
+from iac_scanner.scanners.hcl_index import index_hcl
 
 SAMPLES = Path(__file__).parent.parent / "samples"
 
@@ -136,6 +137,19 @@ class TestBuildSarif:
         uri = sarif["runs"][0]["results"][0]["locations"][0]["physicalLocation"]["artifactLocation"]["uri"]
         assert uri == "main.tf"
 
+    def test_resource_address_resolves_through_block_index(self) -> None:
+        blocks = index_hcl('variable "x" {}\n\nresource "aws_s3_bucket" "x" {\n  acl = "public-read"\n}\n', "s3.tf")
+        sarif = build_sarif(
+            [_f(location="resource aws_s3_bucket.x")],
+            tool_version="1.0.0",
+            entry_path="/abs/path/main.tf",
+            iac_type="terraform",
+            blocks=blocks,
+        )
+        physical = sarif["runs"][0]["results"][0]["locations"][0]["physicalLocation"]
+        assert physical["artifactLocation"]["uri"] == "s3.tf"
+        assert physical["region"] == {"startLine": 3, "endLine": 5}
+
 
 class TestWriteSarif:
     def test_writes_valid_json_to_disk(self, tmp_path: Path) -> None:
@@ -0,0 +1,168 @@
+"""Tests for local Terraform module following (scanners/tf_modules.py + runner/tree wiring)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from iac_scanner.cost import CostBudgetExceeded, estimate
+from iac_scanner.discovery import discover_roots
+from iac_scanner.models import Finding, FindingsList, Severity
+from iac_scanner.orchestration.runner import PipelineResult, run_pipeline
+from iac_scanner.orchestration.tree import TreeOptions, run_tree_pipeline
+from iac_scanner.scanners.base import IacScanner
+from iac_scanner.scanners.terraform import TerraformModuleScanner, TerraformScanner
+from iac_scanner.scanners.tf_modules import resolve_local_modules
+from tests.conftest import FakeLLMClient
+
+_VPC = 'resource "aws_vpc" "this" {\n  cidr_block = "10.0.0.0/16"\n}\n'
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def _tree(tmp_path: Path) -> Path:
+    """envs/{prod,dev} both use modules/vpc; vpc uses modules/subnet; plus a registry module."""
+    for env in ("prod", "dev"):
+        _write(
+            tmp_path / "envs" / env / "main.tf",
+            'module "vpc" {\n  source = "../../modules/vpc"\n}\n'
+            'module "remote" {\n  source = "terraform-aws-modules/vpc/aws"\n}\n',
+        )
+    _write(tmp_path / "modules" / "vpc" / "main.tf", _VPC + 'module "subnet" {\n  source = "../subnet"\n}\n')
+    _write(tmp_path / "modules" / "subnet" / "main.tf", 'module "back" {\n  source = "../vpc"\n}\n')
+    return tmp_path
+
+
+class TestResolveLocalModules:
+    def test_follows_local_sources_recursively_once_each(self, tmp_path: Path) -> None:
+        base = _tree(tmp_path)
+        modules = resolve_local_modules(base / "envs" / "prod")
+        assert [m.path for m in modules] == [
+            (base / "modules" / "vpc").resolve(),
+            (base / "modules" / "subnet").resolve(),
+        ]
+
+    def test_missing_directory_is_skipped(self, tmp_path: Path) -> None:
+        _write(tmp_path / "main.tf", 'module "gone" {\n  source = "./nope"\n}\n')
+        assert resolve_local_modules(tmp_path) == []
+
+    def test_identical_copies_share_a_content_hash(self, tmp_path: Path) -> None:
+        _write(tmp_path / "main.tf", 'module "a" {\n  source = "./a"\n}\nmodule "b" {\n  source = "./b"\n}\n')
+        _write(tmp_path / "a" / "main.tf", _VPC)
+        _write(tmp_path / "b" / "main.tf", _VPC)
+        a, b = resolve_local_modules(tmp_path)
+        assert a.sha256 == b.sha256
+
+    def test_module_scanner_reads_every_tf_file(self, tmp_path: Path) -> None:
+        _write(tmp_path / "vpc.tf", _VPC)
+        _write(tmp_path / "outputs.tf", 'output "id" {\n  value = aws_vpc.this.id\n}\n')
+        result = TerraformModuleScanner(tmp_path).scan()
+        assert len(result.segments) == 2
+        assert {b.address for b in result.blocks} == {"aws_vpc.this", "output.id"}
+
+
+class TestRunPipelineFollowsModules:
+    def test_module_findings_are_attached_with_root_relative_locations(
+        self, tmp_path: Path, fake_analysis_client_with_findings: FakeLLMClient
+    ) -> None:
+        base = _tree(tmp_path)
+        result = run_pipeline(
+            TerraformScanner(base / "envs" / "prod"),
+            analysis_client=fake_analysis_client_with_findings,
+            skip_fix=True,
+        )
+        # root + vpc + subnet, each analyzed once
+        assert fake_analysis_client_with_findings.calls == 3
+        locations = [f.location for f in result.findings]
+        assert "main.tf:10" in locations
+        assert "../../modules/vpc/main.tf:10" in locations
+        assert "../../modules/subnet/main.tf:25" in locations
+        assert [row["path"] for row in result.scan_result.metadata["modules"]] == [
+            "../../modules/vpc",
+            "../../modules/subnet",
+        ]
+
+    def test_identical_module_copies_are_analyzed_once(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("IAC_NO_CACHE", "1")
+        _write(tmp_path / "main.tf", 'module "a" {\n  source = "./a"\n}\nmodule "b" {\n  source = "./b"\n}\n')
+        _write(tmp_path / "a" / "main.tf", _VPC)
+        _write(tmp_path / "b" / "main.tf", _VPC)
+        client = FakeLLMClient(_structured_response=FindingsList(root=[]))
+        result = run_pipeline(TerraformScanner(tmp_path), analysis_client=client, skip_fix=True)
+        assert client.calls == 2  # root + one analysis for both copies
+        assert len(result.scan_result.metadata["modules"]) == 2
+
+    def test_modules_count_towards_the_root_budget_check(
+        self, tmp_path: Path, fake_analysis_client_with_findings: FakeLLMClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        base = _tree(tmp_path)
+        root = TerraformScanner(base / "envs" / "prod")
+        client = fake_analysis_client_with_findings
+        alone = estimate(root.scan().raw_content, provider=client.provider, model=client.model, call_kind="analysis")
+        monkeypatch.setenv("IAC_MAX_SPEND_USD", f"{alone.usd_est * 1.01:.10f}")
+        with pytest.raises(CostBudgetExceeded):
+            run_pipeline(root, analysis_client=client, skip_fix=True)
+        assert client.calls == 0  # refused before the root's analysis was paid for
+
+    def test_no_modules_env_disables_following(
+        self, tmp_path: Path, fake_analysis_client_empty: FakeLLMClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("IAC_NO_MODULES", "1")
+        base = _tree(tmp_path)
+        result = run_pipeline(
+            TerraformScanner(base / "envs" / "prod"), analysis_client=fake_analysis_client_empty, skip_fix=True
+        )
+        assert fake_analysis_client_empty.calls == 1
+        assert "modules" not in result.scan_result.metadata
+
+
+class TestTreeSharesModules:
+    def test_shared_module_is_analyzed_once_per_tree(self, tmp_path: Path) -> None:
+        base = _tree(tmp_path)
+        roots = [TerraformScanner(base / "envs" / "dev"), TerraformScanner(base / "envs" / "prod")]
+        analyzed: list[str] = []
+
+        def fake(scanner: IacScanner, **kwargs: object) -> PipelineResult:
+            assert kwargs["follow_modules"] is False
+            analyzed.append(scanner.base_path.name)
+            finding = Finding(
+                severity=Severity.LOW, title=scanner.base_path.name, description="d", location="main.tf:1"
+            )
+            return PipelineResult(scan_result=scanner.scan(), findings=[finding])
+
+        with patch("iac_scanner.orchestration.tree.run_pipeline", side_effect=fake):
+            tree = run_tree_pipeline(base, roots, options=TreeOptions(provider="openai"))
+
+        assert sorted(analyzed) == ["dev", "prod", "subnet", "vpc"]
+        assert [f.location for f in tree.findings] == [
+            "envs/dev/main.tf:1",
+            "modules/vpc/main.tf:1",
+            "modules/subnet/main.tf:1",
+            "envs/prod/main.tf:1",
+            "modules/vpc/main.tf:1",
+            "modules/subnet/main.tf:1",
+        ]
+
+    def test_discovered_module_directory_is_not_also_a_root(self, tmp_path: Path) -> None:
+        _write(tmp_path / "envs" / "prod" / "main.tf", 'module "vpc" {\n  source = "../../modules/vpc"\n}\n')
+        _write(tmp_path / "modules" / "vpc" / "main.tf", _VPC)
+        roots = discover_roots(tmp_path)
+        assert len(roots) == 2  # the module directory looks like a root on its own
+        analyzed: list[tuple[str, object]] = []
+
+        def fake(scanner: IacScanner, **kwargs: object) -> PipelineResult:
+            analyzed.append((scanner.base_path.name, kwargs["skip_fix"]))
+            finding = Finding(severity=Severity.LOW, title="t", description="d", location="main.tf:1")
+            return PipelineResult(scan_result=scanner.scan(), findings=[finding])
+
+        with patch("iac_scanner.orchestration.tree.run_pipeline", side_effect=fake):
+            tree = run_tree_pipeline(tmp_path, roots, options=TreeOptions(provider="openai"))
+
+        assert analyzed == [("prod", False), ("vpc", True)]
+        assert [r.root for r in tree.roots] == [(tmp_path / "envs" / "prod").resolve()]
+        assert [f.location for f in tree.findings] == ["envs/prod/main.tf:1", "modules/vpc/main.tf:1"]
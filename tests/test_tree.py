@@ -0,0 +1,206 @@
+"""Tests for orchestration/tree.py and the `scan-tree` CLI command."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from iac_scanner.cli import main
+from iac_scanner.cost import CostEstimate
+from iac_scanner.discovery import discover_roots
+from iac_scanner.models import Finding, Severity
+from iac_scanner.orchestration.runner import PipelineResult
+from iac_scanner.orchestration.tree import RootResult, TreeOptions, TreeResult, run_tree_pipeline
+from iac_scanner.output.report import write_tree_report
+from iac_scanner.scanners.base import IacScanner
+from iac_scanner.scanners.terraform import TerraformScanner
+
+
+def _monorepo(tmp_path: Path) -> Path:
+    for name in ("alpha", "beta"):
+        d = tmp_path / "envs" / name
+        d.mkdir(parents=True)
+        (d / "main.tf").write_text(f'resource "aws_s3_bucket" "{name}" {{}}')
+    return tmp_path
+
+
+def _fake_pipeline(scanner: IacScanner, **_: object) -> PipelineResult:
+    return PipelineResult(
+        scan_result=scanner.scan(),
+        findings=[
+            Finding(
+                severity=Severity.HIGH,
+                title=f"finding in {scanner.base_path.name}",
+                description="d",
+                location="main.tf:1",
+            )
+        ],
+    )
+
+
+class TestRunTreePipeline:
+    def test_scan_only_runs_every_root(self, tmp_path: Path) -> None:
+        base = _monorepo(tmp_path)
+        tree = run_tree_pipeline(base, discover_roots(base), options=TreeOptions(scan_only=True))
+        assert [tree.relative_root(r) for r in tree.roots] == ["envs/alpha", "envs/beta"]
+        assert all(r.ok for r in tree.roots)
+
+    def test_process_pool_preserves_order(self, tmp_path: Path) -> None:
+        base = _monorepo(tmp_path)
+        tree = run_tree_pipeline(base, discover_roots(base), options=TreeOptions(scan_only=True), jobs=2)
+        assert [r.root.name for r in tree.roots] == ["alpha", "beta"]
+        assert all("aws_s3_bucket" in r.result.scan_result.raw_content for r in tree.roots if r.result)
+
+    def test_findings_are_rebased_to_tree_root(self, tmp_path: Path) -> None:
+        base = _monorepo(tmp_path)
+        with patch("iac_scanner.orchestration.tree.run_pipeline", side_effect=_fake_pipeline):
+            tree = run_tree_pipeline(base, discover_roots(base), options=TreeOptions(provider="openai"))
+        assert [f.location for f in tree.findings] == ["envs/alpha/main.tf:1", "envs/beta/main.tf:1"]
+
+    def test_failing_root_is_isolated(self, tmp_path: Path) -> None:
+        base = _monorepo(tmp_path)
+
+        def flaky(scanner: IacScanner, **kwargs: object) -> PipelineResult:
+            if scanner.base_path.name == "alpha":
+                raise RuntimeError("boom")
+            return _fake_pipeline(scanner)
+
+        with patch("iac_scanner.orchestration.tree.run_pipeline", side_effect=flaky):
+            tree = run_tree_pipeline(base, discover_roots(base), options=TreeOptions(provider="openai"))
+        assert [r.root.name for r in tree.failed] == ["alpha"]
+        assert "boom" in (tree.failed[0].error or "")
+        assert len(tree.findings) == 1
+
+    def test_rules_engine_routes_through_hybrid(self, tmp_path: Path) -> None:
+        base = _monorepo(tmp_path)
+        with patch("iac_scanner.orchestration.tree.run_hybrid_pipeline", side_effect=_fake_pipeline) as hybrid:
+            run_tree_pipeline(
+                base,
+                discover_roots(base),
+                options=TreeOptions(provider="openai", rules_engine="checkov"),
+            )
+        assert hybrid.call_count == 2
+        assert hybrid.call_args.kwargs["engine"] == "checkov"
+
+    def test_budget_stops_starting_new_roots(self, tmp_path: Path) -> None:
+        base = _monorepo(tmp_path)
+        (base / "envs" / "gamma").mkdir()
+        (base / "envs" / "gamma" / "main.tf").write_text('resource "aws_s3_bucket" "gamma" {}')
+
+        def paid(scanner: IacScanner, **_: object) -> PipelineResult:
+            result = _fake_pipeline(scanner)
+            result.cost_estimates = [CostEstimate("openai", "gpt-4o", "analysis", 1000, 100, 1.0)]
+            return result
+
+        with patch("iac_scanner.orchestration.tree.run_pipeline", side_effect=paid) as pipeline:
+            tree = run_tree_pipeline(base, discover_roots(base), options=TreeOptions(provider="openai"), budget_usd=1.5)
+        assert pipeline.call_count == 2
+        assert [r.root.name for r in tree.skipped] == ["gamma"]
+        assert tree.projected_cost_usd == 2.0
+
+    def test_spent_budget_skips_everything_on_the_pool(self, tmp_path: Path) -> None:
+        base = _monorepo(tmp_path)
+        tree = run_tree_pipeline(base, discover_roots(base), options=TreeOptions(scan_only=True), jobs=2, budget_usd=0)
+        assert [r.root.name for r in tree.skipped] == ["alpha", "beta"]
+        assert all("budget" in (r.error or "") for r in tree.roots)
+
+    def test_checkov_runs_once_for_the_tree(self, tmp_path: Path) -> None:
+        base = _monorepo(tmp_path)
+        scanners = discover_roots(base)
+        alpha, beta = (s.base_path for s in scanners)
+        rule = Finding(severity=Severity.LOW, title="rule", description="d", location="main.tf:1")
+        with (
+            patch("iac_scanner.orchestration.tree.is_available", return_value=True),
+            patch(
+                "iac_scanner.orchestration.tree.run_rule_engine_batch", return_value={alpha: [rule], beta: []}
+            ) as batch,
+            patch("iac_scanner.orchestration.tree.run_hybrid_pipeline", side_effect=_fake_pipeline) as hybrid,
+        ):
+            run_tree_pipeline(base, scanners, options=TreeOptions(provider="openai", rules_engine="auto"))
+        batch.assert_called_once_with([alpha, beta], "terraform", engine="checkov")
+        assert [call.kwargs["rule_findings"] for call in hybrid.call_args_list] == [[rule], []]
+
+
+class TestWriteTreeReport:
+    def test_writes_merged_and_per_root_reports(self, tmp_path: Path) -> None:
+        base = _monorepo(tmp_path / "repo")
+        with patch("iac_scanner.orchestration.tree.run_pipeline", side_effect=_fake_pipeline):
+            tree = run_tree_pipeline(base, discover_roots(base), options=TreeOptions(provider="openai"))
+        written = write_tree_report(tree, tmp_path / "out", output_format="both")
+        merged = json.loads((tmp_path / "out" / "scan-tree-report.json").read_text())
+        assert [r["root"] for r in merged["roots"]] == ["envs/alpha", "envs/beta"]
+        assert merged["roots"][0]["severity_counts"] == {"high": 1}
+        assert len(merged["findings"]) == 2
+        assert (tmp_path / "out" / "scan-tree-report.sarif") in written
+        assert (tmp_path / "out" / "roots" / "envs" / "alpha" / "scan-report.json").exists()
+
+    def test_failed_root_summary_carries_error(self, tmp_path: Path) -> None:
+        tree = TreeResult(base_path=tmp_path)
+        scanner = TerraformScanner(tmp_path)
+        tree.roots.append(RootResult(root=scanner.base_path, iac_type="terraform", error="InputTooLargeError: big"))
+        (row,) = tree.summaries()
+        assert row["status"] == "error"
+        assert row["error"] == "InputTooLargeError: big"
+
+
+class TestScanTreeCli:
+    def test_scan_only_writes_merged_report(self, tmp_path: Path) -> None:
+        base = _monorepo(tmp_path / "repo")
+        out = tmp_path / "out"
+        result = CliRunner().invoke(main, ["scan-tree", str(base), "--scan-only", "-o", str(out)])
+        assert result.exit_code == 0, result.output
+        assert "Discovered 2 root(s)" in result.output
+        merged = json.loads((out / "scan-tree-report.json").read_text())
+        assert merged["iac_types"] == ["terraform"]
+        assert len(merged["roots"]) == 2
+
+    def test_no_roots_exits_1(self, tmp_path: Path) -> None:
+        result = CliRunner().invoke(main, ["scan-tree", str(tmp_path), "--scan-only"])
+        assert result.exit_code == 1
+        assert "No Terraform" in result.output
+
+    def test_failed_root_exits_1(self, tmp_path: Path, monkeypatch) -> None:
+        base = _monorepo(tmp_path / "repo")
+        monkeypatch.setenv("IAC_MAX_INPUT_BYTES", "1024")
+        (base / "envs" / "alpha" / "big.tf").write_text("#" * 4096)
+        result = CliRunner().invoke(main, ["scan-tree", str(base), "--scan-only", "-o", str(tmp_path / "out")])
+        assert result.exit_code == 1
+        assert "1 failed" in result.output
+
+    def test_fail_on_applies_to_merged_findings(self, tmp_path: Path) -> None:
+        base = _monorepo(tmp_path / "repo")
+        with patch("iac_scanner.orchestration.tree.run_pipeline", side_effect=_fake_pipeline):
+            result = CliRunner().invoke(
+                main,
+                ["scan-tree", str(base), "--provider", "openai", "--fail-on", "high", "-o", str(tmp_path / "out")],
+            )
+        assert result.exit_code == 1
+        assert "Findings: 2" in result.output
+
+
+class TestCacheWarmCli:
+    def test_warms_analysis_only_and_writes_no_report(self, tmp_path: Path) -> None:
+        base = _monorepo(tmp_path / "repo")
+        with patch("iac_scanner.orchestration.tree.run_pipeline", side_effect=_fake_pipeline) as pipeline:
+            result = CliRunner().invoke(main, ["cache", "warm", str(base), "--provider", "openai"])
+        assert result.exit_code == 0, result.output
+        assert "Warming 2 root(s)" in result.output
+        assert "Roots: 2 (0 failed, 0 skipped)" in result.output
+        assert all(call.kwargs["skip_fix"] for call in pipeline.call_args_list)
+        assert not (base / "scan-output").exists()
+
+    def test_fix_flag_warms_the_fix_step(self, tmp_path: Path) -> None:
+        base = _monorepo(tmp_path / "repo")
+        with patch("iac_scanner.orchestration.tree.run_pipeline", side_effect=_fake_pipeline) as pipeline:
+            result = CliRunner().invoke(main, ["cache", "warm", str(base), "--provider", "openai", "--fix"])
+        assert result.exit_code == 0, result.output
+        assert not any(call.kwargs["skip_fix"] for call in pipeline.call_args_list)
+
+    def test_disabled_cache_exits_1(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.setenv("IAC_NO_CACHE", "1")
+        result = CliRunner().invoke(main, ["cache", "warm", str(_monorepo(tmp_path)), "--provider", "openai"])
+        assert result.exit_code == 1
+        assert "nothing to warm" in result.output
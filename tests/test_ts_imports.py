@@ -0,0 +1,110 @@
+"""Tests for scanners/ts_imports.py — CDK import-graph discovery."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from iac_scanner.scanners import ts_imports
+from iac_scanner.scanners.cdk import CdkScanner
+from iac_scanner.scanners.ts_imports import reachable_sources, relative_specifiers, resolve_specifier
+
+
+def _write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+@pytest.fixture
+def app(tmp_path: Path) -> Path:
+    _write(
+        tmp_path / "index.ts",
+        "import * as cdk from 'aws-cdk-lib';\n"
+        "import { AppStack } from './lib/app-stack';\n"
+        "const cfg = require('./config.js');\n",
+    )
+    _write(tmp_path / "config.ts", "export default {};\n")
+    _write(
+        tmp_path / "lib" / "app-stack.ts",
+        "import { Bucket } from './constructs/storage';\nexport { Db } from \"./constructs/db.js\";\n",
+    )
+    _write(tmp_path / "lib" / "constructs" / "storage" / "index.ts", "import './../../types';\n")
+    _write(tmp_path / "lib" / "constructs" / "db.ts", "export class Db {}\n")
+    _write(tmp_path / "types.d.ts", "declare const x: number;\n")
+    _write(tmp_path / "lib" / "unused-helper.ts", "export const unused = 1;\n")
+    _write(tmp_path / "bin" / "scratch.ts", "console.log('not part of the app');\n")
+    return tmp_path
+
+
+class TestSpecifiers:
+    def test_only_relative_specifiers_are_returned(self) -> None:
+        text = (
+            "import a from 'aws-cdk-lib';\nimport b from './b';\nexport * from \"../c\";\n"
+            "import './side-effect';\nconst d = await import('./d');\nconst e = require( './e' );\n"
+            "import b2 from './b';\n"
+        )
+        assert relative_specifiers(text) == ("./b", "../c", "./side-effect", "./d", "./e")
+
+    def test_js_specifier_resolves_to_ts_source(self, app: Path) -> None:
+        resolved = resolve_specifier(app / "lib" / "app-stack.ts", "./constructs/db.js")
+        assert resolved == (app / "lib" / "constructs" / "db.ts").resolve()
+
+    def test_declaration_files_are_not_sources(self, app: Path) -> None:
+        assert resolve_specifier(app / "index.ts", "./types") is None
+
+
+class TestReachableSources:
+    def test_follows_the_import_graph_exactly(self, app: Path) -> None:
+        found = [p.relative_to(app.resolve()).as_posix() for p in reachable_sources(app / "index.ts")]
+        assert found == [
+            "index.ts",
+            "lib/app-stack.ts",
+            "config.ts",
+            "lib/constructs/storage/index.ts",
+            "lib/constructs/db.ts",
+        ]
+
+    def test_cycles_terminate(self, tmp_path: Path) -> None:
+        _write(tmp_path / "index.ts", "import './a';\n")
+        _write(tmp_path / "a.ts", "import './index';\n")
+        assert len(reachable_sources(tmp_path / "index.ts")) == 2
+
+    def test_node_modules_are_never_followed(self, tmp_path: Path) -> None:
+        _write(tmp_path / "index.ts", "import './node_modules/pkg/evil';\n")
+        _write(tmp_path / "node_modules" / "pkg" / "evil.ts", "// malicious payload\n")
+        assert reachable_sources(tmp_path / "index.ts") == [(tmp_path / "index.ts").resolve()]
+
+    def test_parse_results_are_cached_by_content_hash(self, app: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        reachable_sources(app / "index.ts")
+        parsed: list[str] = []
+        real = ts_imports.relative_specifiers
+        monkeypatch.setattr(ts_imports, "relative_specifiers", lambda text: parsed.append(text) or real(text))
+        _write(app / "lib" / "constructs" / "db.ts", "export class Db { changed = true }\n")
+        reachable_sources(app / "index.ts")
+        assert parsed == ["export class Db { changed = true }\n"]
+
+
+class TestCdkScannerUsesImportGraph:
+    def test_unrelated_helpers_are_excluded_and_nested_constructs_included(self, app: Path) -> None:
+        result = CdkScanner(app).scan()
+        files = {Path(f).relative_to(app.resolve()).as_posix() for f in result.metadata["files"]}
+        assert "lib/constructs/storage/index.ts" in files
+        assert "lib/unused-helper.ts" not in files
+        assert "bin/scratch.ts" not in files
+
+    def test_imports_outside_the_root_are_not_read(self, tmp_path: Path) -> None:
+        app = tmp_path / "apps" / "web"
+        _write(app / "index.ts", "import './lib/stack';\nimport '../shared/secrets';\nimport '../../../outside';\n")
+        _write(app / "lib" / "stack.ts", "import '../../api/handler';\n")
+        _write(tmp_path / "apps" / "shared" / "secrets.ts", "export const token = 'x';\n")
+        _write(tmp_path / "apps" / "api" / "handler.ts", "export {};\n")
+        files = CdkScanner(app).list_files()
+        assert files == sorted([(app / "index.ts").resolve(), (app / "lib" / "stack.ts").resolve()])
+
+    def test_nested_files_are_labelled_by_relative_path(self, app: Path) -> None:
+        headers = [segment.header for segment in CdkScanner(app).scan().segments]
+        assert "// --- lib/constructs/storage/index.ts ---" in headers
+        assert "// --- index.ts ---" in headers
+        assert len(set(headers)) == len(headers)